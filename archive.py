@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Archive Manifest for scraped Jeopardy games
+Tracks every game JSON file in an output directory so that indexes and
+reports can be refreshed from what changed instead of re-reading everything
+"""
+
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# Everything derived from the archive (manifest, indexes, caches) lives here,
+# inside the output directory but out of the year/month game tree
+INDEX_DIRNAME = ".jarchive"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_LOG_FILENAME = "manifest.log"
+
+# Game file formats: plain JSON, or compact JSON compressed per game.
+# Readers go by the file's magic bytes, so any mix of formats loads.
+GAME_FORMATS = {"json": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 6
+ZSTD_DICTS_DIRNAME = "zstd-dicts"   # Trained dictionaries by id, under the index directory
+ZSTD_CURRENT_DICT = "CURRENT"       # Id of the dictionary new files are compressed with
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def get_index_dir(output_dir: str = "output") -> str:
+    """Return (and create) the index directory for an output directory"""
+    index_dir = os.path.join(output_dir, INDEX_DIRNAME)
+    os.makedirs(index_dir, exist_ok=True)
+    return index_dir
+
+
+def is_game_file(filename: str) -> bool:
+    """Check whether a filename looks like a scraped game file"""
+    return filename.endswith(tuple(GAME_FORMATS.values())) and not filename.startswith('.')
+
+
+def game_file_stem(filename: str) -> str:
+    """Filename without its game format extension ("jeopardy_game_1.json.gz" -> "jeopardy_game_1")"""
+    for extension in sorted(GAME_FORMATS.values(), key=len, reverse=True):
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def format_of(path: str) -> str:
+    """Game format a path's extension asks for (plain JSON for anything unknown)"""
+    for fmt, extension in sorted(GAME_FORMATS.items(), key=lambda item: len(item[1]), reverse=True):
+        if path.endswith(extension):
+            return fmt
+    return "json"
+
+
+def configured_format() -> str:
+    """Format for newly saved games, from J_ARCHIVE_FORMAT (json, gzip or zstd; default json)"""
+    fmt = os.getenv('J_ARCHIVE_FORMAT', 'json').strip().lower()
+    return fmt if fmt in GAME_FORMATS else 'json'
+
+
+def require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd game files need the zstandard package (pip install zstandard)") from None
+    return zstandard
+
+
+# zstandard compressors and decompressors must not be shared between threads
+_zstd_codecs = threading.local()  # .by_key: (kind, dictionary file) -> dictionary/compressor/decompressor
+_zstd_dict_paths: Dict[tuple, str] = {}  # (game file directory, dictionary id) -> dictionary file
+_zstd_current: Dict[str, tuple] = {}  # output directory -> (CURRENT mtime_ns, dictionary file)
+
+
+def _thread_codecs() -> Dict[tuple, object]:
+    if not hasattr(_zstd_codecs, "by_key"):
+        _zstd_codecs.by_key = {}
+    return _zstd_codecs.by_key
+
+
+def zstd_dict_dir(output_dir: str) -> str:
+    return os.path.join(output_dir, INDEX_DIRNAME, ZSTD_DICTS_DIRNAME)
+
+
+def _load_zstd_dict(dict_path: str):
+    codecs = _thread_codecs()
+    if ("dict", dict_path) not in codecs:
+        with open(dict_path, 'rb') as f:
+            codecs[("dict", dict_path)] = require_zstandard().ZstdCompressionDict(f.read())
+    return codecs[("dict", dict_path)]
+
+
+def _find_zstd_dict(path: str, dict_id: int) -> str:
+    """The dictionary file with this id in the nearest index directory above a game file"""
+    key = (os.path.dirname(os.path.abspath(path)), dict_id)
+    if key in _zstd_dict_paths:
+        return _zstd_dict_paths[key]
+    directory = key[0]
+    while True:
+        dict_path = os.path.join(zstd_dict_dir(directory), f"{dict_id}.dict")
+        if os.path.exists(dict_path):
+            _zstd_dict_paths[key] = dict_path
+            return dict_path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise ValueError(f"zstd dictionary {dict_id} not found for {path}")
+        directory = parent
+
+
+def current_zstd_dict(output_dir: str) -> Optional[str]:
+    """Path of the dictionary new zstd files in output_dir are compressed with (None if not trained)"""
+    current = os.path.join(zstd_dict_dir(output_dir), ZSTD_CURRENT_DICT)
+    try:
+        mtime_ns = os.stat(current).st_mtime_ns
+        cached = _zstd_current.get(output_dir)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        with open(current, 'r', encoding='utf-8') as f:
+            dict_path = os.path.join(zstd_dict_dir(output_dir), f"{f.read().strip()}.dict")
+    except OSError:
+        return None
+    if not os.path.exists(dict_path):
+        return None
+    _zstd_current[output_dir] = (mtime_ns, dict_path)
+    return dict_path
+
+
+def is_compressed(head: bytes) -> bool:
+    """Check whether a game file's leading bytes are a gzip or zstd frame"""
+    return head[:2] == _GZIP_MAGIC or head[:4] == _ZSTD_MAGIC
+
+
+def decode_game_bytes(raw: bytes, path: str = "") -> bytes:
+    """JSON bytes of a game file's contents, decompressing gzip and zstd by their magic bytes"""
+    try:
+        if raw[:2] == _GZIP_MAGIC:
+            return gzip.decompress(raw)
+        if raw[:4] == _ZSTD_MAGIC:
+            zstd = require_zstandard()
+            dict_id = zstd.get_frame_parameters(raw).dict_id
+            dict_path = _find_zstd_dict(path, dict_id) if dict_id else None
+            codecs = _thread_codecs()
+            key = ("d", dict_path)
+            if key not in codecs:
+                codecs[key] = zstd.ZstdDecompressor(dict_data=_load_zstd_dict(dict_path) if dict_path else None)
+            return codecs[key].decompress(raw)
+    except (EOFError, zlib.error) as e:
+        raise ValueError(f"corrupt compressed game file: {e}") from None
+    except ValueError:
+        raise
+    except Exception as e:  # zstandard.ZstdError
+        raise ValueError(f"corrupt compressed game file: {e}") from None
+    return raw
+
+
+def read_game_bytes(path: str) -> bytes:
+    """JSON bytes of a game file in any format"""
+    with open(path, 'rb') as f:
+        return decode_game_bytes(f.read(), path)
+
+
+def compact_game_json(data: Dict) -> bytes:
+    """A game as compact JSON, the payload of compressed game files"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def encode_game(data: Dict, fmt: str = "json", output_dir: Optional[str] = None) -> bytes:
+    """
+    Serialize a game in one of GAME_FORMATS
+
+    Plain JSON keeps the indented layout; compressed formats store compact
+    JSON. zstd uses the output directory's trained dictionary when it has one.
+    """
+    if fmt == "json":
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    compact = compact_game_json(data)
+    if fmt == "gzip":
+        return gzip.compress(compact, compresslevel=GZIP_LEVEL, mtime=0)
+    if fmt == "zstd":
+        zstd = require_zstandard()
+        dict_path = current_zstd_dict(output_dir) if output_dir else None
+        codecs = _thread_codecs()
+        key = ("c", dict_path)
+        if key not in codecs:
+            codecs[key] = zstd.ZstdCompressor(
+                level=ZSTD_LEVEL, dict_data=_load_zstd_dict(dict_path) if dict_path else None)
+        return codecs[key].compress(compact)
+    raise ValueError(f"Unknown game format '{fmt}'. Choose from: {', '.join(GAME_FORMATS)}")
+
+
+def write_game_file(path: str, data: Dict, output_dir: Optional[str] = None):
+    """
+    Write a game in the format its extension names, atomically
+
+    A temp file private to this process and thread, renamed into place,
+    means concurrent writers of the same game never leave a torn or
+    interleaved file.
+    """
+    payload = encode_game(data, format_of(path), output_dir)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def iter_game_files(output_dir: str = "output") -> List[str]:
+    """
+    List all game files under an output directory
+
+    Args:
+        output_dir: Base output directory
+
+    Returns:
+        Sorted list of file paths (index directory excluded)
+    """
+    game_files = []
+    for root, dirs, files in os.walk(output_dir):
+        # Never descend into the index directory
+        dirs[:] = [d for d in dirs if d != INDEX_DIRNAME]
+        for filename in files:
+            if is_game_file(filename):
+                game_files.append(os.path.join(root, filename))
+    game_files.sort()
+    return game_files
+
+
+def load_game_data(path: str) -> Dict:
+    """Load and parse a game file (plain, gzip or zstd JSON)"""
+    return json.loads(read_game_bytes(path))
+
+
+def parse_air_date(air_date: Optional[str]) -> Optional[datetime]:
+    """Parse an air date string (format: "Monday, October 20, 2025")"""
+    if not air_date:
+        return None
+    try:
+        return datetime.strptime(air_date, "%A, %B %d, %Y")
+    except (ValueError, TypeError):
+        return None
+
+
+def iso_air_date(air_date: Optional[str]) -> Optional[str]:
+    """Convert a display air date to YYYY-MM-DD (None if unparseable)"""
+    date_obj = parse_air_date(air_date)
+    return date_obj.strftime("%Y-%m-%d") if date_obj else None
+
+
+def game_iso_date(data: Dict) -> Optional[str]:
+    """ISO air date of a game, using the stored air_date_iso when present"""
+    return data.get('air_date_iso') or iso_air_date(data.get('air_date'))
+
+
+def make_clue_id(game_id: int, round_code: int, position: int) -> int:
+    """
+    Stable integer id for a clue
+
+    Args:
+        game_id: J-Archive game id
+        round_code: 0 = Jeopardy!, 1 = Double Jeopardy!, 2 = Final Jeopardy!
+        position: Index of the clue in its round's "clues" list
+    """
+    return (game_id << 8) | (round_code << 6) | position
+
+
+def split_clue_id(clue_id: int):
+    """Inverse of make_clue_id(): (game_id, round_code, position)"""
+    return clue_id >> 8, (clue_id >> 6) & 0x3, clue_id & 0x3f
+
+
+def iter_game_clues(data: Dict):
+    """Yield (round_code, position, clue dict) for every clue in a game, Final Jeopardy included"""
+    for round_code, round_key in enumerate(('jeopardy_round', 'double_jeopardy_round')):
+        for position, clue in enumerate((data.get(round_key) or {}).get('clues', [])):
+            yield round_code, position, clue
+
+    final = data.get('final_jeopardy') or {}
+    if final.get('clue'):
+        yield 2, 0, final
+
+
+def _stat_entry(path: str) -> Dict:
+    """Size and modification time used to detect changed files"""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class DateIndex:
+    """
+    Games sorted by ISO air date, with year and day-of-year buckets
+
+    Built from manifest entries only, so date questions never open games.
+    """
+
+    def __init__(self, entries: Dict[str, Dict]):
+        pairs = sorted((entry['air_date_iso'], rel) for rel, entry in entries.items()
+                       if entry.get('air_date_iso'))
+        self.dates = [iso for iso, _ in pairs]
+        self.paths = [rel for _, rel in pairs]
+
+        # year -> [start, end) slice of the sorted lists; "MM-DD" -> positions
+        self.by_year = {}
+        self.by_day = {}
+        for position, iso in enumerate(self.dates):
+            year_slice = self.by_year.setdefault(iso[:4], [position, position])
+            year_slice[1] = position + 1
+            self.by_day.setdefault(iso[5:], []).append(position)
+
+    def to_dict(self) -> Dict:
+        return {"dates": self.dates, "paths": self.paths, "by_year": self.by_year, "by_day": self.by_day}
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'DateIndex':
+        index = cls.__new__(cls)
+        index.dates = raw["dates"]
+        index.paths = raw["paths"]
+        index.by_year = raw["by_year"]
+        index.by_day = raw["by_day"]
+        return index
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Games aired between two YYYY-MM-DD dates (inclusive), oldest first"""
+        low = bisect.bisect_left(self.dates, start) if start else 0
+        high = bisect.bisect_right(self.dates, end) if end else len(self.dates)
+        return self.paths[low:high]
+
+    def in_year(self, year: int) -> List[str]:
+        """Games aired in a given year"""
+        start, end = self.by_year.get(str(year), (0, 0))
+        return self.paths[start:end]
+
+    def on_day(self, month: int, day: int) -> List[str]:
+        """Games aired on this month/day in any year ("on this day in history")"""
+        return [self.paths[position] for position in self.by_day.get(f"{month:02d}-{day:02d}", [])]
+
+
+class ArchiveManifest:
+    """
+    Persistent list of game files in an output directory
+
+    Each entry is keyed by the path relative to the output directory and
+    stores the file's size/mtime plus the game_id and air_date, so most
+    questions about the archive can be answered without opening games.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.entries = {}
+        self._date_index = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.output_dir, INDEX_DIRNAME, MANIFEST_FILENAME)
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.output_dir, INDEX_DIRNAME, MANIFEST_LOG_FILENAME)
+
+    @classmethod
+    def load(cls, output_dir: str = "output") -> 'ArchiveManifest':
+        """Load the saved manifest (and any entries recorded since the last save)"""
+        manifest = cls(output_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            manifest.entries = raw.get('entries', {})
+            if raw.get('date_index'):
+                manifest._date_index = DateIndex.from_dict(raw['date_index'])
+        except (OSError, ValueError, KeyError):
+            manifest.entries = {}
+
+        # Replay entries appended by record_saved_game()
+        try:
+            with open(manifest.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Partially written line from an interrupted run
+                    manifest.entries[record['path']] = record['entry']
+                    manifest._date_index = None
+        except OSError:
+            pass
+
+        return manifest
+
+    def describe(self, path: str, data: Optional[Dict] = None) -> Dict:
+        """Build the manifest entry for a game file"""
+        entry = _stat_entry(path)
+        if data is None:
+            try:
+                data = load_game_data(path)
+            except (OSError, ValueError):
+                data = {}
+        entry["game_id"] = data.get('game_id')
+        entry["air_date"] = data.get('air_date')
+        entry["air_date_iso"] = game_iso_date(data)
+        return entry
+
+    def set_entry(self, rel: str, entry: Dict):
+        """Add or replace the entry for a game written without record_saved_game()"""
+        self.entries[rel] = entry
+        self._date_index = None
+
+    def relpath(self, path: str) -> str:
+        return os.path.relpath(path, self.output_dir)
+
+    def abspath(self, relpath: str) -> str:
+        return os.path.join(self.output_dir, relpath)
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """
+        Bring the manifest in line with the files on disk
+
+        Only new or modified files are opened.
+
+        Returns:
+            Dict with "added", "changed" and "removed" relative paths
+        """
+        changes = {"added": [], "changed": [], "removed": []}
+        seen = set()
+
+        for path in iter_game_files(self.output_dir):
+            rel = self.relpath(path)
+            seen.add(rel)
+
+            try:
+                stat = _stat_entry(path)
+            except OSError:
+                continue
+
+            existing = self.entries.get(rel)
+            if existing is not None and 'air_date_iso' not in existing:
+                # Entry from before ISO dates were tracked
+                existing['air_date_iso'] = iso_air_date(existing.get('air_date'))
+                self._date_index = None
+
+            if existing is None:
+                changes["added"].append(rel)
+            elif existing.get("size") != stat["size"] or existing.get("mtime_ns") != stat["mtime_ns"]:
+                changes["changed"].append(rel)
+            else:
+                continue
+
+            self.entries[rel] = self.describe(path)
+
+        for rel in list(self.entries):
+            if rel not in seen:
+                changes["removed"].append(rel)
+                del self.entries[rel]
+
+        if any(changes.values()):
+            self._date_index = None
+        return changes
+
+    @property
+    def date_index(self) -> DateIndex:
+        """Date index over the current entries (rebuilt only after changes)"""
+        if self._date_index is None:
+            self._date_index = DateIndex(self.entries)
+        return self._date_index
+
+    def save(self):
+        """Write the manifest snapshot and clear the append log"""
+        get_index_dir(self.output_dir)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries, "date_index": self.date_index.to_dict()}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        try:
+            os.remove(self.log_path)
+        except OSError:
+            pass
+
+    def digest(self) -> str:
+        """Hash identifying this exact archive state (used to key caches)"""
+        h = hashlib.sha1()
+        for rel in sorted(self.entries):
+            entry = self.entries[rel]
+            h.update(f"{rel}\0{entry.get('size')}\0{entry.get('mtime_ns')}\n".encode('utf-8'))
+        return h.hexdigest()
+
+    def game_files(self) -> List[str]:
+        """Paths of all games in the manifest"""
+        return [self.abspath(rel) for rel in sorted(self.entries)]
+
+
+def load_manifest(output_dir: str = "output", refresh: bool = True) -> ArchiveManifest:
+    """Load the manifest for an output directory, optionally syncing it with disk"""
+    manifest = ArchiveManifest.load(output_dir)
+    if refresh:
+        changes = manifest.refresh()
+        if any(changes.values()) or manifest._date_index is None or os.path.exists(manifest.log_path):
+            manifest.save()
+    return manifest
+
+
+def record_saved_game(output_dir: str, path: str, data: Dict):
+    """
+    Record a freshly written game in the manifest
+
+    Appends one line to the manifest log instead of rewriting the whole
+    manifest, so it is cheap enough to call after every save.
+    """
+    manifest = ArchiveManifest(output_dir)
+    rel = manifest.relpath(path)
+    if rel.startswith('..'):
+        return  # Written outside the output directory - not part of the archive
+
+    get_index_dir(output_dir)
+    record = {"path": rel, "entry": manifest.describe(path, data)}
+    with open(manifest.log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main():
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "output"
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    manifest = ArchiveManifest.load(output_dir)
+    changes = manifest.refresh()
+    manifest.save()
+
+    print(f"Manifest for {output_dir}/: {len(manifest.entries)} games")
+    print(f"  Added: {len(changes['added'])}, changed: {len(changes['changed'])}, removed: {len(changes['removed'])}")
+    print(f"  Digest: {manifest.digest()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Batch Email Delivery
+Sends one issue to many recipients through Mailgun, either with the batch
+sending API (up to 1000 recipients per request, with recipient variables) or
+as individual messages over pooled connections with a rate limit and retries.
+A per-issue send journal makes re-runs skip everyone already delivered.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from archive import get_index_dir
+
+
+DEFAULT_API_BASE = "https://api.mailgun.net/v3"
+JOURNAL_DIRNAME = "send_journal"
+
+BATCH_SIZE = 1000
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5  # Seconds, doubled on every retry
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def load_recipients(path: str) -> List[Dict[str, str]]:
+    """
+    Read recipients from a file, one per line: "email" or "email,name"
+
+    Blank lines and lines starting with # are skipped, as are duplicates.
+    """
+    recipients = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            email, _, name = line.partition(',')
+            email = email.strip()
+            if email.lower() in seen:
+                continue
+            seen.add(email.lower())
+            recipients.append({"email": email, "name": name.strip()})
+    return recipients
+
+
+class RateLimiter:
+    """Token bucket shared by all sending threads (rate in requests/second)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SendJournal:
+    """
+    Append-only record of delivery results for one issue
+
+    One JSON line per recipient result under .jarchive/send_journal/. The
+    issue's questions are stored alongside, so a re-run on the same day
+    resends the same issue to whoever hasn't received it yet (and hasn't
+    been given up on after too many failures).
+    """
+
+    def __init__(self, output_dir: str, issue_id: str):
+        self.directory = os.path.join(get_index_dir(output_dir), JOURNAL_DIRNAME)
+        os.makedirs(self.directory, exist_ok=True)
+        self.issue_id = issue_id
+        self.path = os.path.join(self.directory, f"{issue_id}.jsonl")
+        self.lock = threading.Lock()
+        self.sent = set()
+        self.failures = Counter()  # Failed attempts per recipient
+        self.gave_up = set()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from an interrupted run
+                    self._count(record.get("status"), [record["recipient"]])
+        except OSError:
+            pass
+
+    def load_issue(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, f"{self.issue_id}.issue.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_issue(self, issue: Dict):
+        path = os.path.join(self.directory, f"{self.issue_id}.issue.json")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(issue, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def save_report(self, report: Dict):
+        with open(os.path.join(self.directory, f"{self.issue_id}.report.json"), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    def pending(self, recipients: Iterable[Dict]) -> List[Dict]:
+        return [r for r in recipients if r["email"].lower() not in self.sent and r["email"].lower() not in self.gave_up]
+
+    def give_up(self, recipients: Iterable[Dict], max_attempts: int) -> List[str]:
+        """Record every pending recipient that has failed max_attempts times as given up; returns their emails"""
+        emails = [r["email"] for r in self.pending(recipients) if self.failures[r["email"].lower()] >= max_attempts]
+        if emails:
+            self.record(emails, "gave_up", f"failed {max_attempts} times")
+        return emails
+
+    def _count(self, status: Optional[str], emails: List[str]):
+        keys = [email.lower() for email in emails]
+        if status == "sent":
+            self.sent.update(keys)
+        elif status == "failed":
+            self.failures.update(keys)
+        elif status == "gave_up":
+            self.gave_up.update(keys)
+
+    def record(self, emails: Iterable[str], status: str, detail: Optional[str] = None):
+        emails = list(emails)
+        at = datetime.now().isoformat(timespec='seconds')
+        lines = "".join(
+            json.dumps({"recipient": email, "status": status, "detail": detail, "at": at}) + "\n"
+            for email in emails
+        )
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._count(status, emails)
+
+
+class MailgunClient:
+    """Pooled, rate-limited Mailgun messages API client with retries"""
+
+    def __init__(self, domain: str, api_key: str, from_email: str, api_base: Optional[str] = None,
+                 rate: float = 0.0, max_retries: int = MAX_RETRIES):
+        self.url = f"{(api_base or DEFAULT_API_BASE).rstrip('/')}/{domain}/messages"
+        self.auth = ("api", api_key)
+        self.from_email = from_email
+        self.limiter = RateLimiter(rate)
+        self.max_retries = max_retries
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.status_counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls, **options) -> 'MailgunClient':
+        domain = os.getenv('MAILGUN_DOMAIN')
+        api_key = os.getenv('MAILGUN_API_KEY')
+        from_email = os.getenv('FROM_EMAIL')
+        if not all([domain, api_key, from_email]):
+            raise ValueError("Missing required environment variables. Check your .env file.")
+        return cls(domain, api_key, from_email, os.getenv('MAILGUN_API_BASE'), **options)
+
+    def _session(self):
+        # One keep-alive connection per sending thread, reused for every message
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = self.local.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+    def _count(self, key: str, retry: bool = False):
+        with self.lock:
+            self.requests += 1
+            self.retries += retry
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+    def post(self, data: Dict) -> Tuple[bool, str]:
+        """
+        POST one message, retrying on 429, 5xx and connection errors
+
+        Returns:
+            (success, message id or error description)
+        """
+        import requests
+
+        data = {"from": self.from_email, **data}
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            last_try = attempt == self.max_retries
+            try:
+                response = self._session().post(self.url, auth=self.auth, data=data, timeout=30)
+            except requests.RequestException as e:
+                self._count(type(e).__name__, retry=not last_try)
+                error = f"{type(e).__name__}: {e}"
+                delay = None
+            else:
+                self._count(str(response.status_code), retry=response.status_code in RETRY_STATUSES and not last_try)
+                if response.status_code == 200:
+                    try:
+                        return True, response.json().get("id", "")
+                    except ValueError:
+                        return True, ""
+                error = f"{response.status_code} - {response.text[:200]}"
+                if response.status_code not in RETRY_STATUSES:
+                    return False, error
+                delay = response.headers.get("Retry-After")
+
+            if not last_try:
+                try:
+                    wait = float(delay)
+                except (TypeError, ValueError):
+                    wait = RETRY_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+                time.sleep(wait)
+        return False, error
+
+
+def _chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def send_batched(client: MailgunClient, journal: SendJournal, recipients: List[Dict],
+                 subject: str, html_content: str, workers: int = 4, batch_size: int = BATCH_SIZE):
+    """Mailgun batch sending: one request per chunk, personalised with recipient-variables"""
+
+    def send_chunk(chunk):
+        variables = {r["email"]: {"name": r["name"] or r["email"].split('@')[0], "email": r["email"]}
+                     for r in chunk}
+        ok, detail = client.post({
+            "to": [r["email"] for r in chunk],
+            "subject": subject,
+            "html": html_content,
+            "recipient-variables": json.dumps(variables),
+        })
+        journal.record(list(variables), "sent" if ok else "failed", detail)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        list(executor.map(send_chunk, _chunks(recipients, batch_size)))
+
+
+def send_individually(client: MailgunClient, journal: SendJournal, recipients: List[Dict],
+                      subject: str, html_content: str, workers: int = 8):
+    """One message per recipient, sent concurrently over pooled connections"""
+
+    def send_one(recipient):
+        ok, detail = client.post({"to": recipient["email"], "subject": subject, "html": html_content})
+        journal.record([recipient["email"]], "sent" if ok else "failed", detail)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        list(executor.map(send_one, recipients))
+
+
+def deliver(client: MailgunClient, journal: SendJournal, recipients: List[Dict], subject: str,
+            html_content: str, mode: str = "batch", workers: int = 8,
+            batch_size: int = BATCH_SIZE) -> Dict:
+    """
+    Send an issue to every recipient the journal hasn't recorded as sent
+
+    Returns:
+        Run report with counts, retries, HTTP status counts and throughput
+    """
+    if mode not in ("batch", "individual"):
+        raise ValueError(f"Unknown delivery mode '{mode}' (use 'batch' or 'individual')")
+
+    pending = journal.pending(recipients)
+    already_sent = len(recipients) - len(pending)
+    sent_before = len(journal.sent)
+
+    start = time.perf_counter()
+    if mode == "batch":
+        send_batched(client, journal, pending, subject, html_content, workers, batch_size)
+    else:
+        send_individually(client, journal, pending, subject, html_content, workers)
+    elapsed = time.perf_counter() - start
+
+    sent = len(journal.sent) - sent_before
+    report = {
+        "issue": journal.issue_id,
+        "mode": mode,
+        "finished_at": datetime.now().isoformat(timespec='seconds'),
+        "recipients": len(recipients),
+        "skipped_already_sent": already_sent,
+        "sent": sent,
+        "failed": len(pending) - sent,
+        "requests": client.requests,
+        "retries": client.retries,
+        "status_counts": dict(sorted(client.status_counts.items())),
+        "elapsed_seconds": round(elapsed, 3),
+        "recipients_per_second": round(sent / elapsed, 1) if elapsed > 0 else None,
+    }
+    journal.save_report(report)
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\n📊 Delivery report for issue {report['issue']} ({report['mode']} mode)")
+    print(f"  Recipients:      {report['recipients']}")
+    print(f"  Already sent:    {report['skipped_already_sent']}")
+    print(f"  Sent:            {report['sent']}")
+    print(f"  Failed:          {report['failed']}")
+    print(f"  Requests:        {report['requests']} ({report['retries']} retries)")
+    print(f"  Status counts:   {report['status_counts']}")
+    print(f"  Elapsed:         {report['elapsed_seconds']}s ({report['recipients_per_second']} recipients/s)")
@@ -6,10 +6,14 @@ Scrapes multiple episodes at once
 
 import sys
 import time
+from bounded_memory import ParseWorkers, RssSampler, scrape_game
+from failure_queue import FailureQueue
 from scraper import JeopardyScraper
+from work_queue import WorkQueue, default_queue_path, print_status, run_worker
 
 
-def scrape_range(start_id: int, end_id: int, delay: float = 1.0):
+def scrape_range(start_id: int, end_id: int, delay: float = 1.0, recycle_every: int = 0,
+                 memory: RssSampler = None):
     """
     Scrape a range of game IDs
     
@@ -17,15 +21,19 @@ def scrape_range(start_id: int, end_id: int, delay: float = 1.0):
         start_id: First game ID to scrape
         end_id: Last game ID to scrape (inclusive)
         delay: Delay between requests in seconds (be respectful to the server)
+        recycle_every: Parse pages in a worker process replaced every N pages (0 = in-process)
+        memory: Sampler to record RSS in for the run report
     """
     success_count = 0
     fail_count = 0
+    failures = FailureQueue()
+    workers = ParseWorkers(recycle_every) if recycle_every else None
     
     for game_id in range(start_id, end_id + 1):
         print(f"\nScraping game {game_id}...")
         
-        scraper = JeopardyScraper(game_id)
-        data = scraper.scrape()
+        scraper = JeopardyScraper(game_id, priority="backfill")
+        data = scrape_game(scraper, workers, memory)
         
         if data:
             # Check if we actually got data (not just an empty structure)
@@ -38,6 +46,7 @@ def scrape_range(start_id: int, end_id: int, delay: float = 1.0):
             if has_data:
                 filename = scraper.save_to_json(data)
                 print(f"✓ Saved to {filename}")
+                failures.clear(game_id)
                 success_count += 1
                 
                 # Print summary
@@ -45,34 +54,42 @@ def scrape_range(start_id: int, end_id: int, delay: float = 1.0):
                     print(f"  Episode #{data['episode_number']} - {data['air_date']}")
             else:
                 print(f"✗ Failed to scrape game {game_id} - no data found")
+                failures.record_scrape(game_id, scraper, "batch")
                 fail_count += 1
         else:
             print(f"✗ Failed to scrape game {game_id}")
+            failures.record_scrape(game_id, scraper, "batch")
             fail_count += 1
         
         # Be respectful - add delay between requests
         if game_id < end_id:
             time.sleep(delay)
     
+    if workers:
+        workers.close()
     return success_count, fail_count
 
 
-def scrape_list(game_ids: list, delay: float = 1.0):
+def scrape_list(game_ids: list, delay: float = 1.0, recycle_every: int = 0, memory: RssSampler = None):
     """
     Scrape a list of specific game IDs
     
     Args:
         game_ids: List of game IDs to scrape
         delay: Delay between requests in seconds
+        recycle_every: Parse pages in a worker process replaced every N pages (0 = in-process)
+        memory: Sampler to record RSS in for the run report
     """
     success_count = 0
     fail_count = 0
+    failures = FailureQueue()
+    workers = ParseWorkers(recycle_every) if recycle_every else None
     
     for i, game_id in enumerate(game_ids):
         print(f"\nScraping game {game_id} ({i+1}/{len(game_ids)})...")
         
-        scraper = JeopardyScraper(game_id)
-        data = scraper.scrape()
+        scraper = JeopardyScraper(game_id, priority="backfill")
+        data = scrape_game(scraper, workers, memory)
         
         if data:
             # Check if we actually got data (not just an empty structure)
@@ -85,6 +102,7 @@ def scrape_list(game_ids: list, delay: float = 1.0):
             if has_data:
                 filename = scraper.save_to_json(data)
                 print(f"✓ Saved to {filename}")
+                failures.clear(game_id)
                 success_count += 1
                 
                 # Print summary
@@ -92,31 +110,75 @@ def scrape_list(game_ids: list, delay: float = 1.0):
                     print(f"  Episode #{data['episode_number']} - {data['air_date']}")
             else:
                 print(f"✗ Failed to scrape game {game_id} - no data found")
+                failures.record_scrape(game_id, scraper, "batch")
                 fail_count += 1
         else:
             print(f"✗ Failed to scrape game {game_id}")
+            failures.record_scrape(game_id, scraper, "batch")
             fail_count += 1
         
         # Be respectful - add delay between requests
         if i < len(game_ids) - 1:
             time.sleep(delay)
     
+    if workers:
+        workers.close()
     return success_count, fail_count
 
 
+def scrape_queued(game_ids, delay: float = 1.0):
+    """
+    Scrape games through the shared work queue
+
+    The games are added to output/.jarchive/work_queue.sqlite and this
+    process works the queue until it is drained, so more batch_scraper.py
+    --queue runs (or work_queue.py workers) started on the same games split
+    them instead of scraping each one twice.
+    """
+    queue_path = default_queue_path()
+    queue = WorkQueue(queue_path)
+    added = queue.enqueue(game_ids)
+    print(f"Queued {added} games in {queue_path} ({len(game_ids) - added} already queued)")
+    queue.close()
+    stats = run_worker(queue_path, delay=delay)
+    print_status(WorkQueue(queue_path))
+    return stats["scraped"], stats["failed"]
+
+
 def main():
+    # --queue and --recycle <n> work in both modes, so take them out before the mode parsing
+    queue_mode = '--queue' in sys.argv
+    if queue_mode:
+        sys.argv.remove('--queue')
+    recycle_every = 0
+    if '--recycle' in sys.argv:
+        i = sys.argv.index('--recycle')
+        try:
+            recycle_every = int(sys.argv[i + 1])
+        except (IndexError, ValueError):
+            print("Error: --recycle requires a number of pages")
+            sys.exit(1)
+        del sys.argv[i:i + 2]
+    if queue_mode and recycle_every:
+        print("Error: --recycle can't be combined with --queue")
+        sys.exit(1)
+    
     if len(sys.argv) < 2:
         print("Batch Jeopardy Scraper")
         print("\nUsage:")
         print("  python batch_scraper.py <start_id> <end_id> [delay]")
         print("  python batch_scraper.py <start_id> <end_id> --delay <seconds>")
         print("  python batch_scraper.py --list <id1> <id2> <id3> ... [--delay <seconds>]")
+        print("\n  --recycle <n>  Parse pages in a worker process replaced every n pages")
+        print("  --queue        Share the games with other --queue runs through the work queue")
         print("\nExamples:")
         print("  python batch_scraper.py 9290 9295")
         print("  python batch_scraper.py 9290 9295 2.0")
         print("  python batch_scraper.py 9290 9295 --delay 2.0")
         print("  python batch_scraper.py --list 9293 9294 9295")
         print("  python batch_scraper.py --list 9293 9294 --delay 2.0")
+        print("  python batch_scraper.py 1 9000 2.0 --recycle 500")
+        print("  python batch_scraper.py 1 9000 2.0 --queue")
         sys.exit(1)
     
     # Parse command line arguments
@@ -143,7 +205,11 @@ def main():
             sys.exit(1)
         
         print(f"Scraping {len(game_ids)} games with {delay}s delay between requests...")
-        success_count, fail_count = scrape_list(game_ids, delay)
+        memory = RssSampler()
+        if queue_mode:
+            success_count, fail_count = scrape_queued(game_ids, delay)
+        else:
+            success_count, fail_count = scrape_list(game_ids, delay, recycle_every, memory)
     else:
         # Range mode
         try:
@@ -174,13 +240,22 @@ def main():
                     sys.exit(1)
         
         print(f"Scraping games {start_id} to {end_id} with {delay}s delay between requests...")
-        success_count, fail_count = scrape_range(start_id, end_id, delay)
+        memory = RssSampler()
+        if queue_mode:
+            success_count, fail_count = scrape_queued(range(start_id, end_id + 1), delay)
+        else:
+            success_count, fail_count = scrape_range(start_id, end_id, delay, recycle_every, memory)
     
     print("\n" + "="*60)
     print("Batch scraping complete!")
     print(f"✓ Successful: {success_count}")
-    if fail_count > 0:
-        print(f"✗ Failed: {fail_count}")
+    if fail_count > 0 and queue_mode:
+        print(f"✗ Failed: {fail_count} (see python work_queue.py status)")
+        print("  Requeue games that ran out of attempts with: python work_queue.py retry-failed")
+    elif fail_count > 0:
+        print(f"✗ Failed: {fail_count} (recorded with reasons; see python failure_queue.py)")
+        print("  Retry network/server errors with: python failure_queue.py retry-failed")
+    print(memory.report_line())
     print("="*60)
 
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for near-duplicate clue detection
+Builds a synthetic clue corpus with planted rephrasings and reports
+MinHash/LSH throughput, precision and recall
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dedup import DEFAULT_THRESHOLD, LSHIndex, shingles, signatures_for_clues  # noqa: E402
+
+
+def make_corpus(num_clues: int, dup_rate: float = 0.05, vocab_size: int = 20000, seed: int = 42):
+    """
+    Random clues plus lightly rephrased copies of some of them
+
+    Returns:
+        (items, planted) where items are (key, clue, answer) tuples and
+        planted is the set of (original_key, copy_key) pairs
+    """
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(vocab_size)]
+    items = []
+    planted = set()
+
+    originals = int(num_clues * (1 - dup_rate))
+    for key in range(originals):
+        words = rng.choices(vocab, k=rng.randint(8, 20))
+        items.append((key, " ".join(words), rng.choice(vocab)))
+
+    for key in range(originals, num_clues):
+        source_key, clue, answer = items[rng.randrange(originals)]
+        words = clue.split()
+        # One or two light edits: substitute, insert or drop a word
+        for _ in range(rng.randint(1, 2)):
+            edit = rng.choice(('sub', 'ins', 'del'))
+            pos = rng.randrange(len(words))
+            if edit == 'sub':
+                words[pos] = rng.choice(vocab)
+            elif edit == 'ins':
+                words.insert(pos, rng.choice(vocab))
+            elif len(words) > 4:
+                del words[pos]
+        items.append((key, " ".join(words), answer))
+        planted.add((source_key, key))
+
+    return items, planted
+
+
+def main():
+    num_clues = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    print(f"Building synthetic corpus of {num_clues:,} clues...")
+    items, planted = make_corpus(num_clues)
+
+    start = time.perf_counter()
+    signatures = signatures_for_clues(items)
+    hash_seconds = time.perf_counter() - start
+
+    index = LSHIndex()
+    found = set()
+    start = time.perf_counter()
+    for key, sig in signatures:
+        for other, _ in index.add(key, array('I', sig)):
+            found.add((min(key, other), max(key, other)))
+    lsh_seconds = time.perf_counter() - start
+
+    # Planted pairs whose exact Jaccard similarity clears the threshold are
+    # the ones the index is expected to find
+    by_key = {key: (clue, answer) for key, clue, answer in items}
+
+    def jaccard(a, b):
+        sa, sb = shingles(*by_key[a]), shingles(*by_key[b])
+        return len(sa & sb) / len(sa | sb)
+
+    eligible = {pair for pair in planted if jaccard(*pair) >= DEFAULT_THRESHOLD}
+
+    true_positives = len(found & planted)
+    precision = true_positives / len(found) if found else 1.0
+    recall = true_positives / len(planted) if planted else 1.0
+    recall_eligible = len(found & eligible) / len(eligible) if eligible else 1.0
+
+    print("\n" + "="*60)
+    print(f"MinHash signatures: {num_clues / hash_seconds:,.0f} clues/sec ({hash_seconds:.2f}s)")
+    print(f"LSH matching:       {num_clues / lsh_seconds:,.0f} clues/sec ({lsh_seconds:.2f}s)")
+    print(f"Planted pairs: {len(planted):,}  Found pairs: {len(found):,}")
+    print(f"Precision: {precision:.3f}  Recall: {recall:.3f} "
+          f"(pairs with Jaccard >= {DEFAULT_THRESHOLD}: {recall_eligible:.3f} of {len(eligible):,})")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for rendering personalized daily emails
+Renders one email per recipient, where recipients share a smaller pool of
+question sets (e.g. per difficulty level), and compares string
+concatenation, the precompiled template and the render cache
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from email_template import (  # noqa: E402
+    ANSWER_CARD, CLUE_CARD, DAILY_DOUBLE_BADGE, SHELL_DIVIDER, SHELL_FOOTER, SHELL_HEAD,
+    RenderCache, render_email,
+)
+from synthetic import WORDS  # noqa: E402
+
+
+def make_question_sets(num_sets: int, seed: int = 7):
+    rng = random.Random(seed)
+
+    def words(low, high):
+        return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+    return [
+        [{
+            'game_id': rng.randint(1, 9000),
+            'air_date': "Monday, May 1, 2000",
+            'category': words(1, 3).upper(),
+            'value': f"${rng.choice([200, 400, 600, 800, 1000]):,}",
+            'clue': words(8, 25),
+            'answer': words(1, 3),
+            'round': rng.choice(["Jeopardy!", "Double Jeopardy!"]),
+            'daily_double': rng.random() < 0.05,
+        } for _ in range(3)]
+        for _ in range(num_sets)
+    ]
+
+
+def render_concatenated(questions):
+    """The old approach: html += per fragment, rendered from scratch every time"""
+    html = SHELL_HEAD
+    for i, q in enumerate(questions, 1):
+        html += CLUE_CARD.format(
+            number=i, total=len(questions), round=q['round'], category=q['category'], value=q['value'],
+            dd_badge=DAILY_DOUBLE_BADGE if q['daily_double'] else '', clue=q['clue'],
+            game_id=q['game_id'], air_date=q['air_date'],
+        )
+    html += SHELL_DIVIDER
+    for i, q in enumerate(questions, 1):
+        html += ANSWER_CARD.format(number=i, category=q['category'], value=q['value'], answer=q['answer'])
+    html += SHELL_FOOTER
+    return html
+
+
+def main():
+    num_emails = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_sets = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    question_sets = make_question_sets(num_sets)
+    rng = random.Random(1)
+    # Each recipient gets one of the shared sets, as independent dicts like a fresh pick would be
+    assignments = [[dict(q) for q in rng.choice(question_sets)] for _ in range(num_emails)]
+
+    print(f"Rendering {num_emails:,} emails from {num_sets} distinct question sets...")
+    results = {}
+    cache = RenderCache()
+    for name, render in (("concatenation", render_concatenated),
+                         ("precompiled", render_email),
+                         ("precompiled + cache", cache.render)):
+        start = time.perf_counter()
+        total_bytes = 0
+        for questions in assignments:
+            total_bytes += len(render(questions))
+        results[name] = (time.perf_counter() - start, total_bytes)
+
+    print("\n" + "="*60)
+    baseline = results["concatenation"][0]
+    for name, (seconds, total_bytes) in results.items():
+        print(f"{name:<20} {num_emails / seconds:>10,.0f} emails/sec  {seconds:.3f}s  "
+              f"({baseline / seconds:.1f}x, {total_bytes / num_emails / 1024:.1f} KB/email)")
+    print(f"Render cache: {cache.stats()}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark for compressed game files
+Writes the same synthetic games as plain JSON, gzip, zstd and zstd with a
+trained dictionary, and reports size on disk, write speed and cold-cache
+read speed (page cache evicted per file where the OS supports it)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from archive import GAME_FORMATS, load_game_data, write_game_file  # noqa: E402
+from synthetic import FIRST_AIR_DATE, make_game  # noqa: E402
+
+
+def evict(paths) -> bool:
+    """Drop the files from the page cache; False where posix_fadvise isn't available"""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    os.sync()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def disk_usage(paths) -> int:
+    """Allocated bytes (whole filesystem blocks), which is what small files really cost"""
+    return sum(os.stat(p).st_blocks * 512 for p in paths)
+
+
+def run_variant(root: str, name: str, fmt: str, games, dictionary: bool):
+    output_dir = os.path.join(root, name)
+    os.makedirs(output_dir)
+    if dictionary:
+        from game_format import train_dictionary
+        # Train on a separate sample written as plain JSON, as a real archive would be
+        sample_dir = os.path.join(output_dir, "sample")
+        os.makedirs(sample_dir)
+        for data in games[:min(len(games), 2000)]:
+            write_game_file(os.path.join(sample_dir, f"jeopardy_game_{data['game_id']}.json"), data)
+        train_dictionary(output_dir)
+        shutil.rmtree(sample_dir)
+
+    paths = [os.path.join(output_dir, f"jeopardy_game_{data['game_id']}{GAME_FORMATS[fmt]}") for data in games]
+    start = time.perf_counter()
+    for path, data in zip(paths, games):
+        write_game_file(path, data, output_dir)
+    write_seconds = time.perf_counter() - start
+
+    cold = evict(paths)
+    start = time.perf_counter()
+    for path in paths:
+        load_game_data(path)
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        load_game_data(path)
+    warm_seconds = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "bytes": sum(os.path.getsize(p) for p in paths),
+        "disk": disk_usage(paths),
+        "write": len(paths) / write_seconds,
+        "read": len(paths) / read_seconds,
+        "warm": len(paths) / warm_seconds,
+        "cold": cold,
+    }
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    try:
+        import zstandard  # noqa: F401
+        have_zstd = True
+    except ImportError:
+        have_zstd = False
+
+    print(f"Building {num_games:,} synthetic games...")
+    rng = random.Random(42)
+    games = [make_game(game_id, FIRST_AIR_DATE + timedelta(days=game_id), rng) for game_id in range(1, num_games + 1)]
+
+    variants = [("json", "json", False), ("gzip", "gzip", False)]
+    if have_zstd:
+        variants += [("zstd", "zstd", False), ("zstd+dict", "zstd", True)]
+
+    root = tempfile.mkdtemp(prefix="bench_game_format_")
+    try:
+        results = [run_variant(root, name, fmt, games, dictionary) for name, fmt, dictionary in variants]
+    finally:
+        shutil.rmtree(root)
+
+    baseline = results[0]
+    print("\n" + "="*78)
+    print(f"{'format':<10} {'bytes/game':>10} {'on disk':>10} {'vs json':>8} "
+          f"{'write/s':>9} {'cold read/s':>12} {'warm read/s':>12}")
+    for r in results:
+        print(f"{r['name']:<10} {r['bytes'] // num_games:>10,} {r['disk'] / (1 << 20):>8.1f}MB "
+              f"{r['disk'] / baseline['disk']:>8.0%} {r['write']:>9,.0f} {r['read']:>12,.0f} {r['warm']:>12,.0f}")
+    if not baseline["cold"]:
+        print("(posix_fadvise unavailable: 'cold' reads may have been served from the page cache)")
+    if not have_zstd:
+        print("(zstandard not installed: zstd rows skipped)")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Load test for the local HTTP query service
+Generates a synthetic archive, starts the server and drives it with
+concurrent keep-alive clients, reporting requests/sec and latency percentiles
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from query_server import serve  # noqa: E402
+from synthetic import generate_archive  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 8799
+
+
+def make_targets(num_games: int):
+    """Endpoint name -> function producing a request path"""
+    return {
+        "game": lambda rng: f"/games/{rng.randint(1, num_games)}",
+        "random-clue": lambda rng: "/random-clue" + rng.choice(["", "?round=jeopardy", "?round=double"]),
+        "search": lambda rng: f"/search?q={rng.choice(['lincoln', 'volcano', 'river*', 'queen'])}&limit=10",
+        "dates": lambda rng: f"/dates?from=19{rng.randint(85, 99)}-01-01&to=19{rng.randint(85, 99)}-12-31",
+    }
+
+
+async def client(targets, weights, deadline: float, latencies: dict, seed: int):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    names = list(targets)
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            path = targets[name](rng)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+
+            status = int(status_line.split()[1])
+            latencies.setdefault(name, []).append((time.perf_counter() - start, status))
+    finally:
+        writer.close()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        print(f"Generating synthetic archive of {num_games} games...")
+        generate_archive(output_dir, num_games)
+
+        ready = threading.Event()
+        server_thread = threading.Thread(
+            target=lambda: asyncio.run(serve(output_dir, HOST, PORT, cache_size=256, preload=256, ready=ready)),
+            daemon=True,
+        )
+        server_thread.start()
+        ready.wait()
+
+        targets = make_targets(num_games)
+        weights = [5, 3, 1, 1]
+        latencies = {}
+
+        async def run():
+            deadline = time.perf_counter() + duration
+            await asyncio.gather(*(client(targets, weights, deadline, latencies, seed)
+                                   for seed in range(concurrency)))
+
+        print(f"Running {concurrency} clients for {duration:.0f}s...")
+        asyncio.run(run())
+
+    all_latencies = [l for samples in latencies.values() for l, _ in samples]
+    print("\n" + "="*60)
+    print(f"Total: {len(all_latencies):,} requests, {len(all_latencies) / duration:,.0f} req/sec")
+    print(f"{'Endpoint':<14}{'Requests':>10}{'Errors':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in sorted(latencies.items()):
+        values = [l for l, _ in samples]
+        errors = sum(1 for _, status in samples if status >= 400)
+        print(f"{name:<14}{len(values):>10,}{errors:>8}{percentile(values, 50) * 1000:>10.2f}"
+              f"{percentile(values, 99) * 1000:>10.2f}")
+    print(f"{'all':<14}{len(all_latencies):>10,}{'':>8}{percentile(all_latencies, 50) * 1000:>10.2f}"
+          f"{percentile(all_latencies, 99) * 1000:>10.2f}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for selection, reorganization and loading
+Generates synthetic archives of growing size (flat, like an old output/
+before reorganize_output.py) and times reorganizing them, building and
+loading the manifest, cold game reads and pick_random_questions in each of
+its modes, then reports how each cost grows with the archive
+"""
+
+import contextlib
+import io
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import daily_jeopardy_email  # noqa: E402
+from archive import GAME_FORMATS, iter_game_files, load_game_data, load_manifest  # noqa: E402
+from reorganize_output import apply_plan, build_plan  # noqa: E402
+from sampling import parse_plan  # noqa: E402
+from sent_history import SentHistory  # noqa: E402
+from synthetic import generate_archive  # noqa: E402
+
+READ_SAMPLE = 1000   # Games read cold per size
+PICK_RUNS = 5        # pick_random_questions calls per mode (median reported)
+PLAN = "jeopardy+easy,jeopardy+hard,double"
+
+COLUMNS = (
+    ("generate", "Generate (games/s)", "{:,.0f}"),
+    ("reorganize", "Reorganize flat -> YYYY/MM (s)", "{:.2f}"),
+    ("manifest_build", "Manifest build, cold (s)", "{:.2f}"),
+    ("manifest_load", "Manifest load, warm (ms)", "{:.1f}"),
+    ("game_read", "Game read, cold (ms/game)", "{:.3f}"),
+    ("pick_plain", "pick_random_questions (ms)", "{:.1f}"),
+    ("pick_dates", "  1990s games only (ms)", "{:.1f}"),
+    ("clue_table", "  clue table build (s)", "{:.2f}"),
+    ("pick_history", "  with history (ms)", "{:.1f}"),
+    ("pick_plan", "  with a plan (ms)", "{:.1f}"),
+)
+
+
+def evict(paths):
+    """Drop files from the page cache where the OS allows it"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    os.sync()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def timed(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def median_ms(fn, runs: int = PICK_RUNS) -> float:
+    return statistics.median(timed(fn) for _ in range(runs)) * 1000
+
+
+def run_size(root: str, num_games: int, fmt: str, workers: int) -> dict:
+    output_dir = os.path.join(root, f"archive_{num_games}")
+    result = {}
+
+    start = time.perf_counter()
+    generate_archive(output_dir, num_games, layout="flat", fmt=fmt, spread=True,
+                     workers=workers, write_manifest=False)
+    result["generate"] = num_games / (time.perf_counter() - start)
+
+    def reorganize():
+        plan = build_plan(output_dir, workers)
+        errors = apply_plan(output_dir, plan, workers)
+        if errors:
+            raise RuntimeError(f"{len(errors)} files failed to move")
+
+    result["reorganize"] = timed(reorganize)
+
+    paths = iter_game_files(output_dir)
+    evict(paths)
+    result["manifest_build"] = timed(load_manifest, output_dir)
+    result["manifest_load"] = timed(load_manifest, output_dir) * 1000
+
+    sample = random.Random(1).sample(paths, min(READ_SAMPLE, len(paths)))
+    evict(sample)
+    result["game_read"] = timed(lambda: [load_game_data(p) for p in sample]) * 1000 / len(sample)
+
+    daily_jeopardy_email.OUTPUT_DIR = Path(output_dir)
+    result["pick_plain"] = median_ms(lambda: daily_jeopardy_email.pick_random_questions(3))
+    result["pick_dates"] = median_ms(
+        lambda: daily_jeopardy_email.pick_random_questions(3, date_from="1990-01-01", date_to="1999-12-31"))
+    history = SentHistory.load(output_dir)
+    # The first history pick builds the clue table; later ones reuse it
+    result["clue_table"] = timed(lambda: daily_jeopardy_email.pick_random_questions(3, history=history))
+    result["pick_history"] = median_ms(lambda: daily_jeopardy_email.pick_random_questions(3, history=history))
+    plan = parse_plan(PLAN)
+    daily_jeopardy_email.pick_random_questions(plan=plan)  # Builds the sampler
+    result["pick_plan"] = median_ms(lambda: daily_jeopardy_email.pick_random_questions(plan=plan))
+
+    shutil.rmtree(output_dir)
+    return result
+
+
+def main():
+    sizes = [1000, 10000, 50000]
+    fmt = "json"
+    workers = os.cpu_count() or 1
+
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] == '--format' and i + 1 < len(args) and args[i + 1] in GAME_FORMATS:
+            fmt = args[i + 1]
+            i += 2
+        elif args[i] == '--workers' and i + 1 < len(args):
+            workers = int(args[i + 1])
+            i += 2
+        elif not args[i].startswith('--'):
+            sizes = [int(size) for size in args[i].split(',')]
+            i += 1
+        else:
+            print("Usage: python benchmarks/bench_scale.py [sizes, e.g. 1000,10000,100000] "
+                  f"[--format <{'|'.join(GAME_FORMATS)}>] [--workers <n>]")
+            sys.exit(1)
+
+    root = tempfile.mkdtemp(prefix="bench_scale_")
+    results = {}
+    try:
+        for num_games in sizes:
+            print(f"Archive of {num_games:,} {fmt} games...")
+            results[num_games] = run_size(root, num_games, fmt, workers)
+    finally:
+        shutil.rmtree(root)
+
+    print("\n" + "="*(34 + 12 * (len(sizes) + 1)))
+    print(f"{'':<34}" + "".join(f"{n:>12,}" for n in sizes) + f"{'growth':>12}")
+    for key, label, spec in COLUMNS:
+        values = [results[n][key] for n in sizes]
+        row = f"{label:<34}" + "".join(f"{spec.format(v):>12}" for v in values)
+        # Scaling exponent between the smallest and largest archive: 0 = flat, 1 = linear
+        if len(sizes) > 1 and values[0] > 0 and values[-1] > 0 and key != "generate":
+            row += f"{'n^' + format(math.log(values[-1] / values[0]) / math.log(sizes[-1] / sizes[0]), '.2f'):>12}"
+        print(row)
+    print("="*(34 + 12 * (len(sizes) + 1)))
+
+
+if __name__ == "__main__":
+    main()
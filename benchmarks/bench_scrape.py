@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraping benchmark against the local J-Archive stand-in
+Drives scrape_range, scrape_season and the multi-process work queue against
+a stand-in server (optionally with injected latency and faults), each in its
+own child process, and reports pages/sec, CPU time and peak RSS
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from jarchive_standin import start_standin  # noqa: E402
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PROFILES = {
+    "clean": {"latency": "0.02"},
+    "faulty": {"latency": "lognormal:0.05,0.5", "throttle_rate": 0.02, "error_rate": 0.02,
+               "jarchive_error_rate": 0.01, "stall_rate": 0.01, "stall_seconds": 10.0},
+}
+# Read timeout for the scrapers, so stalls cost a second instead of 30
+FAULTY_TIMEOUT = "1"
+
+MODES = ("range", "season", "queue")
+
+
+def run_child(mode: str, num_games: int, processes: int):
+    """Runs inside the child process, in a fresh working directory"""
+    if mode == "range":
+        from batch_scraper import scrape_range
+        scrape_range(1, num_games, delay=0)
+    elif mode == "season":
+        from scraper import get_base_url
+        from season_scraper import scrape_season
+        scrape_season(f"{get_base_url()}/showseason.php?season=1", delay=0, output_dir="output")
+    elif mode == "queue":
+        from work_queue import WorkQueue, default_queue_path, run_workers
+        queue_path = default_queue_path("output")
+        WorkQueue(queue_path).enqueue(range(1, num_games + 1))
+        run_workers(queue_path, "output", processes, delay=0, lease_seconds=30)
+
+
+def count_saved(output_dir: str) -> int:
+    return sum(1 for _, dirs, files in os.walk(output_dir)
+               for name in files if name.startswith("jeopardy_game_") and name.endswith(".json"))
+
+
+def run_mode(server, mode: str, num_games: int, processes: int, env: dict) -> dict:
+    before = sum(server.status_counts.values())
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        child = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, str(num_games), str(processes)],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL)
+        # wait4's usage covers the child and the worker processes it waited for
+        _, status, usage = os.wait4(child.pid, 0)
+        child.returncode = os.waitstatus_to_exitcode(status)
+        elapsed = time.perf_counter() - start
+        saved = count_saved(os.path.join(workdir, "output"))
+    requests = sum(server.status_counts.values()) - before
+    cpu = usage.ru_utime + usage.ru_stime
+    return {
+        "mode": mode if mode != "queue" else f"queue x{processes}",
+        "requests": requests,
+        "saved": saved,
+        "seconds": elapsed,
+        "pages_per_sec": requests / elapsed,
+        "cpu_seconds": cpu,
+        "cpu_ms_per_page": cpu / requests * 1000 if requests else 0.0,
+        "max_rss_mb": usage.ru_maxrss / 1024,
+        "exit": child.returncode,
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        sys.path.insert(0, REPO)
+        run_child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    num_games = 200
+    processes = 4
+    profile = "clean"
+    modes = list(MODES)
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == "--processes" and i + 1 < len(sys.argv):
+            processes = int(sys.argv[i + 1])
+            i += 2
+        elif arg == "--profile" and i + 1 < len(sys.argv) and sys.argv[i + 1] in PROFILES:
+            profile = sys.argv[i + 1]
+            i += 2
+        elif arg == "--modes" and i + 1 < len(sys.argv):
+            modes = [m for m in sys.argv[i + 1].split(",") if m in MODES]
+            i += 2
+        elif arg.isdigit():
+            num_games = int(arg)
+            i += 1
+        else:
+            print("Usage: python benchmarks/bench_scrape.py [num_games] [--processes <n>] "
+                  "[--profile clean|faulty] [--modes range,season,queue]")
+            sys.exit(1)
+
+    server = start_standin(max_game_id=num_games, seed=1, **PROFILES[profile])
+    env = dict(os.environ, J_ARCHIVE_URL=server.base_url, J_ARCHIVE_RATE="0",
+               PYTHONPATH=os.pathsep.join(filter(None, [os.path.abspath(REPO), os.environ.get("PYTHONPATH")])))
+    if profile == "faulty":
+        env["J_ARCHIVE_TIMEOUT"] = FAULTY_TIMEOUT
+
+    print(f"Scraping {num_games} games from the stand-in ({profile} profile: {PROFILES[profile]}), "
+          f"{os.cpu_count()} CPU(s)...")
+    results = [run_mode(server, mode, num_games, processes, env) for mode in modes]
+    server.shutdown()
+
+    print("\n" + "="*78)
+    print(f"{'mode':<12} {'requests':>8} {'saved':>6} {'pages/s':>8} {'seconds':>8} "
+          f"{'CPU s':>7} {'CPU ms/page':>11} {'peak RSS':>9}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['requests']:>8} {r['saved']:>6} {r['pages_per_sec']:>8.1f} {r['seconds']:>8.2f} "
+              f"{r['cpu_seconds']:>7.2f} {r['cpu_ms_per_page']:>11.1f} {r['max_rss_mb']:>7.1f}MB"
+              + ("" if r["exit"] == 0 else f"  (exit {r['exit']})"))
+    print(f"Server responses: {server.status_counts}")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
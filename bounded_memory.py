@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory Batch Runs
+RSS sampling for the batch and season run reports, and parse workers that
+are replaced every N pages, so long runs keep a flat memory footprint even
+if something in the fetch/parse stack leaks
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+def current_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Resident set size of a process in MB (None where /proc isn't available)"""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RssSampler:
+    """Samples this process's RSS every few pages for the run report"""
+
+    def __init__(self, every: int = 50):
+        self.every = every
+        self.pages = 0
+        self.samples: List[Tuple[int, float]] = []
+        self.worker_peak: Optional[float] = None
+        self.sample()
+
+    def sample(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.samples.append((self.pages, rss))
+
+    def page(self, worker_rss: Optional[float] = None):
+        self.pages += 1
+        if worker_rss is not None:
+            self.worker_peak = max(self.worker_peak or 0.0, worker_rss)
+        if self.pages % self.every == 0:
+            self.sample()
+
+    def growth_per_1000(self, warmup: float = 0.1) -> Optional[float]:
+        """Least-squares RSS slope (MB per 1000 pages), ignoring the first warmup fraction of the run"""
+        points = [(p, r) for p, r in self.samples if p >= self.pages * warmup]
+        if len(points) < 3:
+            return None
+        mean_p = sum(p for p, _ in points) / len(points)
+        mean_r = sum(r for _, r in points) / len(points)
+        var = sum((p - mean_p) ** 2 for p, _ in points)
+        if not var:
+            return None
+        return sum((p - mean_p) * (r - mean_r) for p, r in points) / var * 1000
+
+    def summary(self) -> Dict:
+        self.sample()
+        if not self.samples:
+            return {"pages": self.pages}
+        values = [r for _, r in self.samples]
+        growth = self.growth_per_1000()
+        return {
+            "pages": self.pages,
+            "rss_start_mb": round(values[0], 1),
+            "rss_peak_mb": round(max(values), 1),
+            "rss_end_mb": round(values[-1], 1),
+            "growth_mb_per_1000_pages": None if growth is None else round(growth, 2),
+            "worker_peak_mb": None if self.worker_peak is None else round(self.worker_peak, 1),
+        }
+
+    def report_line(self) -> str:
+        s = self.summary()
+        if "rss_start_mb" not in s:
+            return "Memory: RSS not available on this platform"
+        line = f"Memory: RSS {s['rss_start_mb']} MB at start, {s['rss_peak_mb']} MB peak, {s['rss_end_mb']} MB at end"
+        if s["growth_mb_per_1000_pages"] is not None:
+            line += f" ({s['growth_mb_per_1000_pages']:+} MB per 1000 pages)"
+        if s["worker_peak_mb"] is not None:
+            line += f"; parse workers peaked at {s['worker_peak_mb']} MB"
+        return line
+
+
+def _scrape_in_worker(game_id: int, url: str, priority: str):
+    from scraper import JeopardyScraper
+
+    scraper = JeopardyScraper(game_id, priority=priority)
+    scraper.url = url
+    data = scraper.scrape()
+    return data, scraper.failure, current_rss_mb()
+
+
+class ParseWorkers:
+    """
+    Fetches and parses pages in a child process that is replaced every
+    recycle_every pages, so whatever a page leaves behind goes with it
+
+    The driver keeps its JeopardyScraper for saving; only the fetch and parse
+    happen in the worker, and the plain game dict comes back.
+    """
+
+    def __init__(self, recycle_every: int, processes: int = 1):
+        import multiprocessing
+
+        self.recycle_every = recycle_every
+        self.pool = multiprocessing.Pool(processes, maxtasksperchild=recycle_every)
+        self.last_rss: Optional[float] = None
+
+    def scrape(self, scraper) -> Optional[Dict]:
+        # Safe to call from several threads; each call waits for its own page
+        data, scraper.failure, self.last_rss = self.pool.apply(
+            _scrape_in_worker, (scraper.game_id, scraper.url, scraper.priority))
+        return data
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def scrape_game(scraper, workers: Optional[ParseWorkers] = None, memory: Optional[RssSampler] = None) -> Optional[Dict]:
+    """scraper.scrape(), in a recycled parse worker if there is one, counted in the memory report"""
+    data = workers.scrape(scraper) if workers else scraper.scrape()
+    if memory is not None:
+        memory.page(workers.last_rss if workers else None)
+    return data
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Columnar clue table built from the scraped archive
+One row per clue, stored as typed arrays so aggregates can run as
+whole-column group-bys instead of loops over per-game dicts
+"""
+
+import os
+import pickle
+import re
+from array import array
+from collections import Counter
+from datetime import date
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from archive import ArchiveManifest, game_iso_date, get_index_dir, load_game_data, load_manifest
+
+
+CACHE_FILENAME = "clue_table.pickle"
+CACHE_VERSION = 3
+
+# Board values doubled on November 26, 2001
+VALUE_CHANGE_DATE = date(2001, 11, 26)
+
+ROUNDS = ('jeopardy_round', 'double_jeopardy_round')
+ROUND_NAMES = ('Jeopardy!', 'Double Jeopardy!')
+
+# Column name -> array typecode
+CLUE_COLUMNS = {
+    "file": 'l',            # Index into ClueTable.files
+    "game_id": 'l',
+    "round": 'b',           # 0 = Jeopardy!, 1 = Double Jeopardy!
+    "position": 'h',        # Index in the round's "clues" list
+    "category_index": 'b',  # -1 when unknown
+    "row": 'b',             # Board row (0 = top), as scraped or inferred from the value
+    "value": 'l',           # Dollar value (wager for Daily Doubles), -1 when unknown
+    "daily_double": 'b',
+    "valid": 'b',           # Has both clue text and answer
+    "category": 'l',        # Index into ClueTable.categories, -1 when unknown
+    "year": 'h',            # 0 when the air date is unknown
+    "season": 'h',
+}
+
+GAME_COLUMNS = {
+    "file": 'l',
+    "game_id": 'l',
+    "year": 'h',
+    "season": 'h',
+    "final_category": 'l',  # Index into ClueTable.categories, -1 when unknown
+}
+
+
+def parse_value(value: Optional[str]) -> int:
+    """Convert a value string like "$1,200" to an int (-1 if unparseable)"""
+    if not value:
+        return -1
+    digits = re.sub(r'[^\d]', '', value)
+    return int(digits) if digits else -1
+
+
+def value_ladder(air_date: date, round_code: int) -> List[int]:
+    """Board values, top row first, for a round on a given air date"""
+    base = 200 if air_date >= VALUE_CHANGE_DATE else 100
+    if round_code == 1:
+        base *= 2
+    return [base * (row + 1) for row in range(5)]
+
+
+def season_for_date(date_obj) -> int:
+    """J-Archive season number (seasons start in September, season 1 = 1984-85)"""
+    if date_obj is None:
+        return 0
+    return date_obj.year - 1984 + (1 if date_obj.month >= 9 else 0)
+
+
+def extract_game_rows(data: Dict) -> Tuple[Tuple, List[Tuple]]:
+    """
+    Flatten one game into table rows
+
+    Returns:
+        (game_row, clue_rows) where categories are still plain strings
+    """
+    iso = game_iso_date(data)
+    date_obj = date.fromisoformat(iso) if iso else None
+    year = date_obj.year if date_obj else 0
+    season = season_for_date(date_obj)
+    game_id = data.get('game_id') or 0
+
+    final_category = (data.get('final_jeopardy') or {}).get('category')
+    game_row = (game_id, year, season, final_category)
+
+    clue_rows = []
+    for round_code, round_key in enumerate(ROUNDS):
+        round_data = data.get(round_key) or {}
+        ladder = {value: row for row, value in enumerate(value_ladder(date_obj, round_code))} if date_obj else {}
+        row = 0
+        prev_index = -1
+        for position, clue in enumerate(round_data.get('clues', [])):
+            category_index = clue.get('category_index', -1)
+            if category_index is None:
+                category_index = -1
+            value = parse_value(clue.get('value'))
+            if isinstance(clue.get('row'), int):
+                row = clue['row']
+            elif not clue.get('daily_double') and value in ladder:
+                # Games scraped before rows were recorded: a regular clue's value gives its row
+                row = ladder[value]
+            elif 0 <= category_index <= prev_index:
+                # Daily Doubles (and unknown values) share the previous clue's row
+                # unless the category index wraps around to a new one
+                row = min(row + 1, 4)
+            if category_index >= 0:
+                prev_index = category_index
+
+            clue_rows.append((
+                game_id,
+                round_code,
+                position,
+                category_index,
+                row,
+                value,
+                1 if clue.get('daily_double') else 0,
+                1 if clue.get('clue') and clue.get('answer') else 0,
+                clue.get('category'),
+                year,
+                season,
+            ))
+
+    return game_row, clue_rows
+
+
+class ClueTable:
+    """Typed column arrays for every clue (and every game) in the archive"""
+
+    def __init__(self):
+        self.digest = None
+        self.files = []
+        self.categories = []
+        self.clues = {name: array(code) for name, code in CLUE_COLUMNS.items()}
+        self.games = {name: array(code) for name, code in GAME_COLUMNS.items()}
+        self.valid_rows = array('l')  # Clue rows with both clue text and answer, for sampling
+
+    def __len__(self) -> int:
+        return len(self.clues["game_id"])
+
+    def category_name(self, code: int) -> Optional[str]:
+        return self.categories[code] if code >= 0 else None
+
+    def mask(self, **conditions) -> List[bool]:
+        """
+        Row mask where every named clue column equals the given value
+
+        Example: table.mask(daily_double=1, round=0)
+        """
+        mask = None
+        for name, expected in conditions.items():
+            column_mask = [v == expected for v in self.clues[name]]
+            mask = column_mask if mask is None else list(map(bool.__and__, mask, column_mask))
+        return mask if mask is not None else [True] * len(self)
+
+    def group_count(self, keys: Sequence[str], mask: Optional[Iterable[bool]] = None,
+                    table: str = "clues") -> Counter:
+        """Count rows per distinct combination of key columns"""
+        columns = getattr(self, table)
+        rows = zip(*(columns[k] for k in keys)) if len(keys) > 1 else iter(columns[keys[0]])
+        if mask is not None:
+            rows = compress(rows, mask)
+        return Counter(rows)
+
+    def group_mean(self, keys: Sequence[str], value: str,
+                   mask: Optional[Iterable[bool]] = None) -> Dict:
+        """Mean of a value column per distinct combination of key columns"""
+        columns = self.clues
+        keyed = zip(zip(*(columns[k] for k in keys)), columns[value])
+        if mask is not None:
+            keyed = compress(keyed, mask)
+
+        totals = Counter()
+        counts = Counter()
+        for key, v in keyed:
+            totals[key] += v
+            counts[key] += 1
+        return {key: totals[key] / counts[key] for key in counts}
+
+
+def _build_columns(table: ClueTable, per_file: Dict[str, Dict]):
+    """Assemble column arrays from cached per-file rows"""
+    category_codes = {}
+
+    def intern(name):
+        if name is None:
+            return -1
+        code = category_codes.get(name)
+        if code is None:
+            code = category_codes[name] = len(table.categories)
+            table.categories.append(name)
+        return code
+
+    clue_columns = [table.clues[name] for name in CLUE_COLUMNS]
+    for file_code, rel in enumerate(sorted(per_file)):
+        table.files.append(rel)
+        cached = per_file[rel]
+
+        game_id, year, season, final_category = cached["game"]
+        table.games["file"].append(file_code)
+        table.games["game_id"].append(game_id)
+        table.games["year"].append(year)
+        table.games["season"].append(season)
+        table.games["final_category"].append(intern(final_category))
+
+        for row in cached["clues"]:
+            values = (file_code,) + row[:8] + (intern(row[8]),) + row[9:]
+            if row[7]:
+                table.valid_rows.append(len(table))
+            for column, v in zip(clue_columns, values):
+                column.append(v)
+
+
+def load_clue_table(output_dir: str = "output", manifest: Optional[ArchiveManifest] = None) -> ClueTable:
+    """
+    Load the clue table for an output directory
+
+    The table is cached under the index directory keyed by the manifest
+    digest. When the archive changed, only new or modified games are re-read.
+    """
+    if manifest is None:
+        manifest = load_manifest(output_dir)
+    digest = manifest.digest()
+    cache_path = os.path.join(get_index_dir(output_dir), CACHE_FILENAME)
+
+    cache = None
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get("version") != CACHE_VERSION:
+            cache = None
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        cache = None
+
+    if cache and cache.get("digest") == digest:
+        return cache["table"]
+
+    previous = cache["files"] if cache else {}
+    per_file = {}
+    for rel, entry in manifest.entries.items():
+        stat_key = (entry.get("size"), entry.get("mtime_ns"))
+        cached = previous.get(rel)
+        if cached and cached["stat"] == stat_key:
+            per_file[rel] = cached
+            continue
+        try:
+            data = load_game_data(manifest.abspath(rel))
+        except (OSError, ValueError) as e:
+            print(f"  ✗ Error reading {rel}: {e}")
+            continue
+        game_row, clue_rows = extract_game_rows(data)
+        per_file[rel] = {"stat": stat_key, "game": game_row, "clues": clue_rows}
+
+    table = ClueTable()
+    table.digest = digest
+    _build_columns(table, per_file)
+
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({"version": CACHE_VERSION, "digest": digest, "table": table, "files": per_file}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    return table
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Contestant Profiles and Index
+A contestant -> games index kept up to date from the archive manifest, so
+streak and winnings questions don't open every game file, and an optional
+player-page (showplayer.php) cache keyed by J-Archive player id, so a
+champion who played twenty games is still fetched only once
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from archive import game_iso_date, get_index_dir, load_game_data, load_manifest
+
+
+INDEX_FILENAME = "contestants.sqlite"
+PLAYER_PATH = "/showplayer.php?player_id={player_id}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS appearances (
+    path        TEXT    NOT NULL,
+    game_id     INTEGER,
+    air_date    TEXT,
+    player_key  TEXT    NOT NULL,
+    player_id   INTEGER,
+    name        TEXT    NOT NULL,
+    final_score INTEGER,
+    won         INTEGER NOT NULL,
+    PRIMARY KEY (path, player_key)
+);
+CREATE INDEX IF NOT EXISTS appearances_player ON appearances(player_key, air_date);
+CREATE TABLE IF NOT EXISTS players (
+    player_id   INTEGER PRIMARY KEY,
+    name        TEXT,
+    occupation  TEXT,
+    game_ids    TEXT    NOT NULL,
+    fetched_at  TEXT    NOT NULL
+);
+"""
+
+
+def player_key(player_id: Optional[int], name: str) -> str:
+    """Who an appearance belongs to: the player id, or the name for games scraped before ids were kept"""
+    return f"id:{player_id}" if player_id else f"name:{name}"
+
+
+def parse_money(text: Optional[str]) -> Optional[int]:
+    """'$12,400' -> 12400, '-$1,000' -> -1000"""
+    if not text:
+        return None
+    match = re.search(r'(-?)\$?([\d,]+)', text)
+    if not match or not match.group(2).replace(',', ''):
+        return None
+    value = int(match.group(2).replace(',', ''))
+    return -value if match.group(1) else value
+
+
+def game_appearances(data: Dict) -> List[Dict]:
+    """
+    One row per contestant of a game, with their final score and whether they won
+
+    Final scores are listed by nickname, so they are matched to contestants
+    by first name - the score in the same position if its name fits (two
+    players can share a nickname), else the first unused one that does.
+    The winner is whoever finished highest above $0.
+    """
+    scores = [(s.get('contestant') or '', parse_money(s.get('final_score'))) for s in data.get('final_scores', [])]
+    top = max((score for _, score in scores if score is not None), default=0)
+    used = set()
+
+    def fits(nickname: str, name: str) -> bool:
+        nickname, name = nickname.lower(), name.lower()
+        return bool(nickname) and (nickname == name.split()[0] or name.startswith(nickname))
+
+    rows = []
+    for i, contestant in enumerate(data.get('contestants', [])):
+        name = contestant.get('name') or ''
+        candidates = ([i] if i < len(scores) else []) + list(range(len(scores)))
+        match = next((j for j in candidates if j not in used and name.split() and fits(scores[j][0], name)), None)
+        score = None
+        if match is not None:
+            used.add(match)
+            score = scores[match][1]
+        rows.append({
+            "player_key": player_key(contestant.get('player_id'), name),
+            "player_id": contestant.get('player_id'),
+            "name": name,
+            "final_score": score,
+            "won": score is not None and top > 0 and score == top,
+        })
+    return rows
+
+
+def parse_player_page(html: str) -> Optional[Dict]:
+    """Name, occupation and game ids from a showplayer.php page (None if it isn't one)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    try:
+        name_elem = soup.find(class_='player_full_name')
+        if name_elem is None:
+            return None
+        occupation_elem = soup.find(class_='player_occupation_and_origin')
+        game_ids = []
+        for link in soup.find_all('a', href=re.compile(r'showgame\.php\?game_id=\d+')):
+            game_id = int(re.search(r'game_id=(\d+)', link['href']).group(1))
+            if game_id not in game_ids:
+                game_ids.append(game_id)
+        return {
+            "name": name_elem.get_text(strip=True),
+            "occupation": occupation_elem.get_text(strip=True) if occupation_elem else None,
+            "game_ids": game_ids,
+        }
+    finally:
+        soup.decompose()
+
+
+def fetch_player(player_id: int, priority: str = "backfill") -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Fetch and parse one player page
+
+    Returns:
+        (profile, None) on success, (None, reason) on failure
+    """
+    import requests
+    from rate_budget import wait_for_turn
+    from scraper import get_base_url, get_request_timeout
+
+    url = get_base_url() + PLAYER_PATH.format(player_id=player_id)
+    wait_for_turn(url, priority)
+    try:
+        response = requests.get(url, timeout=get_request_timeout())
+        response.raise_for_status()
+    except requests.RequestException as e:
+        return None, f"{type(e).__name__}: {e}"
+    profile = parse_player_page(response.text)
+    return (profile, None) if profile else (None, "no player page")
+
+
+class ContestantIndex:
+    """
+    Appearances and cached player pages in a SQLite database under .jarchive/
+
+    Appearances are refreshed per game file from the manifest, like the
+    search index; player pages are stored once per player id and only
+    fetched again on request.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(get_index_dir(output_dir), INDEX_FILENAME)
+        self.db = sqlite3.connect(self.path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self) -> Dict[str, int]:
+        """
+        Bring the appearances up to date with the archive
+
+        Only new, changed or removed game files are read.
+
+        Returns:
+            Dict with counts of "added", "updated" and "removed" games
+        """
+        manifest = load_manifest(self.output_dir)
+        indexed = {path: (size, mtime_ns) for path, size, mtime_ns
+                   in self.db.execute("SELECT path, size, mtime_ns FROM files")}
+        counts = {"added": 0, "updated": 0, "removed": 0}
+
+        with self.db:
+            for rel in indexed:
+                if rel not in manifest.entries:
+                    self._remove_file(rel)
+                    counts["removed"] += 1
+
+            for rel, entry in manifest.entries.items():
+                if indexed.get(rel) == (entry.get('size'), entry.get('mtime_ns')):
+                    continue
+                try:
+                    data = load_game_data(manifest.abspath(rel))
+                except (OSError, ValueError) as e:
+                    print(f"  ✗ Error indexing {rel}: {e}")
+                    continue
+                if rel in indexed:
+                    self._remove_file(rel)
+                    counts["updated"] += 1
+                else:
+                    counts["added"] += 1
+                self._index_file(rel, entry, data)
+        return counts
+
+    def _remove_file(self, rel: str):
+        self.db.execute("DELETE FROM appearances WHERE path = ?", (rel,))
+        self.db.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+    def _index_file(self, rel: str, entry: Dict, data: Dict):
+        air_date = game_iso_date(data)
+        self.db.executemany(
+            "INSERT OR REPLACE INTO appearances (path, game_id, air_date, player_key, player_id, name, "
+            "final_score, won) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(rel, data.get('game_id'), air_date, row["player_key"], row["player_id"], row["name"],
+              row["final_score"], int(row["won"])) for row in game_appearances(data)]
+        )
+        self.db.execute("INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                        (rel, entry.get('size'), entry.get('mtime_ns')))
+
+    # Player page cache
+
+    def player(self, player_id: int) -> Optional[Dict]:
+        row = self.db.execute("SELECT name, occupation, game_ids, fetched_at FROM players WHERE player_id = ?",
+                              (player_id,)).fetchone()
+        if row is None:
+            return None
+        name, occupation, game_ids, fetched_at = row
+        return {"player_id": player_id, "name": name, "occupation": occupation,
+                "game_ids": json.loads(game_ids), "fetched_at": fetched_at}
+
+    def store_player(self, player_id: int, profile: Dict):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO players (player_id, name, occupation, game_ids, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (player_id, profile.get("name"), profile.get("occupation"), json.dumps(profile.get("game_ids", [])),
+                 datetime.now().isoformat(timespec='seconds')))
+
+    def uncached_players(self, refresh: bool = False) -> List[int]:
+        """Player ids seen in archived games whose page isn't cached yet (or all of them)"""
+        sql = "SELECT DISTINCT player_id FROM appearances WHERE player_id IS NOT NULL"
+        if not refresh:
+            sql += " AND player_id NOT IN (SELECT player_id FROM players)"
+        return [row[0] for row in self.db.execute(sql + " ORDER BY player_id")]
+
+    def fetch_players(self, delay: float = 1.0, limit: Optional[int] = None,
+                      refresh: bool = False) -> Dict[str, List[int]]:
+        """Fetch the player pages not in the cache yet, one request per player"""
+        player_ids = self.uncached_players(refresh)[:limit]
+        result = {"fetched": [], "failed": []}
+        for i, player_id in enumerate(player_ids):
+            profile, error = fetch_player(player_id)
+            if profile:
+                self.store_player(player_id, profile)
+                result["fetched"].append(player_id)
+                print(f"[{i + 1}/{len(player_ids)}] ✓ Player {player_id}: {profile['name']} "
+                      f"({len(profile['game_ids'])} games)")
+            else:
+                result["failed"].append(player_id)
+                print(f"[{i + 1}/{len(player_ids)}] ✗ Player {player_id}: {error}")
+            if i < len(player_ids) - 1:
+                time.sleep(delay)
+        return result
+
+    # Queries
+
+    def appearances(self, player: str) -> List[Dict]:
+        """A player's games in air-date order, by player id or (partial) name"""
+        if player.isdigit():
+            where, params = "player_id = ?", (int(player),)
+        else:
+            where, params = "name LIKE ?", (f"%{player}%",)
+        cursor = self.db.execute(
+            f"SELECT player_key, player_id, name, game_id, air_date, final_score, won, path FROM appearances "
+            f"WHERE {where} ORDER BY player_key, air_date, game_id", params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def _players(self) -> Dict[str, Dict]:
+        """Per player: longest run of consecutive wins, games, wins and winnings"""
+        players = {}
+        for key, player_id, name, won, score in self.db.execute(
+                "SELECT player_key, player_id, name, won, final_score FROM appearances "
+                "ORDER BY player_key, air_date, game_id"):
+            p = players.get(key)
+            if p is None:
+                p = players[key] = {"player_id": player_id, "name": name, "games": 0, "wins": 0,
+                                    "streak": 0, "winnings": 0, "_run": 0}
+            p["games"] += 1
+            if won:
+                p["wins"] += 1
+                p["winnings"] += score or 0
+                p["_run"] += 1
+                p["streak"] = max(p["streak"], p["_run"])
+            else:
+                p["_run"] = 0
+
+        names = dict(self.db.execute("SELECT player_id, name FROM players WHERE name IS NOT NULL"))
+        for p in players.values():
+            del p["_run"]
+            p["name"] = names.get(p["player_id"], p["name"])
+        return players
+
+    def top_streaks(self, top: int = 20) -> List[Dict]:
+        return sorted(self._players().values(), key=lambda p: (-p["streak"], -p["winnings"]))[:top]
+
+    def top_winnings(self, top: int = 20) -> List[Dict]:
+        return sorted(self._players().values(), key=lambda p: (-p["winnings"], -p["streak"]))[:top]
+
+
+def print_players(players: List[Dict]):
+    for rank, p in enumerate(players, 1):
+        pid = f" (#{p['player_id']})" if p["player_id"] else ""
+        print(f"  {rank:>3}. {p['name']}{pid}: {p['streak']}-game streak, {p['wins']}/{p['games']} won, "
+              f"${p['winnings']:,}")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args and not args[0].startswith('--') else None
+    output_dir = "output"
+    top = 20
+    delay = 1.0
+    limit = None
+    refresh = False
+    player = None
+
+    if command == "player" and args and not args[0].startswith('--'):
+        player = args.pop(0)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--output-dir', '--top', '--delay', '--limit') and i + 1 < len(args):
+            value = args[i + 1]
+            if arg == '--output-dir':
+                output_dir = value
+            elif arg == '--top':
+                top = int(value)
+            elif arg == '--delay':
+                delay = float(value)
+            else:
+                limit = int(value)
+            i += 2
+        elif arg == '--refresh':
+            refresh = True
+            i += 1
+        else:
+            command = None
+            break
+
+    if command not in ("update", "fetch-players", "streaks", "winnings", "player") or \
+            (command == "player" and player is None):
+        print("Contestant Profiles and Index")
+        print("\nUsage:")
+        print("  python contestants.py update [--output-dir <dir>]")
+        print("  python contestants.py streaks [--top <n>] [--output-dir <dir>]")
+        print("  python contestants.py winnings [--top <n>] [--output-dir <dir>]")
+        print("  python contestants.py player <player_id|name> [--output-dir <dir>]")
+        print("  python contestants.py fetch-players [--limit <n>] [--delay <seconds>] [--refresh] [--output-dir <dir>]")
+        print("\nfetch-players fetches the player page of every contestant in the archive")
+        print("that isn't cached yet (--refresh fetches them all again).")
+        sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    index = ContestantIndex(output_dir)
+    try:
+        counts = index.update()
+        if command == "update" or any(counts.values()):
+            print(f"Index updated: {counts['added']} added, {counts['updated']} updated, "
+                  f"{counts['removed']} removed")
+
+        if command == "fetch-players":
+            result = index.fetch_players(delay, limit, refresh)
+            print(f"\n✓ Fetched {len(result['fetched'])} player pages")
+            if result["failed"]:
+                print(f"✗ Failed: {len(result['failed'])} ({' '.join(map(str, result['failed']))})")
+        elif command == "streaks":
+            print("\n🏆 Longest winning streaks")
+            print_players(index.top_streaks(top))
+        elif command == "winnings":
+            print("\n💰 Highest winnings")
+            print_players(index.top_winnings(top))
+        elif command == "player":
+            rows = index.appearances(player)
+            if not rows:
+                print(f"No contestant matching '{player}'")
+                sys.exit(1)
+            for row in rows:
+                result = "won" if row["won"] else "lost"
+                score = f"${row['final_score']:,}" if row["final_score"] is not None else "?"
+                print(f"  {row['air_date'] or 'unknown date'}  game #{row['game_id']}  {row['name']}  "
+                      f"{score} ({result})")
+            profile = index.player(rows[0]["player_id"]) if rows[0]["player_id"] else None
+            if profile:
+                print(f"\n{profile['name']}, {profile['occupation'] or ''}: "
+                      f"{len(profile['game_ids'])} games on J-Archive (fetched {profile['fetched_at']})")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
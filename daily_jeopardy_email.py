@@ -5,43 +5,58 @@ Picks 3 random Jeopardy questions from 3 different games and sends them via emai
 """
 
 import os
-import json
+import sys
 import random
+import signal
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from dotenv import load_dotenv
-import requests
 
-# Load environment variables
-load_dotenv()
+from archive import iter_game_files, load_game_data, load_manifest, make_clue_id
+from batch_email import MailgunClient, SendJournal, deliver, load_recipients, print_report
+from clue_table import load_clue_table
+from dedup import load_repeat_ids
+from email_template import render_cached
+from sampling import SamplingWeights, load_sampler, parse_plan
+from sent_history import SentHistory, sample_questions
+
+OUTPUT_DIR = Path(__file__).parent / "output"
 
 def get_all_game_files():
     """Get all JSON game files from the output directory."""
-    output_dir = Path(__file__).parent / "output"
-    game_files = list(output_dir.glob("**/*.json"))
+    game_files = [Path(f) for f in iter_game_files(str(OUTPUT_DIR))]
     return game_files
 
-def load_game_data(game_file):
-    """Load and parse a game JSON file."""
-    with open(game_file, 'r') as f:
-        return json.load(f)
-
-def get_random_clue(game_data):
-    """Get a random clue from a game's jeopardy or double jeopardy rounds."""
+def get_random_clue(game_data, exclude_ids=None, rounds=None):
+    """Get a random clue from a game's jeopardy or double jeopardy rounds.
+    
+    Clues whose id (see archive.make_clue_id) is in exclude_ids are skipped.
+    rounds optionally limits the pick to some rounds, e.g. {'Double Jeopardy!'}.
+    """
+    game_id = game_data.get('game_id') or 0
+    exclude_ids = exclude_ids or ()
+    
     # Combine both rounds
     all_clues = []
     
     if 'jeopardy_round' in game_data and game_data['jeopardy_round']:
         all_clues.extend([
-            {**clue, 'round': 'Jeopardy!'}
-            for clue in game_data['jeopardy_round'].get('clues', [])
+            {**clue, 'round': 'Jeopardy!', 'clue_id': make_clue_id(game_id, 0, position)}
+            for position, clue in enumerate(game_data['jeopardy_round'].get('clues', []))
+            if make_clue_id(game_id, 0, position) not in exclude_ids
         ])
     
     if 'double_jeopardy_round' in game_data and game_data['double_jeopardy_round']:
         all_clues.extend([
-            {**clue, 'round': 'Double Jeopardy!'}
-            for clue in game_data['double_jeopardy_round'].get('clues', [])
+            {**clue, 'round': 'Double Jeopardy!', 'clue_id': make_clue_id(game_id, 1, position)}
+            for position, clue in enumerate(game_data['double_jeopardy_round'].get('clues', []))
+            if make_clue_id(game_id, 1, position) not in exclude_ids
         ])
     
+    if rounds:
+        all_clues = [c for c in all_clues if c['round'] in rounds]
+    
     # Filter out clues without both clue and answer
     valid_clues = [c for c in all_clues if c.get('clue') and c.get('answer')]
     
@@ -50,13 +65,94 @@ def get_random_clue(game_data):
     
     return random.choice(valid_clues)
 
-def pick_random_questions(num_questions=3):
-    """Pick random questions from different games."""
-    game_files = get_all_game_files()
+def make_question(game_data, clue):
+    """Build the question record used by the email from a game and one of its clues."""
+    return {
+        'game_id': game_data.get('game_id'),
+        'air_date': game_data.get('air_date'),
+        'category': clue.get('category'),
+        'value': clue.get('value'),
+        'clue': clue.get('clue'),
+        'answer': clue.get('answer'),
+        'round': clue.get('round'),
+        'daily_double': clue.get('daily_double', False),
+        'clue_id': clue.get('clue_id')
+    }
+
+def get_game_files_by_date(on_this_day=None, date_from=None, date_to=None):
+    """Get game files from the manifest's date index without opening any games.
+    
+    on_this_day: a date; selects games aired on that month/day in any year.
+    date_from / date_to: inclusive YYYY-MM-DD bounds on the air date.
+    """
+    manifest = load_manifest(str(OUTPUT_DIR))
+    if on_this_day is not None:
+        rels = manifest.date_index.on_day(on_this_day.month, on_this_day.day)
+        if date_from or date_to:
+            rels = [r for r in rels if (date_from or '0000') <= manifest.entries[r]['air_date_iso'] <= (date_to or '9999')]
+    else:
+        rels = manifest.date_index.between(date_from, date_to)
+    return [Path(manifest.abspath(rel)) for rel in rels]
+
+class _ExcludedClues:
+    """Clue ids to skip: flagged repeats plus anything already sent."""
+    
+    def __init__(self, repeat_ids, history=None, recipient=None):
+        self.repeat_ids = repeat_ids
+        self.history = history
+        self.recipient = recipient
+    
+    def __contains__(self, clue_id):
+        if clue_id in self.repeat_ids:
+            return True
+        return self.history is not None and self.history.is_sent(clue_id, clue_id >> 8, self.recipient)
+
+def pick_random_questions(num_questions=3, on_this_day=None, date_from=None, date_to=None,
+                          history=None, recipient=None, plan=None, weights=None, table=None, sampler=None):
+    """Pick random questions from different games.
+    
+    Optionally restricted to games aired "on this day" in past years and/or
+    within a YYYY-MM-DD date range. With a SentHistory, clues and games that
+    were already sent are skipped.
+    
+    plan (see sampling.parse_plan) draws one weighted question per slot, e.g.
+    one easy, one medium and one Double Jeopardy! clue; it replaces
+    num_questions and can't be combined with date filters.
+    
+    table and sampler let a resident caller reuse a clue table and
+    StratifiedSampler it keeps in memory instead of loading them per call.
+    """
+    # Skip clues that repeat an earlier clue (flagged by dedup.py, if it has been run)
+    repeat_ids = load_repeat_ids(str(OUTPUT_DIR))
+    
+    date_filtered = on_this_day is not None or date_from or date_to
+    if plan and date_filtered:
+        raise ValueError("A question plan can't be combined with --on-this-day or a date range")
+    if plan:
+        sampler = sampler or load_sampler(str(OUTPUT_DIR), weights)
+        questions = sampler.sample(str(OUTPUT_DIR), plan, history, repeat_ids, recipient, make_question)
+        if len(questions) < len(plan):
+            raise ValueError(f"Could not fill the question plan. Only found {len(questions)} of {len(plan)}.")
+        return questions
+    
+    if history is not None and not date_filtered:
+        # Sample straight from the clue table; only the chosen games get opened
+        questions = sample_questions(str(OUTPUT_DIR), history, num_questions, repeat_ids,
+                                     recipient, make_question, table=table)
+        if len(questions) < num_questions:
+            raise ValueError(f"Could not find {num_questions} unsent questions. Only found {len(questions)}.")
+        return questions
+    
+    if date_filtered:
+        game_files = get_game_files_by_date(on_this_day, date_from, date_to)
+    else:
+        game_files = get_all_game_files()
     
     if len(game_files) < num_questions:
         raise ValueError(f"Not enough game files. Found {len(game_files)}, need {num_questions}")
     
+    excluded = _ExcludedClues(repeat_ids, history, recipient)
+    
     questions = []
     used_game_files = set()
     max_attempts = len(game_files)  # Try all games if needed
@@ -76,19 +172,10 @@ def pick_random_questions(num_questions=3):
         
         try:
             game_data = load_game_data(game_file)
-            clue = get_random_clue(game_data)
+            clue = get_random_clue(game_data, excluded)
             
             if clue:
-                questions.append({
-                    'game_id': game_data.get('game_id'),
-                    'air_date': game_data.get('air_date'),
-                    'category': clue.get('category'),
-                    'value': clue.get('value'),
-                    'clue': clue.get('clue'),
-                    'answer': clue.get('answer'),
-                    'round': clue.get('round'),
-                    'daily_double': clue.get('daily_double', False)
-                })
+                questions.append(make_question(game_data, clue))
             else:
                 print(f"Skipping {game_file}: No valid clues found")
         except Exception as e:
@@ -101,268 +188,12 @@ def pick_random_questions(num_questions=3):
     return questions
 
 def generate_html_email(questions):
-    """Generate HTML email content with Jeopardy-style board."""
-    
-    html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {
-            font-family: 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #0c1445 0%, #1a2980 100%);
-            margin: 0;
-            padding: 20px;
-            color: #ffffff;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background-color: #0c1445;
-            border-radius: 10px;
-            padding: 30px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.5);
-        }
-        .header {
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        .title {
-            font-size: 48px;
-            font-weight: bold;
-            color: #ffffff;
-            text-shadow: 3px 3px 6px rgba(0,0,0,0.7);
-            margin: 0;
-            letter-spacing: 2px;
-        }
-        .subtitle {
-            font-size: 18px;
-            color: #ffd700;
-            margin-top: 10px;
-        }
-        .instructions {
-            text-align: center;
-            color: #a0a0ff;
-            font-size: 16px;
-            margin-bottom: 30px;
-            padding: 15px;
-            background-color: rgba(26, 41, 128, 0.3);
-            border-radius: 5px;
-            line-height: 1.6;
-        }
-        .clue-card {
-            background: linear-gradient(135deg, #060a2e 0%, #1a2980 100%);
-            border: 3px solid #ffd700;
-            border-radius: 10px;
-            padding: 25px;
-            margin-bottom: 25px;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.4);
-        }
-        .clue-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-            padding-bottom: 10px;
-            border-bottom: 2px solid #ffd700;
-        }
-        .category {
-            font-size: 20px;
-            font-weight: bold;
-            color: #ffd700;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        .value {
-            font-size: 24px;
-            font-weight: bold;
-            color: #ffd700;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        }
-        .daily-double {
-            background-color: #ff4444;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 5px;
-            font-size: 14px;
-            font-weight: bold;
-            margin-left: 10px;
-        }
-        .round-info {
-            font-size: 14px;
-            color: #a0a0ff;
-            margin-bottom: 10px;
-        }
-        .clue-text {
-            font-size: 20px;
-            line-height: 1.6;
-            color: #ffffff;
-            margin: 20px 0;
-            padding: 20px;
-            background-color: rgba(26, 41, 128, 0.5);
-            border-radius: 5px;
-            text-align: center;
-        }
-        .think-space {
-            font-size: 14px;
-            color: #ffd700;
-            text-align: center;
-            margin-top: 20px;
-            font-style: italic;
-        }
-        .game-info {
-            font-size: 12px;
-            color: #888;
-            text-align: center;
-            margin-top: 10px;
-            font-style: italic;
-        }
-        .divider {
-            border-top: 3px solid #ffd700;
-            margin: 50px 0;
-            position: relative;
-        }
-        .divider-text {
-            position: absolute;
-            top: -12px;
-            left: 50%;
-            transform: translateX(-50%);
-            background-color: #0c1445;
-            padding: 0 20px;
-            color: #ffd700;
-            font-weight: bold;
-            font-size: 16px;
-        }
-        .answers-section {
-            margin-top: 50px;
-        }
-        .answers-header {
-            text-align: center;
-            font-size: 28px;
-            color: #ffd700;
-            font-weight: bold;
-            margin-bottom: 30px;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-        }
-        .answer-card {
-            background: linear-gradient(135deg, #1a2050 0%, #2a3080 100%);
-            border: 2px solid #ffd700;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 20px;
-        }
-        .answer-question-num {
-            font-size: 18px;
-            color: #ffd700;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }
-        .answer-category-small {
-            font-size: 14px;
-            color: #a0a0ff;
-            margin-bottom: 15px;
-        }
-        .answer-label {
-            font-size: 14px;
-            color: #ffd700;
-            font-weight: bold;
-            margin-bottom: 8px;
-        }
-        .answer-text {
-            font-size: 22px;
-            color: #ffffff;
-            background-color: rgba(255, 215, 0, 0.1);
-            padding: 15px;
-            border-radius: 5px;
-            text-align: center;
-            border-left: 4px solid #ffd700;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 2px solid #ffd700;
-            color: #a0a0ff;
-            font-size: 14px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 class="title">JEOPARDY!</h1>
-            <p class="subtitle">Your Daily Trivia Challenge</p>
-        </div>
-        <div class="instructions">
-            📱 Try answering all questions below, then scroll down to see the answers!
-        </div>
-"""
-
-    # Questions section
-    for i, q in enumerate(questions, 1):
-        dd_badge = '<span class="daily-double">DAILY DOUBLE!</span>' if q['daily_double'] else ''
-        
-        html += f"""
-        <div class="clue-card">
-            <div class="round-info">Question {i} of {len(questions)} • {q['round']}</div>
-            <div class="clue-header">
-                <div class="category">{q['category']}</div>
-                <div>
-                    <span class="value">{q['value']}</span>
-                    {dd_badge}
-                </div>
-            </div>
-            <div class="clue-text">
-                {q['clue']}
-            </div>
-            <div class="think-space">🤔 Think you know it?</div>
-            <div class="game-info">
-                Game #{q['game_id']} • Aired: {q['air_date']}
-            </div>
-        </div>
-"""
-
-    # Divider
-    html += """
-        <div class="divider">
-            <span class="divider-text">⬇️ SCROLL FOR ANSWERS ⬇️</span>
-        </div>
-        
-        <!-- Spacer to create separation -->
-        <div style="height: 300px; background: transparent;"></div>
-        
-        <div class="answers-section">
-            <div class="answers-header">📋 Answers</div>
-"""
-
-    # Answers section
-    for i, q in enumerate(questions, 1):
-        html += f"""
-        <div class="answer-card">
-            <div class="answer-question-num">Question {i}</div>
-            <div class="answer-category-small">{q['category']} • {q['value']}</div>
-            <div class="answer-label">WHAT IS / WHO IS / WHERE IS...</div>
-            <div class="answer-text">
-                {q['answer']}
-            </div>
-        </div>
-"""
-
-    html += """
-        </div>
-        <div class="footer">
-            <p>How many did you get right? 🎯</p>
-            <p>This is Jeopardy!</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    """Generate HTML email content with Jeopardy-style board.
     
-    return html
+    Uses the precompiled template in email_template.py; identical question
+    sets are rendered once and reused.
+    """
+    return render_cached(questions)
 
 def send_email(to_email, subject, html_content):
     """Send email using Mailgun API."""
@@ -373,8 +204,9 @@ def send_email(to_email, subject, html_content):
     if not all([mailgun_domain, mailgun_api_key, from_email]):
         raise ValueError("Missing required environment variables. Check your .env file.")
     
-    # Mailgun API endpoint
-    url = f"https://api.mailgun.net/v3/{mailgun_domain}/messages"
+    # Mailgun API endpoint (MAILGUN_API_BASE points at a stand-in server for tests)
+    api_base = os.getenv('MAILGUN_API_BASE', 'https://api.mailgun.net/v3').rstrip('/')
+    url = f"{api_base}/{mailgun_domain}/messages"
     
     # Prepare the email data
     data = {
@@ -384,7 +216,8 @@ def send_email(to_email, subject, html_content):
         "html": html_content
     }
     
-    # Send the email via Mailgun API
+    # Send the email via Mailgun API (requests is only imported when sending)
+    import requests
     response = requests.post(
         url,
         auth=("api", mailgun_api_key),
@@ -397,11 +230,266 @@ def send_email(to_email, subject, html_content):
     else:
         raise Exception(f"Failed to send email: {response.status_code} - {response.text}")
 
+def load_sent_history():
+    """Load the sent-clue history, configured from the environment."""
+    reset_fraction = float(os.getenv('SENT_HISTORY_RESET_FRACTION', '0.9'))
+    per_recipient = os.getenv('SENT_HISTORY_PER_RECIPIENT', '').lower() in ('1', 'true', 'yes')
+    return SentHistory.load(str(OUTPUT_DIR), reset_fraction, per_recipient)
+
+def load_question_plan():
+    """Question plan and sampling weights from the environment (None, None if unset)."""
+    plan_spec = os.getenv('QUESTION_PLAN')
+    if not plan_spec:
+        return None, None
+    return parse_plan(plan_spec), SamplingWeights.parse(os.getenv('SAMPLING_WEIGHTS'))
+
+ISSUE_SUBJECT = "🎯 Your Daily Jeopardy! Challenge"
+QUESTIONS_PER_ISSUE = 3
+
+def validate_issue(issue):
+    """Check a prepared issue before it is sent; raises ValueError on problems."""
+    questions = issue.get('questions') or []
+    if len(questions) != QUESTIONS_PER_ISSUE:
+        raise ValueError(f"Issue has {len(questions)} questions, expected {QUESTIONS_PER_ISSUE}")
+    for q in questions:
+        missing = [k for k in ('category', 'value', 'clue', 'answer', 'round', 'clue_id') if not q.get(k)]
+        if missing:
+            raise ValueError(f"Question from game #{q.get('game_id')} is missing {', '.join(missing)}")
+    if len({q['game_id'] for q in questions}) != len(questions):
+        raise ValueError("Issue repeats a game")
+    generate_html_email(questions)
+
+def prepare_issue(journal, history, on_this_day=None, attempts=3, table=None, sampler=None):
+    """Load the journal's stored issue, or pick, validate and store a new one.
+    
+    The issue is stored before anything is sent, so a re-run (or the daemon
+    at send time) sends exactly the same questions.
+    """
+    issue = journal.load_issue()
+    if issue:
+        return issue
+    
+    plan, weights = load_question_plan()
+    for attempt in range(attempts):
+        try:
+            questions = pick_random_questions(QUESTIONS_PER_ISSUE, on_this_day=on_this_day, history=history,
+                                              plan=plan, weights=weights, table=table, sampler=sampler)
+        except ValueError as e:
+            if not on_this_day:
+                raise
+            print(f"⚠️  {e} - using the whole archive instead")
+            questions = pick_random_questions(QUESTIONS_PER_ISSUE, history=history, plan=plan, weights=weights,
+                                              table=table, sampler=sampler)
+        issue = {"subject": ISSUE_SUBJECT, "questions": questions}
+        try:
+            validate_issue(issue)
+        except ValueError as e:
+            print(f"⚠️  Invalid issue ({e}), picking again")
+            continue
+        journal.save_issue(issue)
+        return issue
+    raise ValueError(f"Could not prepare a valid issue after {attempts} attempts")
+
+def deliver_issue(journal, issue, recipients, history, client=None):
+    """Send a prepared issue to every recipient the journal hasn't marked as sent."""
+    for i, q in enumerate(issue['questions'], 1):
+        print(f"  {i}. {q['category']} - {q['value']} (Game #{q['game_id']})")
+    
+    client = client or MailgunClient.from_env(rate=float(os.getenv('EMAIL_RATE_LIMIT', '0')))
+    mode = os.getenv('EMAIL_DELIVERY_MODE', 'batch')
+    workers = int(os.getenv('EMAIL_WORKERS', '8'))
+    
+    print(f"\n📮 Sending via Mailgun ({mode} mode)...")
+    html_content = generate_html_email(issue['questions'])
+    report = deliver(client, journal, recipients, issue['subject'], html_content, mode, workers)
+    print_report(report)
+    
+    sent_to = [r['email'] for r in recipients if r['email'].lower() in journal.sent]
+    if sent_to:
+        for q in issue['questions']:
+            history.mark_sent(q['clue_id'], q['game_id'])
+            if history.recipients is not None:
+                for email in sent_to:
+                    history.mark_sent(q['clue_id'], q['game_id'], email)
+        history.save()
+    return report
+
+def send_batch(recipients_file, on_this_day=None):
+    """Send today's issue to every recipient in a file, skipping those already sent."""
+    recipients = load_recipients(recipients_file)
+    print(f"\n📧 Recipients: {len(recipients)} from {recipients_file}")
+    
+    history = load_sent_history()
+    journal = SendJournal(str(OUTPUT_DIR), date.today().isoformat())
+    
+    # A re-run on the same day resends the same issue to whoever is missing
+    if journal.load_issue():
+        print(f"\n♻️  Resuming issue {journal.issue_id} ({len(journal.sent)} already sent)")
+    else:
+        print("\n🎲 Selecting random Jeopardy questions...")
+    issue = prepare_issue(journal, history, on_this_day)
+    return deliver_issue(journal, issue, recipients, history)
+
+class EmailDaemon:
+    """Resident scheduler: keeps the index warm and sends each issue on time.
+    
+    The next issue is picked, validated and stored in its send journal well
+    before the send time, so at the scheduled moment only the (cached) render
+    and the Mailgun requests are left. The clue table and sampler stay in
+    memory; the manifest is checked every reload_interval seconds and they
+    are reloaded only when new games have been scraped. Failed recipients
+    are retried every reload_interval seconds, up to max_attempts times.
+    """
+    
+    def __init__(self, send_time, recipients_file=None, on_this_day=False, reload_interval=300,
+                 max_attempts=5):
+        self.send_time = send_time
+        self.recipients_file = recipients_file
+        self.on_this_day = on_this_day
+        self.reload_interval = reload_interval
+        self.max_attempts = max_attempts
+        self.digest = None
+        self.table = None
+        self.sampler = None
+        self.stop_event = threading.Event()
+    
+    def recipients(self):
+        if self.recipients_file:
+            return load_recipients(self.recipients_file)
+        return [{"email": os.environ['TO_EMAIL'], "name": ""}]
+    
+    def warm(self):
+        """Refresh the manifest and rebuild the derived indexes if the archive changed."""
+        manifest = load_manifest(str(OUTPUT_DIR))
+        digest = manifest.digest()
+        if digest == self.digest:
+            return False
+        start = time.perf_counter()
+        self.table = load_clue_table(str(OUTPUT_DIR), manifest)
+        plan, weights = load_question_plan()
+        self.sampler = load_sampler(str(OUTPUT_DIR), weights) if plan else None
+        verb = "Loaded" if self.digest is None else "New games found - reloaded"
+        print(f"🔥 {verb} index: {len(manifest.entries)} games ({time.perf_counter() - start:.2f}s)")
+        self.digest = digest
+        return True
+    
+    def next_send(self, now):
+        """The next scheduled send moment (today's, if an interrupted send still has recipients left)."""
+        moment = datetime.combine(now.date(), self.send_time)
+        if moment > now:
+            return moment
+        journal = SendJournal(str(OUTPUT_DIR), now.date().isoformat())
+        if journal.load_issue() is not None and journal.pending(self.recipients()):
+            return moment
+        return moment + timedelta(days=1)
+    
+    def prepare(self, day, history):
+        journal = SendJournal(str(OUTPUT_DIR), day.isoformat())
+        if journal.load_issue() is None:
+            print(f"\n🎲 Preparing issue for {day.isoformat()}...")
+            prepare_issue(journal, history, day if self.on_this_day else None,
+                          table=self.table, sampler=self.sampler)
+            print(f"✅ Issue for {day.isoformat()} is ready")
+        return journal
+    
+    def run(self):
+        print(f"⏰ Daemon started - sending daily at {self.send_time.strftime('%H:%M')}")
+        self.warm()
+        while not self.stop_event.is_set():
+            moment = self.next_send(datetime.now())
+            history = load_sent_history()
+            try:
+                journal = self.prepare(moment.date(), history)
+            except Exception as e:
+                print(f"❌ Could not prepare issue for {moment.date()}: {e}")
+                self.stop_event.wait(self.reload_interval)
+                continue
+            
+            print(f"💤 Next send at {moment.isoformat(sep=' ', timespec='minutes')}")
+            while not self.stop_event.is_set():
+                remaining = (moment - datetime.now()).total_seconds()
+                if remaining <= 0:
+                    break
+                self.stop_event.wait(min(remaining, self.reload_interval))
+                if remaining > self.reload_interval:
+                    self.warm()
+            if self.stop_event.is_set():
+                break
+            
+            try:
+                issue = journal.load_issue()
+                validate_issue(issue)
+                recipients = self.recipients()
+                report = deliver_issue(journal, issue, recipients, history)
+                if report['failed']:
+                    # Journal keeps the successes; retry the rest shortly, but not forever
+                    dropped = journal.give_up(recipients, self.max_attempts)
+                    if dropped:
+                        print(f"⚠️  Giving up on {len(dropped)} recipients after {self.max_attempts} failed attempts: "
+                              f"{', '.join(dropped[:10])}{' ...' if len(dropped) > 10 else ''}")
+                    if journal.pending(recipients):
+                        print(f"⚠️  {report['failed']} recipients failed - retrying in {self.reload_interval}s")
+                        self.stop_event.wait(self.reload_interval)
+                        continue
+            except Exception as e:
+                print(f"❌ Error sending issue for {moment.date()}: {e}")
+                self.stop_event.wait(self.reload_interval)
+                continue
+            self.warm()
+        print("👋 Daemon stopped")
+    
+    def stop(self, *args):
+        self.stop_event.set()
+
+def run_daemon(on_this_day=False, recipients_file=None):
+    """Run the resident scheduler until SIGINT/SIGTERM."""
+    send_time = datetime.strptime(os.getenv('SEND_TIME', '09:00'), '%H:%M').time()
+    reload_interval = int(os.getenv('DAEMON_RELOAD_INTERVAL', '300'))
+    max_attempts = int(os.getenv('DAEMON_MAX_SEND_ATTEMPTS', '5'))
+    if not recipients_file and not os.getenv('TO_EMAIL'):
+        print("Error: TO_EMAIL not set in .env file")
+        sys.exit(1)
+    daemon = EmailDaemon(send_time, recipients_file, on_this_day, reload_interval, max_attempts)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run()
+
 def main():
     """Main function to run the daily Jeopardy email."""
+    # Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     print("🎯 Daily Jeopardy Email Generator")
     print("=" * 50)
     
+    # --on-this-day picks questions from games that aired on today's date in past years
+    on_this_day = date.today() if '--on-this-day' in sys.argv[1:] else None
+    if on_this_day and os.getenv('QUESTION_PLAN'):
+        print("Error: QUESTION_PLAN can't be combined with --on-this-day; unset one of them")
+        sys.exit(1)
+    
+    # A recipients file switches to batch delivery for the whole list
+    args = sys.argv[1:]
+    recipients_file = args[args.index('--recipients') + 1] if '--recipients' in args[:-1] else os.getenv('RECIPIENTS_FILE')
+    
+    # --daemon stays resident and sends every day at SEND_TIME
+    if '--daemon' in args:
+        run_daemon(on_this_day is not None, recipients_file)
+        return
+    
+    if recipients_file:
+        try:
+            report = send_batch(recipients_file, on_this_day)
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        if report['failed']:
+            sys.exit(1)
+        return
+    
     # Get recipient email from environment or prompt
     recipient = os.getenv('TO_EMAIL')
     if not recipient:
@@ -409,11 +497,27 @@ def main():
         return
     
     print(f"\n📧 Recipient: {recipient}")
+    
+    if on_this_day:
+        print(f"\n📅 On this day in Jeopardy! history: {on_this_day.strftime('%B %d')}")
+    
     print("\n🎲 Selecting random Jeopardy questions...")
     
     try:
+        # Remember what has been sent so clues and games don't repeat
+        history = load_sent_history()
+        plan, weights = load_question_plan()
+        
         # Pick 3 random questions
-        questions = pick_random_questions(3)
+        try:
+            questions = pick_random_questions(3, on_this_day=on_this_day, history=history, recipient=recipient,
+                                              plan=plan, weights=weights)
+        except ValueError as e:
+            if not on_this_day:
+                raise
+            print(f"⚠️  {e} - using the whole archive instead")
+            questions = pick_random_questions(3, history=history, recipient=recipient,
+                                              plan=plan, weights=weights)
         
         if len(questions) < 3:
             print(f"Warning: Only found {len(questions)} valid questions")
@@ -435,6 +539,10 @@ def main():
         print("\n✅ Email sent successfully!")
         print(f"Response: {response}")
         
+        for q in questions:
+            history.mark_sent(q['clue_id'], q['game_id'], recipient)
+        history.save()
+        
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Clue Detection for J-Archive data
+Finds reused and lightly rephrased clues with MinHash signatures and LSH
+banding, so candidate pairs are found without comparing every pair of clues
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import sys
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from archive import (INDEX_DIRNAME, game_iso_date, get_index_dir, iter_game_clues, load_game_data,
+                     load_manifest, make_clue_id, split_clue_id)
+
+
+INDEX_FILENAME = "dedup.sqlite"
+
+# 64 hash values per signature, split into 16 bands of 4 rows. Pairs with a
+# Jaccard similarity around 0.5 and up collide in at least one band.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.7
+
+SHINGLE_SIZE = 2
+
+# Band buckets shared by more clues than this are boilerplate ("This ...",
+# audio/video clue stubs) and would only add quadratic noise
+MAX_BUCKET_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    clue_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    air_date TEXT,
+    sig BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_path ON signatures(path);
+CREATE TABLE IF NOT EXISTS bands (
+    band_key INTEGER NOT NULL,
+    clue_id INTEGER NOT NULL,
+    batch INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_key ON bands(band_key);
+CREATE INDEX IF NOT EXISTS bands_clue ON bands(clue_id);
+CREATE TABLE IF NOT EXISTS duplicates (
+    clue_id INTEGER NOT NULL,
+    original_id INTEGER NOT NULL,
+    similarity REAL NOT NULL,
+    PRIMARY KEY (clue_id, original_id)
+);
+CREATE INDEX IF NOT EXISTS duplicates_original ON duplicates(original_id);
+"""
+
+# blake2b yields 16 32-bit words per call; one "person" per block of 16
+_PERSONS = [f"jarchive-mh{i}".encode('ascii') for i in range(NUM_PERM // 16)]
+_UNPACK = struct.Struct('<16I').unpack
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words with accents and punctuation removed"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def shingles(clue: Optional[str], answer: Optional[str]) -> Set[bytes]:
+    """Word shingles of the clue text plus the answer's words"""
+    words = tokenize(clue)
+    if len(words) < SHINGLE_SIZE:
+        result = {w.encode() for w in words}
+    else:
+        result = {" ".join(words[i:i + SHINGLE_SIZE]).encode() for i in range(len(words) - SHINGLE_SIZE + 1)}
+    result.update(b"=" + w.encode() for w in tokenize(answer))
+    return result
+
+
+def minhash(shingle_set: Iterable[bytes]) -> Optional[array]:
+    """MinHash signature (NUM_PERM unsigned 32-bit values), None for empty input"""
+    rows = []
+    for shingle in shingle_set:
+        row = ()
+        for person in _PERSONS:
+            row += _UNPACK(hashlib.blake2b(shingle, digest_size=64, person=person).digest())
+        rows.append(row)
+    if not rows:
+        return None
+    return array('I', map(min, zip(*rows)))
+
+
+def band_keys(sig: array) -> List[int]:
+    """One signed 64-bit bucket key per LSH band"""
+    raw = sig.tobytes()
+    width = ROWS * sig.itemsize
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([b]) + raw[b * width:(b + 1) * width], digest_size=8).digest(),
+                       'little', signed=True)
+        for b in range(BANDS)
+    ]
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity from two signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def signatures_for_clues(items: List[Tuple]) -> List[Tuple]:
+    """
+    Compute signatures for a batch of (clue_id, clue, answer, *extra) tuples
+
+    Returns:
+        List of (clue_id, *extra, signature bytes); clues without text are dropped
+    """
+    results = []
+    for clue_id, clue, answer, *extra in items:
+        sig = minhash(shingles(clue, answer))
+        if sig is not None:
+            results.append((clue_id, *extra, sig.tobytes()))
+    return results
+
+
+def _signatures_for_file(args: Tuple[str, str]) -> Tuple[str, List[Tuple]]:
+    """Worker: read one game and compute its clue signatures"""
+    rel, path = args
+    try:
+        data = load_game_data(path)
+    except (OSError, ValueError):
+        return rel, None
+    air_date = game_iso_date(data)
+    game_id = data.get('game_id') or 0
+    items = [
+        (make_clue_id(game_id, round_code, position), clue.get('clue'), clue.get('answer'), air_date)
+        for round_code, position, clue in iter_game_clues(data)
+    ]
+    return rel, signatures_for_clues(items)
+
+
+class LSHIndex:
+    """In-memory LSH band buckets (used for benchmarks and one-off batches)"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = {}
+        self.signatures = {}
+
+    def add(self, key, sig: array) -> List[Tuple]:
+        """Add a signature and return (other_key, similarity) for near-duplicates already indexed"""
+        candidates = set()
+        for band_key in band_keys(sig):
+            bucket = self.buckets.setdefault(band_key, [])
+            candidates.update(bucket)
+            bucket.append(key)
+        self.signatures[key] = sig
+
+        matches = []
+        for other in candidates:
+            score = similarity(sig, self.signatures[other])
+            if score >= self.threshold:
+                matches.append((other, score))
+        return matches
+
+
+def open_index(output_dir: str = "output") -> sqlite3.Connection:
+    """Open (and create if needed) the dedup index for an output directory"""
+    conn = sqlite3.connect(os.path.join(get_index_dir(output_dir), INDEX_FILENAME))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _remove_file(conn: sqlite3.Connection, rel: str):
+    ids = [(row[0],) for row in conn.execute("SELECT clue_id FROM signatures WHERE path = ?", (rel,))]
+    conn.executemany("DELETE FROM bands WHERE clue_id = ?", ids)
+    conn.executemany("DELETE FROM duplicates WHERE clue_id = ? OR original_id = ?", [(i, i) for (i,) in ids])
+    conn.execute("DELETE FROM signatures WHERE path = ?", (rel,))
+    conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+
+def update_index(output_dir: str = "output", threshold: float = DEFAULT_THRESHOLD,
+                 workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Bring the dedup index up to date and flag new near-duplicates
+
+    Signatures for new or changed games are computed in batches on a process
+    pool and persisted. New clues are then matched against every stored
+    signature through the band buckets. Of each matching pair, the clue that
+    aired later is flagged as the repeat.
+
+    Returns:
+        Dict with counts of games "indexed"/"removed", clues "hashed" and "duplicates" found
+    """
+    conn = open_index(output_dir)
+    manifest = load_manifest(output_dir)
+    indexed = {path: (size, mtime_ns) for path, size, mtime_ns in conn.execute("SELECT path, size, mtime_ns FROM files")}
+    counts = {"indexed": 0, "removed": 0, "hashed": 0, "duplicates": 0}
+
+    pending = [(rel, manifest.abspath(rel)) for rel, entry in manifest.entries.items()
+               if indexed.get(rel) != (entry.get('size'), entry.get('mtime_ns'))]
+
+    with conn:
+        for rel in indexed:
+            if rel not in manifest.entries:
+                _remove_file(conn, rel)
+                counts["removed"] += 1
+
+    if not pending:
+        conn.close()
+        return counts
+
+    batch = (conn.execute("SELECT MAX(batch) FROM bands").fetchone()[0] or 0) + 1
+    new_sigs = {}
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunksize = max(1, len(pending) // (workers * 8))
+
+    def results():
+        if workers > 1 and len(pending) > 1:
+            # Imported here so readers like stats.py don't pay for multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from pool.map(_signatures_for_file, pending, chunksize=chunksize)
+        else:
+            yield from map(_signatures_for_file, pending)
+
+    with conn:
+        for rel, rows in results():
+            if rows is None:
+                print(f"  ✗ Error reading {rel}")
+                continue
+            if rel in indexed:
+                _remove_file(conn, rel)
+            conn.executemany("INSERT OR REPLACE INTO signatures (clue_id, path, air_date, sig) VALUES (?, ?, ?, ?)",
+                             [(clue_id, rel, air_date, sig) for clue_id, air_date, sig in rows])
+            conn.executemany("INSERT INTO bands (band_key, clue_id, batch) VALUES (?, ?, ?)",
+                             [(key, clue_id, batch) for clue_id, _, sig in rows
+                              for key in band_keys(array('I', sig))])
+            for clue_id, air_date, sig in rows:
+                new_sigs[clue_id] = (air_date, array('I', sig))
+            entry = manifest.entries[rel]
+            conn.execute("INSERT OR REPLACE INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                         (rel, entry.get('size'), entry.get('mtime_ns')))
+            counts["indexed"] += 1
+            counts["hashed"] += len(rows)
+
+        # Candidate pairs: any band bucket shared by a clue from this batch
+        candidates = conn.execute(
+            "WITH hot AS (SELECT band_key FROM bands "
+            "             WHERE band_key IN (SELECT band_key FROM bands WHERE batch = ?) "
+            "             GROUP BY band_key HAVING COUNT(*) > ?) "
+            "SELECT DISTINCT n.clue_id, o.clue_id FROM bands n "
+            "JOIN bands o ON o.band_key = n.band_key AND o.clue_id != n.clue_id "
+            "WHERE n.batch = ? AND (o.batch != ? OR o.clue_id < n.clue_id) "
+            "AND n.band_key NOT IN hot",
+            (batch, MAX_BUCKET_SIZE, batch, batch)
+        ).fetchall()
+
+        old_sigs = {}
+        for new_id, other_id in candidates:
+            if other_id in new_sigs:
+                other = new_sigs[other_id]
+            else:
+                if other_id not in old_sigs:
+                    row = conn.execute("SELECT air_date, sig FROM signatures WHERE clue_id = ?", (other_id,)).fetchone()
+                    old_sigs[other_id] = (row[0], array('I', row[1])) if row else None
+                other = old_sigs[other_id]
+                if other is None:
+                    continue
+
+            score = similarity(new_sigs[new_id][1], other[1])
+            if score < threshold:
+                continue
+
+            # The clue that aired first is the original
+            pair = sorted([(new_sigs[new_id][0] or '9999', new_id), (other[0] or '9999', other_id)])
+            original_id, repeat_id = pair[0][1], pair[1][1]
+            conn.execute("INSERT OR REPLACE INTO duplicates (clue_id, original_id, similarity) VALUES (?, ?, ?)",
+                         (repeat_id, original_id, score))
+            counts["duplicates"] += 1
+
+    conn.close()
+    return counts
+
+
+def load_repeat_ids(output_dir: str = "output") -> Set[int]:
+    """Clue ids flagged as repeats of an earlier clue (empty if there is no dedup index)"""
+    path = os.path.join(output_dir, INDEX_DIRNAME, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return set()
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT DISTINCT clue_id FROM duplicates")}
+    except sqlite3.DatabaseError:
+        return set()
+    finally:
+        conn.close()
+
+
+def list_duplicates(output_dir: str = "output", limit: int = 20) -> List[Dict]:
+    """Most similar flagged pairs with their clue text"""
+    conn = open_index(output_dir)
+    rows = conn.execute(
+        "SELECT d.clue_id, d.original_id, d.similarity, r.path, o.path FROM duplicates d "
+        "JOIN signatures r ON r.clue_id = d.clue_id JOIN signatures o ON o.clue_id = d.original_id "
+        "ORDER BY d.similarity DESC LIMIT ?", (limit,)
+    ).fetchall()
+    conn.close()
+
+    def lookup(rel, clue_id):
+        _, round_code, position = split_clue_id(clue_id)
+        data = load_game_data(os.path.join(output_dir, rel))
+        for rc, pos, clue in iter_game_clues(data):
+            if rc == round_code and pos == position:
+                return {"game_id": data.get('game_id'), "air_date": data.get('air_date'),
+                        "clue": clue.get('clue'), "answer": clue.get('answer')}
+        return {}
+
+    return [
+        {"similarity": score, "repeat": lookup(repeat_path, repeat_id), "original": lookup(original_path, original_id)}
+        for repeat_id, original_id, score, repeat_path, original_path in rows
+    ]
+
+
+def main():
+    output_dir = "output"
+    threshold = DEFAULT_THRESHOLD
+    workers = None
+    show = 0
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg in ('--output-dir', '--threshold', '--workers', '--show') and i + 1 < len(sys.argv):
+            value = sys.argv[i + 1]
+            if arg == '--output-dir':
+                output_dir = value
+            elif arg == '--threshold':
+                threshold = float(value)
+            elif arg == '--workers':
+                workers = int(value)
+            else:
+                show = int(value)
+            i += 2
+        else:
+            print("Near-Duplicate Clue Detection")
+            print("\nUsage:")
+            print("  python dedup.py [--output-dir <dir>] [--threshold <0-1>] [--workers <n>] [--show <n>]")
+            print("\nUpdates the dedup index with new games and flags repeated clues.")
+            print("  --show <n>   Print the n most similar flagged pairs")
+            sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    counts = update_index(output_dir, threshold, workers)
+    print(f"Indexed {counts['indexed']} games ({counts['hashed']} clues), removed {counts['removed']}")
+    print(f"New duplicate pairs: {counts['duplicates']}")
+    print(f"Clues flagged as repeats: {len(load_repeat_ids(output_dir))}")
+
+    for pair in list_duplicates(output_dir, show) if show else []:
+        repeat, original = pair["repeat"], pair["original"]
+        print(f"\n  {pair['similarity']:.2f}  Game #{repeat.get('game_id')} ({repeat.get('air_date')}) "
+              f"repeats Game #{original.get('game_id')} ({original.get('air_date')})")
+        print(f"    {original.get('clue')} → {original.get('answer')}")
+        print(f"    {repeat.get('clue')} → {repeat.get('answer')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Precompiled Daily Jeopardy Email Template
+The static shell (document head, inline CSS, divider, footer) is built once
+at import time; each email only fills the small per-question fragments and
+joins everything in a single pass. Renders are cached by question set, so
+recipients who get the same questions share one rendered document.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+
+# Everything up to the first question card, including the full CSS
+SHELL_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body {
+            font-family: 'Helvetica Neue', Arial, sans-serif;
+            background: linear-gradient(135deg, #0c1445 0%, #1a2980 100%);
+            margin: 0;
+            padding: 20px;
+            color: #ffffff;
+        }
+        .container {
+            max-width: 800px;
+            margin: 0 auto;
+            background-color: #0c1445;
+            border-radius: 10px;
+            padding: 30px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.5);
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .title {
+            font-size: 48px;
+            font-weight: bold;
+            color: #ffffff;
+            text-shadow: 3px 3px 6px rgba(0,0,0,0.7);
+            margin: 0;
+            letter-spacing: 2px;
+        }
+        .subtitle {
+            font-size: 18px;
+            color: #ffd700;
+            margin-top: 10px;
+        }
+        .instructions {
+            text-align: center;
+            color: #a0a0ff;
+            font-size: 16px;
+            margin-bottom: 30px;
+            padding: 15px;
+            background-color: rgba(26, 41, 128, 0.3);
+            border-radius: 5px;
+            line-height: 1.6;
+        }
+        .clue-card {
+            background: linear-gradient(135deg, #060a2e 0%, #1a2980 100%);
+            border: 3px solid #ffd700;
+            border-radius: 10px;
+            padding: 25px;
+            margin-bottom: 25px;
+            box-shadow: 0 5px 20px rgba(0,0,0,0.4);
+        }
+        .clue-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 15px;
+            padding-bottom: 10px;
+            border-bottom: 2px solid #ffd700;
+        }
+        .category {
+            font-size: 20px;
+            font-weight: bold;
+            color: #ffd700;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+        .value {
+            font-size: 24px;
+            font-weight: bold;
+            color: #ffd700;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+        }
+        .daily-double {
+            background-color: #ff4444;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 5px;
+            font-size: 14px;
+            font-weight: bold;
+            margin-left: 10px;
+        }
+        .round-info {
+            font-size: 14px;
+            color: #a0a0ff;
+            margin-bottom: 10px;
+        }
+        .clue-text {
+            font-size: 20px;
+            line-height: 1.6;
+            color: #ffffff;
+            margin: 20px 0;
+            padding: 20px;
+            background-color: rgba(26, 41, 128, 0.5);
+            border-radius: 5px;
+            text-align: center;
+        }
+        .think-space {
+            font-size: 14px;
+            color: #ffd700;
+            text-align: center;
+            margin-top: 20px;
+            font-style: italic;
+        }
+        .game-info {
+            font-size: 12px;
+            color: #888;
+            text-align: center;
+            margin-top: 10px;
+            font-style: italic;
+        }
+        .divider {
+            border-top: 3px solid #ffd700;
+            margin: 50px 0;
+            position: relative;
+        }
+        .divider-text {
+            position: absolute;
+            top: -12px;
+            left: 50%;
+            transform: translateX(-50%);
+            background-color: #0c1445;
+            padding: 0 20px;
+            color: #ffd700;
+            font-weight: bold;
+            font-size: 16px;
+        }
+        .answers-section {
+            margin-top: 50px;
+        }
+        .answers-header {
+            text-align: center;
+            font-size: 28px;
+            color: #ffd700;
+            font-weight: bold;
+            margin-bottom: 30px;
+            text-transform: uppercase;
+            letter-spacing: 2px;
+        }
+        .answer-card {
+            background: linear-gradient(135deg, #1a2050 0%, #2a3080 100%);
+            border: 2px solid #ffd700;
+            border-radius: 10px;
+            padding: 20px;
+            margin-bottom: 20px;
+        }
+        .answer-question-num {
+            font-size: 18px;
+            color: #ffd700;
+            font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .answer-category-small {
+            font-size: 14px;
+            color: #a0a0ff;
+            margin-bottom: 15px;
+        }
+        .answer-label {
+            font-size: 14px;
+            color: #ffd700;
+            font-weight: bold;
+            margin-bottom: 8px;
+        }
+        .answer-text {
+            font-size: 22px;
+            color: #ffffff;
+            background-color: rgba(255, 215, 0, 0.1);
+            padding: 15px;
+            border-radius: 5px;
+            text-align: center;
+            border-left: 4px solid #ffd700;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 40px;
+            padding-top: 20px;
+            border-top: 2px solid #ffd700;
+            color: #a0a0ff;
+            font-size: 14px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 class="title">JEOPARDY!</h1>
+            <p class="subtitle">Your Daily Trivia Challenge</p>
+        </div>
+        <div class="instructions">
+            📱 Try answering all questions below, then scroll down to see the answers!
+        </div>
+"""
+
+CLUE_CARD = """
+        <div class="clue-card">
+            <div class="round-info">Question {number} of {total} • {round}</div>
+            <div class="clue-header">
+                <div class="category">{category}</div>
+                <div>
+                    <span class="value">{value}</span>
+                    {dd_badge}
+                </div>
+            </div>
+            <div class="clue-text">
+                {clue}
+            </div>
+            <div class="think-space">🤔 Think you know it?</div>
+            <div class="game-info">
+                Game #{game_id} • Aired: {air_date}
+            </div>
+        </div>
+"""
+
+DAILY_DOUBLE_BADGE = '<span class="daily-double">DAILY DOUBLE!</span>'
+
+SHELL_DIVIDER = """
+        <div class="divider">
+            <span class="divider-text">⬇️ SCROLL FOR ANSWERS ⬇️</span>
+        </div>
+        
+        <!-- Spacer to create separation -->
+        <div style="height: 300px; background: transparent;"></div>
+        
+        <div class="answers-section">
+            <div class="answers-header">📋 Answers</div>
+"""
+
+ANSWER_CARD = """
+        <div class="answer-card">
+            <div class="answer-question-num">Question {number}</div>
+            <div class="answer-category-small">{category} • {value}</div>
+            <div class="answer-label">WHAT IS / WHO IS / WHERE IS...</div>
+            <div class="answer-text">
+                {answer}
+            </div>
+        </div>
+"""
+
+SHELL_FOOTER = """
+        </div>
+        <div class="footer">
+            <p>How many did you get right? 🎯</p>
+            <p>This is Jeopardy!</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Pre-bound str.format methods for the fragments
+_format_clue_card = CLUE_CARD.format
+_format_answer_card = ANSWER_CARD.format
+
+# Question fields that affect the rendered email
+RENDER_FIELDS = ('round', 'category', 'value', 'daily_double', 'clue', 'answer', 'game_id', 'air_date')
+
+
+def render_email(questions: Sequence[Dict]) -> str:
+    """Render the HTML email for a list of questions (no caching)"""
+    total = len(questions)
+    parts = [SHELL_HEAD]
+    for number, q in enumerate(questions, 1):
+        parts.append(_format_clue_card(
+            number=number, total=total, round=q['round'], category=q['category'], value=q['value'],
+            dd_badge=DAILY_DOUBLE_BADGE if q['daily_double'] else '', clue=q['clue'],
+            game_id=q['game_id'], air_date=q['air_date'],
+        ))
+    parts.append(SHELL_DIVIDER)
+    for number, q in enumerate(questions, 1):
+        parts.append(_format_answer_card(number=number, category=q['category'], value=q['value'],
+                                         answer=q['answer']))
+    parts.append(SHELL_FOOTER)
+    return "".join(parts)
+
+
+def question_set_key(questions: Sequence[Dict]) -> Tuple:
+    """Cache key covering every field the template reads"""
+    return tuple(tuple(q.get(field) for field in RENDER_FIELDS) for q in questions)
+
+
+class RenderCache:
+    """LRU of rendered emails keyed by question set"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, questions: Sequence[Dict]) -> str:
+        key = question_set_key(questions)
+        with self.lock:
+            html = self.entries.get(key)
+            if html is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = render_email(questions)
+        with self.lock:
+            self.entries[key] = html
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return html
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+_default_cache = RenderCache()
+
+
+def render_cached(questions: List[Dict]) -> str:
+    """render_email() through a process-wide render cache"""
+    return _default_cache.render(questions)
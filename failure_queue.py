@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Persistent Scrape Failure Queue
+Every failed scrape is recorded with why it failed (network error, HTTP
+status, J-Archive error page, no data, or an invalid file found by
+verify.py), its attempt count and timestamps, so failures survive the run.
+retry-failed re-drives only the retryable ones, with exponential backoff
+between attempts; games J-Archive says don't exist are left alone.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from archive import get_index_dir
+
+
+QUEUE_FILENAME = "failures.sqlite"
+
+# reason -> retryable; http_status depends on the status (see is_retryable)
+REASONS = {
+    "network": True,         # Connection error or timeout
+    "http_status": None,     # Non-2xx response
+    "jarchive_error": False,  # J-Archive's "ERROR: No game ..." page: the game doesn't exist
+    "no_data": False,        # Page fetched but had nothing to extract
+    "invalid_file": True,    # Saved file failed verification (verify.py)
+}
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+BACKOFF_BASE = 300.0     # Seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 86400.0
+MAX_ATTEMPTS = 8         # After this many failures a game is no longer retried
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    game_id       INTEGER PRIMARY KEY,
+    reason        TEXT    NOT NULL,
+    status        INTEGER,
+    detail        TEXT,
+    file          TEXT,
+    retryable     INTEGER NOT NULL,
+    attempts      INTEGER NOT NULL,
+    first_failed  TEXT    NOT NULL,
+    last_failed   TEXT    NOT NULL,
+    next_retry    REAL    NOT NULL,
+    source        TEXT
+);
+"""
+
+
+def is_retryable(reason: str, status: Optional[int] = None) -> bool:
+    if reason == "http_status":
+        return status in RETRY_STATUSES
+    return bool(REASONS.get(reason, True))
+
+
+def backoff_seconds(attempts: int) -> float:
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(0, attempts - 1))
+
+
+class FailureQueue:
+    """
+    Failed game ids in a SQLite database under .jarchive/
+
+    SQLite rather than a JSON file because several scraper processes may
+    record failures at once. One row per game: a later failure updates the
+    reason and bumps the attempt count, a successful scrape removes the row.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(get_index_dir(output_dir), QUEUE_FILENAME)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, game_id: int, reason: str, status: Optional[int] = None, detail: Optional[str] = None,
+               file: Optional[str] = None, source: Optional[str] = None, retry_now: bool = False):
+        """Record (or update) a failure; retry_now skips the backoff for the next retry"""
+        retryable = is_retryable(reason, status)
+        now = datetime.now().isoformat(timespec='seconds')
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT attempts FROM failures WHERE game_id = ?", (game_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                retryable = False
+            next_retry = time.time() + (0 if retry_now else backoff_seconds(attempts))
+            self.db.execute(
+                "INSERT INTO failures (game_id, reason, status, detail, file, retryable, attempts, "
+                "first_failed, last_failed, next_retry, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(game_id) DO UPDATE SET reason = excluded.reason, status = excluded.status, "
+                "detail = excluded.detail, file = COALESCE(excluded.file, file), retryable = excluded.retryable, "
+                "attempts = excluded.attempts, last_failed = excluded.last_failed, "
+                "next_retry = excluded.next_retry, source = excluded.source",
+                (game_id, reason, status, detail, file, int(retryable), attempts, now, now, next_retry, source),
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def record_scrape(self, game_id: int, scraper, source: str):
+        """Record why a JeopardyScraper came back without a saved game"""
+        failure = scraper.failure or {"reason": "no_data", "status": None, "detail": "no data found"}
+        self.record(game_id, failure["reason"], failure.get("status"), failure.get("detail"), source=source)
+
+    def clear(self, game_id: int):
+        self.db.execute("DELETE FROM failures WHERE game_id = ?", (game_id,))
+
+    def clear_invalid_files(self, files) -> int:
+        """Drop invalid_file entries for files that have since passed verification"""
+        files = set(files)
+        ids = [gid for gid, file in self.db.execute(
+            "SELECT game_id, file FROM failures WHERE reason = 'invalid_file'") if file in files]
+        self.db.executemany("DELETE FROM failures WHERE game_id = ?", ((gid,) for gid in ids))
+        return len(ids)
+
+    def entries(self, reason: Optional[str] = None) -> List[Dict]:
+        sql = "SELECT * FROM failures" + (" WHERE reason = ?" if reason else "") + " ORDER BY game_id"
+        cursor = self.db.execute(sql, (reason,) if reason else ())
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def due(self, include_waiting: bool = False) -> List[int]:
+        """Retryable game ids whose backoff has passed (or all retryable ones)"""
+        sql = "SELECT game_id FROM failures WHERE retryable = 1"
+        params = ()
+        if not include_waiting:
+            sql += " AND next_retry <= ?"
+            params = (time.time(),)
+        return [row[0] for row in self.db.execute(sql + " ORDER BY next_retry, game_id", params)]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """reason -> {"retryable": n, "permanent": n}"""
+        summary = {}
+        for reason, retryable, count in self.db.execute(
+                "SELECT reason, retryable, COUNT(*) FROM failures GROUP BY reason, retryable"):
+            summary.setdefault(reason, {"retryable": 0, "permanent": 0})
+            summary[reason]["retryable" if retryable else "permanent"] += count
+        return summary
+
+
+def retry_failed(output_dir: str = "output", delay: float = 1.0, include_waiting: bool = False,
+                 limit: Optional[int] = None) -> Dict[str, List[int]]:
+    """
+    Re-scrape retryable failures whose backoff has passed
+
+    Successes leave the queue; failures are recorded again with a longer backoff.
+    """
+    from scraper import JeopardyScraper
+
+    queue = FailureQueue(output_dir)
+    game_ids = queue.due(include_waiting)[:limit]
+    result = {"scraped": [], "failed": []}
+    for i, game_id in enumerate(game_ids):
+        print(f"\n[{i + 1}/{len(game_ids)}] Retrying game {game_id}...")
+        scraper = JeopardyScraper(game_id, priority="backfill")
+        data = scraper.scrape()
+        has_data = data and (
+            data.get('episode_number') or
+            len(data.get('contestants', [])) > 0 or
+            len(data.get('jeopardy_round', {}).get('clues', [])) > 0
+        )
+        if has_data:
+            filename = scraper.save_to_json(data, output_dir=output_dir)
+            print(f"  ✓ Saved to {filename}")
+            queue.clear(game_id)
+            result["scraped"].append(game_id)
+        else:
+            print(f"  ✗ Failed to scrape game {game_id}")
+            queue.record_scrape(game_id, scraper, "retry")
+            result["failed"].append(game_id)
+        if i < len(game_ids) - 1:
+            time.sleep(delay)
+    queue.close()
+    return result
+
+
+def print_entries(queue: FailureQueue, reason: Optional[str] = None):
+    entries = queue.entries(reason)
+    now = time.time()
+    for e in entries:
+        if e["retryable"]:
+            wait = e["next_retry"] - now
+            when = "due now" if wait <= 0 else f"retry in {int(wait // 60)}m"
+        else:
+            when = "permanent"
+        status = f" {e['status']}" if e["status"] else ""
+        print(f"  game {e['game_id']:>6}  {e['reason']}{status}  x{e['attempts']}  "
+              f"last {e['last_failed']}  {when}")
+        if e["detail"]:
+            print(f"               {e['detail'][:100]}")
+    summary = queue.summary()
+    print(f"\n{len(entries)} failed games")
+    for reason, counts in sorted(summary.items()):
+        print(f"  {reason:<15} {counts['retryable']} retryable, {counts['permanent']} permanent")
+
+
+def main():
+    command = "list"
+    output_dir = "output"
+    delay = 1.0
+    include_waiting = False
+    limit = None
+    reason = None
+
+    args = sys.argv[1:]
+    if args and not args[0].startswith('--'):
+        command = args.pop(0)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--output-dir' and i + 1 < len(args):
+            output_dir = args[i + 1]
+            i += 2
+        elif arg == '--delay' and i + 1 < len(args):
+            delay = float(args[i + 1])
+            i += 2
+        elif arg == '--limit' and i + 1 < len(args):
+            limit = int(args[i + 1])
+            i += 2
+        elif arg == '--reason' and i + 1 < len(args) and args[i + 1] in REASONS:
+            reason = args[i + 1]
+            i += 2
+        elif arg == '--now':
+            include_waiting = True
+            i += 1
+        else:
+            command = None
+            break
+
+    if command not in ("list", "retry-failed"):
+        print("Scrape Failure Queue")
+        print("\nUsage:")
+        print("  python failure_queue.py [list] [--reason <reason>] [--output-dir <dir>]")
+        print("  python failure_queue.py retry-failed [--now] [--limit <n>] [--delay <seconds>] [--output-dir <dir>]")
+        print("\nReasons: " + ", ".join(REASONS))
+        print("\nretry-failed only retries network errors, 408/429/5xx responses and invalid")
+        print("files whose backoff has passed (--now ignores the backoff).")
+        sys.exit(1)
+
+    if command == "list":
+        print_entries(FailureQueue(output_dir), reason)
+        return
+
+    result = retry_failed(output_dir, delay, include_waiting, limit)
+    print(f"\n{'='*60}")
+    print(f"✓ Recovered: {len(result['scraped'])}")
+    if result["failed"]:
+        print(f"✗ Still failing: {len(result['failed'])} ({' '.join(map(str, result['failed']))})")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
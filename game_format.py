@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Compressed Game Files
+Converts an archive between plain JSON, gzip and zstd game files, and trains
+the shared zstd dictionary that makes small per-game files compress well.
+Every reader detects the format from the file itself, so an archive can be
+converted in place (or be a mix of formats) without anything else changing.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from archive import (GAME_FORMATS, ZSTD_CURRENT_DICT, compact_game_json, current_zstd_dict, format_of,
+                     game_file_stem, iter_game_files, load_game_data, load_manifest, record_saved_game,
+                     require_zstandard, write_game_file, zstd_dict_dir)
+
+
+DICT_SAMPLES = 2000      # Games sampled to train the dictionary
+DICT_SIZE = 112 * 1024   # zstd's recommended dictionary size for small records
+
+
+def train_dictionary(output_dir: str = "output", samples: int = DICT_SAMPLES, size: int = DICT_SIZE,
+                     seed: Optional[int] = None) -> str:
+    """
+    Train a zstd dictionary on a sample of the archive's games and make it the current one
+
+    Earlier dictionaries are kept: files compressed with them name their
+    dictionary's id and stay readable.
+
+    Returns:
+        Path of the new dictionary file
+    """
+    require_zstandard()
+    paths = iter_game_files(output_dir)
+    if len(paths) > samples:
+        paths = random.Random(seed).sample(paths, samples)
+    # Train on exactly what gets compressed: compact JSON
+    corpus = []
+    for path in paths:
+        try:
+            corpus.append(compact_game_json(load_game_data(path)))
+        except (OSError, ValueError):
+            continue
+    return install_dictionary(output_dir, corpus, size)
+
+
+def install_dictionary(output_dir: str, corpus: List[bytes], size: int = DICT_SIZE) -> str:
+    """Train a zstd dictionary on compact game JSON and make it output_dir's current one"""
+    if len(corpus) < 10:
+        raise ValueError(f"need at least 10 readable games to train a dictionary, found {len(corpus)}")
+
+    dictionary = require_zstandard().train_dictionary(size, corpus)
+    directory = zstd_dict_dir(output_dir)
+    os.makedirs(directory, exist_ok=True)
+    dict_path = os.path.join(directory, f"{dictionary.dict_id()}.dict")
+    with open(dict_path, 'wb') as f:
+        f.write(dictionary.as_bytes())
+    tmp_path = os.path.join(directory, f"{ZSTD_CURRENT_DICT}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(str(dictionary.dict_id()))
+    os.replace(tmp_path, os.path.join(directory, ZSTD_CURRENT_DICT))
+    return dict_path
+
+
+def convert_archive(output_dir: str = "output", fmt: str = "zstd", recompress: bool = False) -> Dict[str, int]:
+    """
+    Rewrite every game file in the given format
+
+    Files already in that format are left alone unless recompress is set
+    (e.g. to pick up a newly trained dictionary).
+
+    Returns:
+        Counts of converted, skipped and failed files, and total bytes before and after
+    """
+    if fmt not in GAME_FORMATS:
+        raise ValueError(f"Unknown game format '{fmt}'. Choose from: {', '.join(GAME_FORMATS)}")
+    counts = {"converted": 0, "skipped": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    paths = iter_game_files(output_dir)
+    for i, path in enumerate(paths):
+        size = os.path.getsize(path)
+        counts["bytes_before"] += size
+        if format_of(path) == fmt and not recompress:
+            counts["skipped"] += 1
+            counts["bytes_after"] += size
+            continue
+        try:
+            data = load_game_data(path)
+        except (OSError, ValueError) as e:
+            print(f"  ✗ Error reading {path}: {e}")
+            counts["failed"] += 1
+            counts["bytes_after"] += size
+            continue
+
+        new_path = os.path.join(os.path.dirname(path), game_file_stem(os.path.basename(path)) + GAME_FORMATS[fmt])
+        write_game_file(new_path, data, output_dir)
+        if new_path != path:
+            os.remove(path)
+        record_saved_game(output_dir, new_path, data)
+        counts["converted"] += 1
+        counts["bytes_after"] += os.path.getsize(new_path)
+        if (i + 1) % 1000 == 0:
+            print(f"  [{i + 1}/{len(paths)}] converted {counts['converted']}")
+
+    load_manifest(output_dir)
+    return counts
+
+
+def format_summary(output_dir: str = "output") -> Dict[str, Dict[str, int]]:
+    """Number of files and bytes per game format"""
+    summary = {fmt: {"files": 0, "bytes": 0} for fmt in GAME_FORMATS}
+    for path in iter_game_files(output_dir):
+        entry = summary[format_of(path)]
+        entry["files"] += 1
+        entry["bytes"] += os.path.getsize(path)
+    return summary
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args and not args[0].startswith('--') else None
+    fmt = args.pop(0) if command == "convert" and args and not args[0].startswith('--') else None
+    output_dir = "output"
+    samples = DICT_SAMPLES
+    size = DICT_SIZE
+    recompress = False
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--output-dir', '--samples', '--size') and i + 1 < len(args):
+            if arg == '--output-dir':
+                output_dir = args[i + 1]
+            elif arg == '--samples':
+                samples = int(args[i + 1])
+            else:
+                size = int(args[i + 1]) * 1024
+            i += 2
+        elif arg == '--recompress':
+            recompress = True
+            i += 1
+        else:
+            command = None
+            break
+
+    if command not in ("status", "train-dict", "convert") or (command == "convert" and fmt not in GAME_FORMATS):
+        print("Compressed Game Files")
+        print("\nUsage:")
+        print("  python game_format.py status [--output-dir <dir>]")
+        print("  python game_format.py train-dict [--samples <n>] [--size <KB>] [--output-dir <dir>]")
+        print(f"  python game_format.py convert <{'|'.join(GAME_FORMATS)}> [--recompress] [--output-dir <dir>]")
+        print("\nSet J_ARCHIVE_FORMAT=gzip or zstd to save newly scraped games compressed.")
+        print("zstd needs the zstandard package; train a dictionary first for the best ratio.")
+        sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    try:
+        if command == "status":
+            summary = format_summary(output_dir)
+            for name, entry in summary.items():
+                if entry["files"]:
+                    print(f"{name:5} {entry['files']:>8} games  {entry['bytes'] / (1 << 20):>9.1f} MB  "
+                          f"({entry['bytes'] // entry['files']} bytes/game)")
+            dict_path = current_zstd_dict(output_dir)
+            print(f"zstd dictionary: {os.path.basename(dict_path) if dict_path else 'none trained'}")
+        elif command == "train-dict":
+            dict_path = train_dictionary(output_dir, samples, size)
+            print(f"✓ Trained {os.path.getsize(dict_path) // 1024} KB dictionary: {dict_path}")
+            print("New zstd files use it; run 'convert zstd --recompress' to apply it to existing ones.")
+        else:
+            started = datetime.now()
+            counts = convert_archive(output_dir, fmt, recompress)
+            before, after = counts["bytes_before"], counts["bytes_after"]
+            print(f"✓ Converted {counts['converted']} games to {fmt} in {datetime.now() - started} "
+                  f"({counts['skipped']} already {fmt}, {counts['failed']} failed)")
+            if before:
+                print(f"  {before / (1 << 20):.1f} MB -> {after / (1 << 20):.1f} MB ({after / before:.0%})")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+J-Archive Command Line
+One entry point for every tool in this repository. Each subcommand's module
+is only imported when that subcommand runs, and heavy dependencies
+(requests, BeautifulSoup, dotenv) are only imported by the code paths that
+use them, so lightweight commands start fast.
+"""
+
+import importlib
+import sys
+
+# name -> (module, description); each module exposes main() reading sys.argv
+COMMANDS = {
+    "scrape": ("scraper", "Scrape a single game"),
+    "batch": ("batch_scraper", "Scrape a range or list of games"),
+    "season": ("season_scraper", "Scrape every game in a season"),
+    "sync": ("sync", "Scrape only new or changed games of a season"),
+    "failures": ("failure_queue", "List failed scrapes, or retry-failed to re-drive them"),
+    "queue": ("work_queue", "Shared work queue for scraping with many workers"),
+    "rate": ("rate_budget", "Show request rates against the host-wide budget"),
+    "reorganize": ("reorganize_output", "Move game files into YYYY/MM folders"),
+    "manifest": ("archive", "Refresh and summarize the archive manifest"),
+    "format": ("game_format", "Convert game files between JSON, gzip and zstd"),
+    "verify": ("verify", "Validate every game file and queue bad ones for re-scraping"),
+    "stats": ("stats", "Archive statistics reports"),
+    "search": ("search", "Full-text clue search"),
+    "media": ("media", "Download picture and audio clues into the archive"),
+    "revalidate": ("revalidate", "Re-check scraped games for corrections, recent games first"),
+    "contestants": ("contestants", "Contestant streaks and winnings, and cached player pages"),
+    "dedup": ("dedup", "Detect repeated clues"),
+    "sample": ("sampling", "Preview stratified question sampling"),
+    "history": ("sent_history", "Show the sent-clue history"),
+    "email": ("daily_jeopardy_email", "Send the daily email (or run the daemon)"),
+    "serve": ("query_server", "Run the HTTP query service"),
+    "synthetic": ("synthetic", "Generate a synthetic archive"),
+    "mail-standin": ("mail_standin", "Run a local Mailgun stand-in server"),
+    "archive-standin": ("jarchive_standin", "Run a local J-Archive stand-in server"),
+}
+
+
+def usage():
+    print("J-Archive Command Line")
+    print("\nUsage:")
+    print("  python jarchive.py <command> [arguments...]")
+    print("\nCommands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<14} {description}")
+    print("\nRun a command without arguments (or with bad ones) to see its usage.")
+
+
+def load_command(name: str):
+    """Import a subcommand's module and return its main()"""
+    module_name, _ = COMMANDS[name]
+    return importlib.import_module(module_name).main
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        usage()
+        sys.exit(0 if argv else 1)
+
+    name = argv[0]
+    if name not in COMMANDS:
+        print(f"Error: Unknown command '{name}'\n")
+        usage()
+        sys.exit(1)
+
+    command = load_command(name)
+    # The subcommands parse sys.argv themselves
+    sys.argv = [f"jarchive {name}"] + argv[1:]
+    return command()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Local J-Archive Stand-in Server
+Serves showgame.php, showseason.php and showplayer.php pages and media clue
+files - recorded
+fixtures where there are any, otherwise rendered from synthetic games in the
+same HTML structure the scrapers parse - so scraping can be tested and
+load-tested offline. Returning champions keep their player id across the
+games of their streak.
+It can inject latency, throttling, error pages and stalled connections.
+Point the scrapers at it with J_ARCHIVE_URL.
+"""
+
+import bisect
+import hashlib
+import html
+import math
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from clue_table import season_for_date
+from synthetic import FIRST_AIR_DATE, WORDS, make_game, make_sentence, value_ladder
+
+
+MEDIA_RATE = 0.04      # Fraction of clues with a picture or sound
+MEDIA_VARIANTS = 40    # Distinct media files; the rest are byte-identical repeats
+
+_reign_starts = [1]  # First game of each champion's streak, extended as needed
+_reign_lock = threading.Lock()
+
+
+def air_date_for_game(game_id: int) -> date:
+    """Air date of a synthetic game: one game per weekday from the first show (a Monday)"""
+    weeks, day = divmod(game_id - 1, 5)
+    return FIRST_AIR_DATE + timedelta(weeks=weeks, days=day)
+
+
+def reign_for_game(game_id: int) -> Tuple[int, int]:
+    """(first, last) game of the champion's streak that game_id belongs to"""
+    with _reign_lock:
+        while _reign_starts[-1] <= game_id:
+            start = _reign_starts[-1]
+            # Most champions lose their first defense; a few go on long runs
+            length = 1 + min(int(random.Random(-start).expovariate(0.6)), 30)
+            _reign_starts.append(start + length)
+        i = bisect.bisect_right(_reign_starts, game_id) - 1
+        return _reign_starts[i], _reign_starts[i + 1] - 1
+
+
+def champion_of(game_id: int) -> int:
+    """Player id of the returning champion in a game (the winner of the game before)"""
+    first, _ = reign_for_game(game_id)
+    return 11 if first == 1 else (first - 1) * 10 + 2
+
+
+def player_games(player_id: int) -> List[int]:
+    """Games a stand-in player appeared in: one, plus the streak they won"""
+    debut, slot = divmod(player_id, 10)
+    if debut < 1 or slot not in (1, 2, 3) or (slot == 1 and debut != 1):
+        return []
+    if slot == 1:
+        first, last = reign_for_game(1)
+        return list(range(first, last + 1))
+    games = [debut]
+    if slot == 2 and reign_for_game(debut)[1] == debut:
+        # The challenger who beats the champion reigns over the next streak
+        first, last = reign_for_game(debut + 1)
+        games.extend(range(first, last + 1))
+    return games
+
+
+def player_profile(player_id: int) -> Dict:
+    rng = random.Random(player_id * 7919)
+    return {"name": make_sentence(rng, 2, 2).title(),
+            "description": f"a {rng.choice(WORDS)} from {rng.choice(WORDS).title()}"}
+
+
+def standin_game(game_id: int, base_url: str = "") -> Dict:
+    """
+    The game the stand-in serves for an id - the same on every request
+
+    Media clues link their files under base_url, which makes them the
+    absolute URLs the scraper saves for a stand-in at that address.
+    """
+    data = make_game(game_id, air_date_for_game(game_id), random.Random(game_id))
+
+    # Two challengers and the returning champion, who keeps winning until
+    # the last game of their streak, where the first challenger wins
+    player_ids = [game_id * 10 + 2, game_id * 10 + 3, champion_of(game_id)]
+    winner = player_ids[0] if reign_for_game(game_id)[1] == game_id else player_ids[2]
+    rng = random.Random(-game_id)
+    top = rng.randint(10, 40) * 1000
+    data["contestants"] = []
+    data["final_scores"] = []
+    for player_id in player_ids:
+        profile = player_profile(player_id)
+        data["contestants"].append({"name": profile["name"], "description": profile["description"],
+                                    "previous_winnings": None, "player_id": player_id})
+        score = top if player_id == winner else rng.randint(0, top // 1000 - 1) * 1000
+        data["final_scores"].append({"contestant": profile["name"].split()[0], "final_score": f"${score:,}"})
+
+    # Picture and audio clues, linked like J-Archive's /media/ files
+    clues = [(code, clue) for code, round_key in (("J", "jeopardy_round"), ("DJ", "double_jeopardy_round"))
+             for clue in data[round_key]["clues"]] + [("FJ", data["final_jeopardy"])]
+    for i, (code, clue) in enumerate(clues):
+        if rng.random() < MEDIA_RATE:
+            extension = "mp3" if rng.random() < 0.2 else "jpg"
+            clue["media"] = [f"{base_url}/media/{data['air_date_iso']}_{code}_{i}.{extension}"]
+    return data
+
+
+def media_file(name: str) -> bytes:
+    """Contents of a stand-in media file; many names share the same bytes"""
+    variant = int(hashlib.sha1(name.encode('utf-8')).hexdigest()[:8], 16) % MEDIA_VARIANTS
+    return b"STANDIN-MEDIA" + random.Random(variant).randbytes(16000)
+
+
+def _clue_text(clue: Dict) -> str:
+    text = _e(clue["clue"])
+    if clue.get("media"):
+        text = f'<a href="{_e(clue["media"][0])}" target="_blank">{text}</a>'
+    return text
+
+
+def _e(text) -> str:
+    return html.escape(str(text), quote=True)
+
+
+def _render_round(round_data: Dict, ladder: List[int], div_id: str, code: str) -> List[str]:
+    categories = round_data["categories"]
+    cells = {(clue["category_index"], row): clue
+             for row, clue in _board_positions(round_data, ladder)}
+
+    parts = [f'<div id="{div_id}"><table class="round">', '<tr>']
+    for category in categories:
+        parts.append(f'<td class="category"><table><tr><td class="category_name">{_e(category)}</td></tr></table></td>')
+    parts.append('</tr>')
+    for row in range(5):
+        parts.append('<tr>')
+        for column in range(len(categories)):
+            clue = cells.get((column, row))
+            if clue is None:
+                parts.append('<td class="clue"></td>')
+                continue
+            clue_id = f"clue_{code}_{column + 1}_{row + 1}"
+            if clue["daily_double"]:
+                value = f'<td class="clue_value_daily_double">DD: {_e(clue["value"])}</td>'
+            else:
+                value = f'<td class="clue_value">{_e(clue["value"])}</td>'
+            parts.append(
+                f'<td class="clue"><table><tr><td class="clue_header"><table><tr>{value}</tr></table></td></tr>'
+                f'<tr><td id="{clue_id}" class="clue_text">{_clue_text(clue)}</td>'
+                f'<td id="{clue_id}_r" class="clue_text" style="display:none;">'
+                f'<em class="correct_response">{_e(clue["answer"])}</em></td></tr></table></td>'
+            )
+        parts.append('</tr>')
+    parts.append('</table></div>')
+    return parts
+
+
+def _board_positions(round_data: Dict, ladder: List[int]):
+    """
+    (row, clue) for each clue
+
+    Clues are stored row by row, left to right, with unrevealed ones left
+    out; a recorded row is used as is, otherwise a regular clue's value gives
+    its row and a Daily Double sits in the row of the clue before it unless
+    its column has already been passed.
+    """
+    values = {f"${value:,}": row for row, value in enumerate(ladder)}
+    row, last_column = 0, -1
+    for clue in round_data["clues"]:
+        if isinstance(clue.get("row"), int):
+            row = clue["row"]
+        elif not clue["daily_double"] and clue["value"] in values:
+            row = values[clue["value"]]
+        elif clue["category_index"] <= last_column:
+            row += 1
+        last_column = clue["category_index"]
+        yield row, clue
+
+
+def render_game_page(data: Dict) -> str:
+    """A showgame.php page for a game in the JeopardyScraper.scrape() format"""
+    parts = [
+        '<!DOCTYPE html><html><head>',
+        f'<title>J! Archive - Show #{_e(data["episode_number"])}, aired {_e(data["air_date_iso"])}</title>',
+        '</head><body><div id="content">',
+        f'<div id="game_title"><h1>Show #{_e(data["episode_number"])} - {_e(data["air_date"])}</h1></div>',
+        '<div id="contestants"><table id="contestants_table"><tr><td>',
+    ]
+    for slot, contestant in enumerate(data["contestants"], start=1):
+        player_id = contestant.get("player_id", data["game_id"] * 10 + slot)
+        parts.append(
+            f'<p class="contestants"><a href="showplayer.php?player_id={player_id}">'
+            f'{_e(contestant["name"])}</a>, {_e(contestant["description"])}</p>'
+        )
+    parts.append('</td></tr></table></div>')
+
+    air_date = date.fromisoformat(data["air_date_iso"])
+    parts.extend(_render_round(data["jeopardy_round"], value_ladder(air_date, 0), "jeopardy_round", "J"))
+    parts.extend(_render_round(data["double_jeopardy_round"], value_ladder(air_date, 1),
+                               "double_jeopardy_round", "DJ"))
+
+    final = data["final_jeopardy"]
+    parts.append(
+        '<div id="final_jeopardy_round"><table class="final_round">'
+        f'<tr><td class="category"><table><tr><td class="category_name">{_e(final["category"])}</td></tr></table></td></tr>'
+        f'<tr><td id="clue_FJ" class="clue_text">{_clue_text(final)}</td>'
+        f'<td id="clue_FJ_r" class="clue_text" style="display:none;">'
+        f'<em class="correct_response">{_e(final["answer"])}</em></td></tr></table></div>'
+    )
+
+    parts.append('<h3>Final scores:</h3><table>')
+    parts.append('<tr>' + ''.join(f'<td class="score_player_nickname">{_e(s["contestant"])}</td>'
+                                  for s in data["final_scores"]) + '</tr>')
+    parts.append('<tr>' + ''.join(f'<td class="score_positive">{_e(s["final_score"])}</td>'
+                                  for s in data["final_scores"]) + '</tr>')
+    parts.append('</table></div></body></html>')
+    return "".join(parts)
+
+
+def render_season_page(season: str, games: List[Tuple[int, date]]) -> str:
+    """A showseason.php page listing (game_id, air date) pairs, newest first like J-Archive"""
+    parts = [f'<!DOCTYPE html><html><head><title>J! Archive - Season {_e(season)}</title></head><body>',
+             f'<div id="content"><h2>Season {_e(season)}</h2><table>']
+    for game_id, air_date in sorted(games, reverse=True):
+        parts.append(f'<tr><td align="left" class="left_padded"><a href="showgame.php?game_id={game_id}">'
+                     f'#{game_id}, aired&#160;{air_date.isoformat()}</a></td>'
+                     f'<td class="left_padded">Synthetic contestants</td><td class="left_padded"></td></tr>')
+    parts.append('</table></div></body></html>')
+    return "".join(parts)
+
+
+def render_player_page(player_id: int, profile: Dict, games: List[Tuple[int, date]]) -> str:
+    """A showplayer.php page: name, occupation and the player's games"""
+    parts = [f'<!DOCTYPE html><html><head><title>J! Archive - {_e(profile["name"])}</title></head><body>',
+             '<div id="content">',
+             f'<p class="player_full_name">{_e(profile["name"])}</p>',
+             f'<p class="player_occupation_and_origin">{_e(profile["description"])}</p>',
+             '<table>']
+    for game_id, air_date in games:
+        parts.append(f'<tr><td><a href="showgame.php?game_id={game_id}">#{game_id}, aired {air_date.isoformat()}</a>'
+                     '</td></tr>')
+    parts.append('</table></div></body></html>')
+    return "".join(parts)
+
+
+def render_error_page(game_id: str) -> str:
+    return (f'<!DOCTYPE html><html><head><title>J! Archive</title></head><body>'
+            f'<p class="error">ERROR: No game {_e(game_id)} in database.</p></body></html>')
+
+
+class LatencyModel:
+    """
+    Response delay distribution, from a spec string:
+
+        0.05                  fixed 50ms
+        uniform:0.01,0.2      uniform between 10ms and 200ms
+        lognormal:0.1,0.6     log-normal with a 100ms median and sigma 0.6
+    """
+
+    def __init__(self, spec="0"):
+        spec = str(spec)
+        kind, _, args = spec.partition(':') if ':' in spec else ("fixed", "", spec)
+        values = [float(v) for v in args.split(',') if v]
+        if kind not in ("fixed", "uniform", "lognormal") or len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"Bad latency spec '{spec}'")
+        self.spec = spec
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.values)
+        median, sigma = self.values
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class StandinArchiveServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server serving games 1..max_game_id
+
+    Faults are rolled once per page request, in order: stall (send half the
+    page, then hang), throttle (429 with Retry-After), error (a 5xx page) and
+    J-Archive error (a 200 page saying there is no such game). max_rps
+    answers 429 to requests beyond a server-side rate limit. edit_rate
+    serves a corrected version of that fraction of games (chosen by seed),
+    like J-Archive's fixes after a game airs.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, max_game_id: int = 10000, latency=0.0, fixtures_dir: Optional[str] = None,
+                 throttle_rate: float = 0.0, max_rps: float = 0.0, error_rate: float = 0.0,
+                 jarchive_error_rate: float = 0.0, stall_rate: float = 0.0, stall_seconds: float = 60.0,
+                 edit_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.max_game_id = max_game_id
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency)
+        self.fixtures_dir = fixtures_dir
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.jarchive_error_rate = jarchive_error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.edit_rate = edit_rate
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.fetches: Dict[int, int] = {}
+        self.player_fetches: Dict[int, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        self._seasons: Optional[Dict[str, List[Tuple[int, date]]]] = None
+        self._window = (0.0, 0)  # (second, requests in it) for max_rps
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, status, game_id: Optional[int] = None):
+        with self.lock:
+            key = str(status)
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if game_id is not None:
+                self.fetches[game_id] = self.fetches.get(game_id, 0) + 1
+
+    def roll(self) -> Tuple[float, Optional[str]]:
+        """(latency, fault) for one request; fault is None, 'stall', 'throttle', 'error' or 'jarchive_error'"""
+        with self.lock:
+            latency = self.latency.sample(self.rng)
+            if self.max_rps:
+                second = math.floor(time.monotonic())
+                start, count = self._window
+                count = count + 1 if start == second else 1
+                self._window = (second, count)
+                if count > self.max_rps:
+                    return latency, "throttle"
+            roll = self.rng.random()
+        for fault in ("stall", "throttle", "error", "jarchive_error"):
+            rate = getattr(self, f"{fault}_rate")
+            if roll < rate:
+                return latency, fault
+            roll -= rate
+        return latency, None
+
+    def fixture(self, name: str) -> Optional[str]:
+        if not self.fixtures_dir:
+            return None
+        try:
+            with open(os.path.join(self.fixtures_dir, name), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def game_page(self, game_id: int) -> Optional[str]:
+        page = self.fixture(f"game_{game_id}.html")
+        if page is None and 1 <= game_id <= self.max_game_id:
+            data = standin_game(game_id, self.base_url)
+            if self.edit_rate and random.Random(f"edit-{self.seed}-{game_id}").random() < self.edit_rate:
+                clue = data["jeopardy_round"]["clues"][0]
+                clue["answer"] = f"{clue['answer']} (also accepted: {clue['answer'].lower()})"
+            page = render_game_page(data)
+        return page
+
+    def player_page(self, player_id: int) -> Optional[str]:
+        page = self.fixture(f"player_{player_id}.html")
+        if page is None:
+            with self.lock:
+                self.player_fetches[player_id] = self.player_fetches.get(player_id, 0) + 1
+                games = [g for g in player_games(player_id) if g <= self.max_game_id]
+            if games:
+                page = render_player_page(player_id, player_profile(player_id),
+                                          [(g, air_date_for_game(g)) for g in games])
+        return page
+
+    def season_page(self, season: str) -> Optional[str]:
+        page = self.fixture(f"season_{season}.html")
+        if page is not None:
+            return page
+        with self.lock:
+            if self._seasons is None:
+                seasons = {}
+                for game_id in range(1, self.max_game_id + 1):
+                    air_date = air_date_for_game(game_id)
+                    seasons.setdefault(str(season_for_date(air_date)), []).append((game_id, air_date))
+                self._seasons = seasons
+        games = self._seasons.get(season)
+        return render_season_page(season, games) if games else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandinArchiveServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body, game_id: Optional[int] = None, headers: Optional[Dict] = None,
+               content_type: str = "text/html; charset=utf-8"):
+        payload = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.record(status, game_id)
+
+    def _stall(self, body, game_id: Optional[int]):
+        """Send the headers and half the page, then go quiet"""
+        payload = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload[:len(payload) // 2])
+        self.wfile.flush()
+        self.server.record("stall", game_id)
+        time.sleep(self.server.stall_seconds)
+        self.close_connection = True
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        game_id = None
+        content_type = "text/html; charset=utf-8"
+        if url.path.startswith("/media/"):
+            name = url.path[len("/media/"):]
+            extension = os.path.splitext(name)[1]
+            if extension not in (".jpg", ".mp3") or "/" in name:
+                return self._reply(404, "<html><body>Not found</body></html>")
+            page = media_file(name)
+            content_type = "audio/mpeg" if extension == ".mp3" else "image/jpeg"
+        elif url.path == "/showgame.php":
+            raw_id = query.get("game_id", [""])[0]
+            try:
+                game_id = int(raw_id)
+            except ValueError:
+                return self._reply(200, render_error_page(raw_id))
+            page = server.game_page(game_id)
+        elif url.path == "/showseason.php":
+            page = server.season_page(query.get("season", [""])[0])
+        elif url.path == "/showplayer.php":
+            try:
+                page = server.player_page(int(query.get("player_id", [""])[0]))
+            except ValueError:
+                page = None
+        else:
+            return self._reply(404, "<html><body>Not found</body></html>")
+
+        latency, fault = server.roll()
+        if latency:
+            time.sleep(latency)
+        if fault == "throttle":
+            return self._reply(429, "<html><body>Too many requests</body></html>", game_id, {"Retry-After": "1"})
+        if fault == "error":
+            return self._reply(503, "<html><body><h1>503 Service Unavailable</h1></body></html>", game_id)
+        # J-Archive answers unknown games with a 200 and an error message
+        if page is None or fault == "jarchive_error":
+            return self._reply(200, render_error_page(str(game_id or "")), game_id)
+        if fault == "stall":
+            return self._stall(page, game_id)
+
+        payload = page.encode('utf-8') if isinstance(page, str) else page
+        etag = '"' + hashlib.sha1(payload).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return server.record(304, game_id)
+        self._reply(200, payload, game_id, {"ETag": etag}, content_type)
+
+
+def start_standin(port: int = 0, **options) -> StandinArchiveServer:
+    """Start a stand-in server on a background thread (port 0 picks a free port)"""
+    server = StandinArchiveServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record_fixtures(fixtures_dir: str, game_ids: List[int], seasons: List[str], base_url: Optional[str] = None,
+                    player_ids: Optional[List[int]] = None):
+    """Save real pages (from J_ARCHIVE_URL / j-archive.com) as fixtures for the stand-in"""
+    import requests
+    from rate_budget import wait_for_turn
+    from scraper import get_base_url
+
+    base_url = (base_url or get_base_url()).rstrip('/')
+    os.makedirs(fixtures_dir, exist_ok=True)
+    pages = [(f"{base_url}/showgame.php?game_id={gid}", f"game_{gid}.html") for gid in game_ids]
+    pages += [(f"{base_url}/showseason.php?season={season}", f"season_{season}.html") for season in seasons]
+    pages += [(f"{base_url}/showplayer.php?player_id={pid}", f"player_{pid}.html") for pid in player_ids or []]
+    for url, name in pages:
+        wait_for_turn(url, "interactive")
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(fixtures_dir, name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"  ✓ {url} → {name}")
+
+
+def usage():
+    print("Local J-Archive Stand-in Server")
+    print("\nUsage:")
+    print("  python jarchive_standin.py [options]")
+    print("  python jarchive_standin.py record <fixtures_dir> [--game <id>]... [--season <code>]... [--player <id>]...")
+    print("\nOptions:")
+    print("  --port <n>                 Port to listen on (default 8080)")
+    print("  --max-game-id <n>          Serve synthetic games 1..n (default 10000)")
+    print("  --fixtures <dir>           Serve recorded game_<id>.html / season_<code>.html /")
+    print("                             player_<id>.html pages first")
+    print("  --latency <spec>           0.05, uniform:0.01,0.2 or lognormal:0.1,0.6 (seconds)")
+    print("  --throttle-rate <r>        Fraction of requests answered 429")
+    print("  --max-rps <n>              Answer 429 above n requests per second")
+    print("  --error-rate <r>           Fraction answered with a 503 error page")
+    print("  --jarchive-error-rate <r>  Fraction answered with J-Archive's 'no game' page")
+    print("  --stall-rate <r>           Fraction that send half a page and then hang")
+    print("  --stall-seconds <s>        How long a stall lasts (default 60)")
+    print("  --edit-rate <r>            Fraction of games served with a correction")
+    print("  --seed <n>                 Seed for the fault and latency rolls")
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == 'record':
+        if len(args) < 2:
+            usage()
+        game_ids, seasons, player_ids = [], [], []
+        i = 2
+        while i < len(args):
+            if args[i] == '--game' and i + 1 < len(args):
+                game_ids.append(int(args[i + 1]))
+            elif args[i] == '--player' and i + 1 < len(args):
+                player_ids.append(int(args[i + 1]))
+            elif args[i] == '--season' and i + 1 < len(args):
+                seasons.append(args[i + 1])
+            else:
+                usage()
+            i += 2
+        record_fixtures(args[1], game_ids, seasons, player_ids=player_ids)
+        return
+
+    port = 8080
+    options = {}
+    flags = {
+        "--max-game-id": ("max_game_id", int), "--fixtures": ("fixtures_dir", str),
+        "--latency": ("latency", LatencyModel), "--throttle-rate": ("throttle_rate", float),
+        "--max-rps": ("max_rps", float), "--error-rate": ("error_rate", float),
+        "--jarchive-error-rate": ("jarchive_error_rate", float), "--stall-rate": ("stall_rate", float),
+        "--stall-seconds": ("stall_seconds", float), "--edit-rate": ("edit_rate", float),
+        "--seed": ("seed", int),
+    }
+    i = 0
+    while i < len(args):
+        if args[i] == '--port' and i + 1 < len(args):
+            port = int(args[i + 1])
+        elif args[i] in flags and i + 1 < len(args):
+            name, parse = flags[args[i]]
+            try:
+                options[name] = parse(args[i + 1])
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        else:
+            usage()
+        i += 2
+
+    server = StandinArchiveServer(("127.0.0.1", port), **options)
+    print(f"📼 J-Archive stand-in serving games 1-{server.max_game_id} on {server.base_url}")
+    if server.fixtures_dir:
+        print(f"Recorded fixtures from {server.fixtures_dir}/ take precedence")
+    print(f"Set J_ARCHIVE_URL={server.base_url} to scrape from it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed {sum(server.fetches.values())} game pages: {server.status_counts}")
+
+
+if __name__ == "__main__":
+    main()
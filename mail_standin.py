@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Local Mailgun Stand-in Server
+Accepts the same POST /v3/<domain>/messages requests as Mailgun, records
+them instead of sending mail, and can inject latency, 429s and 5xx errors.
+Used to test batch delivery without touching the real API.
+"""
+
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+# Mailgun accepts at most this many "to" addresses per message
+MAX_RECIPIENTS = 1000
+
+
+class StandinMailServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the recorded messages and fault settings"""
+
+    daemon_threads = True
+
+    def __init__(self, address, api_key: str = "key-test", fail_rate: float = 0.0,
+                 throttle_rate: float = 0.0, latency: float = 0.0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.api_key = api_key
+        self.fail_rate = fail_rate
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.messages: List[Dict] = []
+        self.status_counts: Dict[int, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def delivered_to(self) -> List[str]:
+        """Every recipient address of every accepted message"""
+        with self.lock:
+            return [to for message in self.messages for to in message["to"]]
+
+    def count(self, status: int):
+        with self.lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandinMailServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(status)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'v3' or parts[2] != 'messages':
+            return self._reply(404, {"message": "Not found"})
+
+        expected = "Basic " + base64.b64encode(f"api:{server.api_key}".encode()).decode()
+        if self.headers.get("Authorization") != expected:
+            return self._reply(401, {"message": "Forbidden"})
+
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            roll = server.rng.random()
+        if roll < server.throttle_rate:
+            return self._reply(429, {"message": "Too many requests"}, {"Retry-After": "0"})
+        if roll < server.throttle_rate + server.fail_rate:
+            return self._reply(503, {"message": "Service unavailable"})
+
+        to = form.get("to", [])
+        if not to or not form.get("from") or not form.get("subject"):
+            return self._reply(400, {"message": "'from', 'to' and 'subject' are required"})
+        if len(to) > MAX_RECIPIENTS:
+            return self._reply(400, {"message": f"Too many recipients (max {MAX_RECIPIENTS})"})
+
+        variables = json.loads(form["recipient-variables"][0]) if "recipient-variables" in form else None
+        if len(to) > 1 and variables is None:
+            # Without recipient variables Mailgun would send one message with everyone in To:
+            return self._reply(400, {"message": "Batch sending requires recipient-variables"})
+
+        with server.lock:
+            message_id = f"<{len(server.messages) + 1}@{parts[1]}>"
+            server.messages.append({
+                "id": message_id,
+                "domain": parts[1],
+                "to": to,
+                "subject": form["subject"][0],
+                "recipient_variables": variables,
+            })
+        self._reply(200, {"id": message_id, "message": "Queued. Thank you."})
+
+
+def start_standin(port: int = 0, **options) -> StandinMailServer:
+    """Start a stand-in server on a background thread (port 0 picks a free port)"""
+    server = StandinMailServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8025
+    fail_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    server = StandinMailServer(("127.0.0.1", port), fail_rate=fail_rate)
+    print(f"📭 Mailgun stand-in listening on {server.base_url} (API key: {server.api_key})")
+    print(f"Set MAILGUN_API_BASE={server.base_url} to send to it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nReceived {len(server.messages)} messages for {len(server.delivered_to())} recipients")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Media Clue Downloader
+Downloads the pictures, audio and video linked from clues, concurrently and
+under the shared rate budget. Files are stored once per content under
+output/media/ (named by their SHA-256), URLs already downloaded are skipped,
+and each media clue gets "media_files" with the local paths.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from archive import (get_index_dir, iter_game_clues, load_game_data, load_manifest, record_saved_game,
+                     write_game_file)
+
+
+MEDIA_DIRNAME = "media"
+INDEX_FILENAME = "media.sqlite"
+CHUNK_SIZE = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS clue_media (
+    path TEXT NOT NULL,
+    url  TEXT NOT NULL,
+    PRIMARY KEY (path, url)
+);
+CREATE INDEX IF NOT EXISTS clue_media_url ON clue_media(url);
+CREATE TABLE IF NOT EXISTS assets (
+    url          TEXT PRIMARY KEY,
+    file         TEXT,
+    sha256       TEXT,
+    size         INTEGER,
+    content_type TEXT,
+    error        TEXT,
+    attempts     INTEGER NOT NULL,
+    fetched_at   TEXT    NOT NULL
+);
+"""
+
+
+def game_media_urls(data: Dict) -> Set[str]:
+    """Every media URL linked from a game's clues"""
+    return {url for _, _, clue in iter_game_clues(data) for url in clue.get('media', [])}
+
+
+def media_path(sha256: str, url: str) -> str:
+    """Content-addressed location of a media file, relative to the output directory"""
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    return "/".join((MEDIA_DIRNAME, sha256[:2], sha256 + extension))
+
+
+def download_asset(url: str, output_dir: str) -> Dict:
+    """
+    Download one media file into its content-addressed place
+
+    The body is hashed while it streams to a temp file; if a file with the
+    same content is already stored, the download is dropped instead of kept
+    twice.
+
+    Returns:
+        {"file", "sha256", "size", "content_type", "duplicate"}
+    """
+    import requests
+    from rate_budget import wait_for_turn
+    from scraper import get_request_timeout
+
+    wait_for_turn(url, "backfill")
+    media_dir = os.path.join(output_dir, MEDIA_DIRNAME)
+    os.makedirs(media_dir, exist_ok=True)
+    tmp_path = os.path.join(media_dir, f".download.{os.getpid()}.{hashlib.sha1(url.encode('utf-8')).hexdigest()}")
+    try:
+        with requests.get(url, timeout=get_request_timeout(), stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if content_type.startswith('text/html'):
+                # An error page, not the file
+                raise ValueError(f"got an HTML page instead of media ({response.status_code})")
+            sha = hashlib.sha256()
+            size = 0
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    sha.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+        rel = media_path(sha.hexdigest(), url)
+        final_path = os.path.join(output_dir, rel)
+        duplicate = os.path.exists(final_path)
+        if duplicate:
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+        return {"file": rel, "sha256": sha.hexdigest(), "size": size,
+                "content_type": content_type, "duplicate": duplicate}
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class MediaStore:
+    """
+    Media URLs per game and downloaded assets in a SQLite database under .jarchive/
+
+    The URL list is refreshed per game file from the manifest, so a run
+    after a scrape only reads the new games.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(get_index_dir(output_dir), INDEX_FILENAME)
+        self.db = sqlite3.connect(self.path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self) -> List[str]:
+        """Re-read the media URLs of new or changed games; returns their paths"""
+        manifest = load_manifest(self.output_dir)
+        indexed = {path: (size, mtime_ns) for path, size, mtime_ns
+                   in self.db.execute("SELECT path, size, mtime_ns FROM files")}
+        changed = []
+        with self.db:
+            for rel in indexed:
+                if rel not in manifest.entries:
+                    self._forget(rel)
+            for rel, entry in manifest.entries.items():
+                if indexed.get(rel) == (entry.get('size'), entry.get('mtime_ns')):
+                    continue
+                try:
+                    data = load_game_data(manifest.abspath(rel))
+                except (OSError, ValueError) as e:
+                    print(f"  ✗ Error reading {rel}: {e}")
+                    continue
+                self._forget(rel)
+                self.db.executemany("INSERT INTO clue_media (path, url) VALUES (?, ?)",
+                                    ((rel, url) for url in game_media_urls(data)))
+                self.db.execute("INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                                (rel, entry.get('size'), entry.get('mtime_ns')))
+                changed.append(rel)
+        return changed
+
+    def _forget(self, rel: str):
+        self.db.execute("DELETE FROM clue_media WHERE path = ?", (rel,))
+        self.db.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+    def local_files(self) -> Dict[str, str]:
+        """url -> stored file, for assets whose file is still on disk"""
+        return {url: file for url, file in self.db.execute("SELECT url, file FROM assets WHERE file IS NOT NULL")
+                if os.path.exists(os.path.join(self.output_dir, file))}
+
+    def pending(self, retry_failed: bool = False) -> List[str]:
+        """Media URLs still to download (failed ones only with retry_failed)"""
+        stored = self.local_files()
+        failed = {url for url, in self.db.execute("SELECT url FROM assets WHERE file IS NULL")}
+        return [url for url, in self.db.execute("SELECT DISTINCT url FROM clue_media ORDER BY url")
+                if url not in stored and (retry_failed or url not in failed)]
+
+    def record(self, url: str, asset: Optional[Dict] = None, error: Optional[str] = None):
+        now = datetime.now().isoformat(timespec='seconds')
+        asset = asset or {}
+        with self.db:
+            self.db.execute(
+                "INSERT INTO assets (url, file, sha256, size, content_type, error, attempts, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1, ?) ON CONFLICT(url) DO UPDATE SET file = excluded.file, "
+                "sha256 = excluded.sha256, size = excluded.size, content_type = excluded.content_type, "
+                "error = excluded.error, attempts = attempts + 1, fetched_at = excluded.fetched_at",
+                (url, asset.get("file"), asset.get("sha256"), asset.get("size"), asset.get("content_type"),
+                 error, now))
+
+    def games_using(self, urls) -> Set[str]:
+        games = set()
+        for url in urls:
+            games.update(path for path, in self.db.execute("SELECT path FROM clue_media WHERE url = ?", (url,)))
+        return games
+
+    def link_games(self, paths) -> int:
+        """
+        Write media_files into the clues of these games
+
+        media_files lines up with media: the stored file for each URL
+        (relative to the output directory), or null if it isn't downloaded.
+
+        Returns:
+            Number of game files rewritten
+        """
+        stored = self.local_files()
+        rewritten = 0
+        for rel in sorted(paths):
+            path = os.path.join(self.output_dir, rel)
+            try:
+                data = load_game_data(path)
+            except (OSError, ValueError) as e:
+                print(f"  ✗ Error reading {rel}: {e}")
+                continue
+            changed = False
+            for _, _, clue in iter_game_clues(data):
+                if clue.get('media'):
+                    files = [stored.get(url) for url in clue['media']]
+                    if clue.get('media_files') != files:
+                        clue['media_files'] = files
+                        changed = True
+            if not changed:
+                continue
+
+            write_game_file(path, data, self.output_dir)
+            record_saved_game(self.output_dir, path, data)
+            # Our own rewrite doesn't need re-reading next run
+            stat = os.stat(path)
+            with self.db:
+                self.db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                                (stat.st_size, stat.st_mtime_ns, rel))
+            rewritten += 1
+        return rewritten
+
+    def summary(self) -> Dict[str, int]:
+        urls, games = self.db.execute("SELECT COUNT(DISTINCT url), COUNT(DISTINCT path) FROM clue_media").fetchone()
+        stored, failed, files, size = self.db.execute(
+            "SELECT COUNT(file), COUNT(*) - COUNT(file), COUNT(DISTINCT file), "
+            "COALESCE(SUM(size), 0) FROM assets").fetchone()
+        stored_bytes = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT file, size FROM assets WHERE file IS NOT NULL)"
+        ).fetchone()[0]
+        return {"urls": urls, "games": games, "downloaded": stored, "failed": failed,
+                "unique_files": files, "bytes_linked": size, "bytes_stored": stored_bytes}
+
+
+def download_media(output_dir: str = "output", workers: int = 4, limit: Optional[int] = None,
+                   retry_failed: bool = False) -> Dict[str, int]:
+    """
+    Download the media of every clue in the archive that isn't stored yet
+
+    Downloads run on a thread pool; every request waits for the host-wide
+    rate budget, so workers only help hide latency. Bookkeeping stays on
+    this thread.
+
+    Returns:
+        Counts: "downloaded", "duplicates" (same content as a stored file),
+        "failed" and "games_updated"
+    """
+    store = MediaStore(output_dir)
+    try:
+        scanned = store.update()
+        urls = store.pending(retry_failed)[:limit]
+        counts = {"downloaded": 0, "duplicates": 0, "failed": 0, "games_updated": 0}
+        done = []
+        print(f"{len(urls)} media files to download with {workers} workers")
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = {executor.submit(download_asset, url, output_dir): url for url in urls}
+            for i, future in enumerate(as_completed(futures), 1):
+                url = futures[future]
+                try:
+                    asset = future.result()
+                except Exception as e:  # Network, HTTP status, disk - all mean "try again later"
+                    store.record(url, error=f"{type(e).__name__}: {e}")
+                    counts["failed"] += 1
+                    print(f"[{i}/{len(urls)}] ✗ {url}: {e}")
+                    continue
+                store.record(url, asset)
+                done.append(url)
+                counts["duplicates" if asset["duplicate"] else "downloaded"] += 1
+                note = " (already stored)" if asset["duplicate"] else ""
+                print(f"[{i}/{len(urls)}] ✓ {url} → {asset['file']}{note}")
+
+        # Games whose media just arrived, and new games whose media was already stored
+        counts["games_updated"] = store.link_games(store.games_using(done) | set(scanned))
+        return counts
+    finally:
+        store.close()
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args and not args[0].startswith('--') else "download"
+    output_dir = "output"
+    workers = 4
+    limit = None
+    retry_failed = False
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--output-dir', '--workers', '--limit') and i + 1 < len(args):
+            if arg == '--output-dir':
+                output_dir = args[i + 1]
+            elif arg == '--workers':
+                workers = int(args[i + 1])
+            else:
+                limit = int(args[i + 1])
+            i += 2
+        elif arg == '--retry-failed':
+            retry_failed = True
+            i += 1
+        else:
+            command = None
+            break
+
+    if command not in ("download", "status"):
+        print("Media Clue Downloader")
+        print("\nUsage:")
+        print("  python media.py [download] [--workers <n>] [--limit <n>] [--retry-failed] [--output-dir <dir>]")
+        print("  python media.py status [--output-dir <dir>]")
+        print("\nFiles are stored once per content in <output_dir>/media/, and each media clue")
+        print("gets \"media_files\" with their paths. Downloads wait for the shared rate budget.")
+        sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    if command == "status":
+        store = MediaStore(output_dir)
+        store.update()
+        s = store.summary()
+        store.close()
+        print(f"{s['urls']} media URLs in {s['games']} games")
+        print(f"  ✓ Downloaded: {s['downloaded']} ({s['unique_files']} unique files, "
+              f"{s['bytes_stored'] / (1 << 20):.1f} MB stored for {s['bytes_linked'] / (1 << 20):.1f} MB linked)")
+        if s["failed"]:
+            print(f"  ✗ Failed: {s['failed']} (retry with --retry-failed)")
+        return
+
+    counts = download_media(output_dir, workers, limit, retry_failed)
+    print(f"\n{'='*60}")
+    print(f"✓ Downloaded: {counts['downloaded']} new files, {counts['duplicates']} duplicates of stored files")
+    if counts["failed"]:
+        print(f"✗ Failed: {counts['failed']} (retry with --retry-failed)")
+    print(f"Games updated with media_files: {counts['games_updated']}")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Local HTTP Query Service for the scraped archive
+Serves games, random clues, search and date lookups from a warm index and
+an LRU cache of decoded games, so quiz tools don't re-read JSON per request
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import search
+from archive import DateIndex, load_game_data, load_manifest
+from daily_jeopardy_email import get_random_clue, make_question
+from dedup import load_repeat_ids
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 512
+RELOAD_INTERVAL = 60.0
+MAX_DRAIN_BYTES = 64 * 1024  # Larger request bodies get the connection closed instead of read
+
+ROUND_FILTERS = {
+    "jeopardy": {'Jeopardy!'},
+    "double": {'Double Jeopardy!'},
+}
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def entry_etag(rel: str, entry: Dict) -> str:
+    """Strong ETag for a game file, derived from its manifest entry"""
+    raw = f"{rel}\0{entry.get('size')}\0{entry.get('mtime_ns')}".encode('utf-8')
+    return '"' + hashlib.sha1(raw).hexdigest()[:20] + '"'
+
+
+class GameCache:
+    """Bounded LRU cache of decoded games (plus their encoded response bodies)"""
+
+    def __init__(self, max_games: int = DEFAULT_CACHE_SIZE):
+        self.max_games = max_games
+        self.games = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, etag: str) -> Tuple[Dict, bytes]:
+        """Return (game data, JSON body) for a file, loading it on a miss or when its ETag changed"""
+        with self.lock:
+            cached = self.games.get(path)
+            if cached is not None and cached[0] == etag:
+                self.games.move_to_end(path)
+                self.hits += 1
+                return cached[1], cached[2]
+            self.misses += 1
+
+        data = load_game_data(path)
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+        with self.lock:
+            self.games[path] = (etag, data, body)
+            self.games.move_to_end(path)
+            while len(self.games) > self.max_games:
+                self.games.popitem(last=False)
+        return data, body
+
+
+class ArchiveSnapshot:
+    """
+    One consistent view of the archive index
+
+    Never modified once built: a reload builds a new snapshot and swaps it in
+    with a single assignment, so a request sees either the old index or the
+    new one, never a mix.
+    """
+
+    def __init__(self, digest: Optional[str] = None, entries: Optional[Dict] = None,
+                 dates: Optional[DateIndex] = None, repeat_ids=frozenset()):
+        self.digest = digest
+        self.entries = entries or {}
+        self.by_game_id = {int(entry['game_id']): rel for rel, entry in self.entries.items()
+                           if entry.get('game_id') is not None}
+        self.dates = dates if dates is not None else DateIndex({})
+        self.files = sorted(self.entries)
+        self.repeat_ids = repeat_ids
+
+
+class ArchiveService:
+    """Request handling over one output directory"""
+
+    def __init__(self, output_dir: str = "output", cache_size: int = DEFAULT_CACHE_SIZE):
+        self.output_dir = output_dir
+        self.cache = GameCache(cache_size)
+        self.rng = random.Random()
+        self.snapshot = ArchiveSnapshot()
+
+    def warm(self, preload: int = 0):
+        """(Re)build the in-memory index from the manifest and update the search index"""
+        manifest = load_manifest(self.output_dir)
+        digest = manifest.digest()
+        if digest == self.snapshot.digest:
+            return False
+
+        search.update_index(self.output_dir)
+
+        snapshot = ArchiveSnapshot(digest, manifest.entries, manifest.date_index, load_repeat_ids(self.output_dir))
+        self.snapshot = snapshot
+
+        # Preload the most recent games into the cache
+        for rel in reversed(snapshot.dates.paths[-preload:] if preload > 0 else []):
+            self.load(snapshot, rel)
+        return True
+
+    def load(self, snapshot: ArchiveSnapshot, rel: str) -> Tuple[Dict, bytes, str]:
+        etag = entry_etag(rel, snapshot.entries[rel])
+        data, body = self.cache.get(os.path.join(self.output_dir, rel), etag)
+        return data, body, etag
+
+    @staticmethod
+    def game_summary(snapshot: ArchiveSnapshot, rel: str) -> Dict:
+        entry = snapshot.entries[rel]
+        return {"game_id": entry.get('game_id'), "air_date": entry.get('air_date'), "file": rel}
+
+    def handle(self, path: str, query: Dict[str, str], headers: Dict[str, str]) -> Tuple[int, Dict, bytes]:
+        """Route a GET request; returns (status, extra headers, body)"""
+        parts = [p for p in path.split('/') if p]
+        snapshot = self.snapshot  # Read once: a reload mid-request must not mix two indexes
+
+        if parts == ['health']:
+            return self.json_response({
+                "games": len(snapshot.entries),
+                "digest": snapshot.digest,
+                "cache": {"size": len(self.cache.games), "hits": self.cache.hits, "misses": self.cache.misses},
+            }, cache=False)
+
+        if len(parts) == 2 and parts[0] == 'games':
+            try:
+                rel = snapshot.by_game_id[int(parts[1])]
+            except (ValueError, KeyError):
+                return self.error(404, f"Game {parts[1]} not found")
+            _, body, etag = self.load(snapshot, rel)
+            if headers.get('if-none-match') == etag:
+                return 304, {"ETag": etag}, b""
+            return 200, {"ETag": etag, "Content-Type": "application/json; charset=utf-8"}, body
+
+        if parts == ['random-clue']:
+            rounds = None
+            if 'round' in query:
+                rounds = ROUND_FILTERS.get(query['round'])
+                if rounds is None:
+                    return self.error(400, "round must be 'jeopardy' or 'double'")
+            return self.random_clue(snapshot, rounds)
+
+        if parts == ['search']:
+            if not query.get('q'):
+                return self.error(400, "Missing q parameter")
+            options = {"field": query.get('field'), "round_name": query.get('round'),
+                       "date_from": query.get('from'), "date_to": query.get('to'), "update": False}
+            if 'daily_double' in query:
+                options["daily_double"] = query['daily_double'].lower() in ('1', 'true', 'yes')
+            try:
+                options["limit"] = min(int(query.get('limit', 20)), 500)
+                results = search.search(query['q'], self.output_dir, **options)
+            except ValueError as e:
+                return self.error(400, str(e))
+            except Exception as e:  # sqlite3.OperationalError for malformed FTS queries
+                return self.error(400, f"Invalid query: {e}")
+            return self.conditional(snapshot, results, headers)
+
+        if parts and parts[0] == 'dates':
+            if len(parts) == 2:
+                rels = snapshot.dates.between(parts[1], parts[1])
+                return self.conditional(snapshot, [self.game_summary(snapshot, rel) for rel in rels], headers)
+            if len(parts) == 1 and ('from' in query or 'to' in query):
+                rels = snapshot.dates.between(query.get('from'), query.get('to'))
+                return self.conditional(snapshot, [self.game_summary(snapshot, rel) for rel in rels], headers)
+            return self.error(400, "Use /dates/<YYYY-MM-DD> or /dates?from=<YYYY-MM-DD>&to=<YYYY-MM-DD>")
+
+        if parts and parts[0] == 'on-this-day':
+            try:
+                month, day = (int(x) for x in parts[1].split('-')) if len(parts) == 2 else \
+                    (date.today().month, date.today().day)
+            except ValueError:
+                return self.error(400, "Use /on-this-day or /on-this-day/<MM-DD>")
+            summaries = [self.game_summary(snapshot, rel) for rel in snapshot.dates.on_day(month, day)]
+            return self.conditional(snapshot, summaries, headers)
+
+        return self.error(404, "Unknown endpoint")
+
+    def random_clue(self, snapshot: ArchiveSnapshot, rounds: Optional[set]) -> Tuple[int, Dict, bytes]:
+        """Random clue with the same rules as the daily email (valid clue and answer, no repeats)"""
+        if not snapshot.files:
+            return self.error(404, "Archive is empty")
+        for _ in range(min(len(snapshot.files), 50)):
+            rel = self.rng.choice(snapshot.files)
+            try:
+                data, _, _ = self.load(snapshot, rel)
+            except (OSError, ValueError):
+                continue
+            clue = get_random_clue(data, snapshot.repeat_ids, rounds)
+            if clue:
+                return self.json_response(make_question(data, clue), cache=False)
+        return self.error(404, "No valid clue found")
+
+    @staticmethod
+    def conditional(snapshot: ArchiveSnapshot, payload, headers: Dict[str, str]) -> Tuple[int, Dict, bytes]:
+        """JSON response with an ETag tied to the archive state and payload"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        etag = '"' + hashlib.sha1(snapshot.digest.encode('ascii') + body).hexdigest()[:20] + '"'
+        if headers.get('if-none-match') == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag, "Content-Type": "application/json; charset=utf-8"}, body
+
+    @staticmethod
+    def json_response(payload, cache: bool = True) -> Tuple[int, Dict, bytes]:
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        if not cache:
+            headers["Cache-Control"] = "no-store"
+        return 200, headers, json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def error(status: int, message: str) -> Tuple[int, Dict, bytes]:
+        return status, {"Content-Type": "application/json; charset=utf-8"}, json.dumps({"error": message}).encode('utf-8')
+
+
+async def handle_connection(service: ArchiveService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve HTTP/1.1 requests (with keep-alive) on one connection"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            # Read past any request body so the next request on this connection
+            # starts where it should; bodies we can't size or that are too big
+            # end the connection instead
+            if 'transfer-encoding' in headers:
+                keep_alive = False
+            elif headers.get('content-length', '0') != '0':
+                try:
+                    length = int(headers['content-length'])
+                except ValueError:
+                    length = -1
+                if 0 <= length <= MAX_DRAIN_BYTES:
+                    await reader.readexactly(length)
+                else:
+                    keep_alive = False
+
+            if method != 'GET':
+                status, extra, body = service.error(405, "Only GET is supported")
+            else:
+                url = urlsplit(target)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    status, extra, body = await asyncio.to_thread(service.handle, url.path, query, headers)
+                except Exception as e:
+                    status, extra, body = service.error(500, str(e))
+
+            head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Length: {len(body)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            head.extend(f"{k}: {v}" for k, v in extra.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def reload_periodically(service: ArchiveService, interval: float):
+    """Pick up newly scraped games without restarting"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await asyncio.to_thread(service.warm):
+                print(f"Reloaded index: {len(service.snapshot.entries)} games")
+        except Exception as e:
+            print(f"Error reloading index: {e}")
+
+
+async def serve(output_dir: str = "output", host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                cache_size: int = DEFAULT_CACHE_SIZE, preload: int = 0,
+                reload_interval: float = RELOAD_INTERVAL, ready: Optional[threading.Event] = None):
+    """Warm the index and serve until cancelled"""
+    service = ArchiveService(output_dir, cache_size)
+    service.warm(preload=preload)
+    print(f"Indexed {len(service.snapshot.entries)} games from {output_dir}/")
+
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    print(f"Serving on http://{host}:{port}/")
+    if ready is not None:
+        ready.set()
+
+    reloader = asyncio.create_task(reload_periodically(service, reload_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        reloader.cancel()
+
+
+def main():
+    options = {"output_dir": "output", "host": DEFAULT_HOST, "port": DEFAULT_PORT,
+               "cache_size": DEFAULT_CACHE_SIZE, "preload": 0}
+    flags = {"--output-dir": ("output_dir", str), "--host": ("host", str), "--port": ("port", int),
+             "--cache-size": ("cache_size", int), "--preload": ("preload", int)}
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in flags and i + 1 < len(sys.argv):
+            key, cast = flags[sys.argv[i]]
+            options[key] = cast(sys.argv[i + 1])
+            i += 2
+        else:
+            print("Local HTTP Query Service")
+            print("\nUsage:")
+            print("  python query_server.py [--output-dir <dir>] [--host <host>] [--port <port>]")
+            print("                         [--cache-size <games>] [--preload <games>]")
+            print("\nEndpoints:")
+            print("  GET /games/<game_id>")
+            print("  GET /random-clue[?round=jeopardy|double]")
+            print("  GET /search?q=<query>[&field=][&round=][&from=][&to=][&daily_double=][&limit=]")
+            print("  GET /dates/<YYYY-MM-DD>")
+            print("  GET /dates?from=<YYYY-MM-DD>&to=<YYYY-MM-DD>")
+            print("  GET /on-this-day[/<MM-DD>]")
+            print("  GET /health")
+            sys.exit(1)
+
+    try:
+        asyncio.run(serve(**options))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
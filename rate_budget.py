@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Host-wide Rate Budget
+A token bucket in a small SQLite database that every scraper process on the
+machine draws from before fetching a page, so a cron season scrape and a
+backfill running side by side stay within one politeness budget together.
+Waiting requests are served by priority class: interactive single-game
+scrapes first, then scheduled scrapes (season, sync), then backfills.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+# Lower numbers are served first
+PRIORITIES = {"interactive": 0, "scheduled": 1, "backfill": 2}
+
+DEFAULT_RATE = 1.0   # Requests per second for the whole host
+DEFAULT_BURST = 2.0
+POLL_INTERVAL = 0.25  # How often a queued request checks whether it's its turn
+WAITER_TIMEOUT = 10.0  # A waiter not seen for this long belonged to a dead process
+METRICS_RETENTION = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host    TEXT PRIMARY KEY,
+    tokens  REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS waiters (
+    ticket   INTEGER PRIMARY KEY AUTOINCREMENT,
+    host     TEXT    NOT NULL,
+    priority INTEGER NOT NULL,
+    pid      INTEGER NOT NULL,
+    seen     REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS requests (
+    at       REAL    NOT NULL,
+    host     TEXT    NOT NULL,
+    priority TEXT    NOT NULL,
+    pid      INTEGER NOT NULL,
+    waited   REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_at ON requests (at);
+"""
+
+
+def default_db_path() -> str:
+    return os.getenv('J_ARCHIVE_RATE_DB') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'jarchive', 'rate_budget.sqlite')
+
+
+def configured_rate() -> float:
+    """Requests per second from J_ARCHIVE_RATE (0 turns the shared budget off)"""
+    try:
+        return float(os.getenv('J_ARCHIVE_RATE', DEFAULT_RATE))
+    except ValueError:
+        return DEFAULT_RATE
+
+
+class RateBudget:
+    """
+    Token bucket per remote host, shared through SQLite by every process
+
+    Each request takes a ticket in the waiters table; only the first ticket
+    in (priority, ticket) order may take a token, so a backfill that has
+    been waiting still yields to an interactive scrape that just arrived.
+    """
+
+    def __init__(self, path: Optional[str] = None, rate: Optional[float] = None,
+                 burst: Optional[float] = None):
+        self.path = path or default_db_path()
+        self.rate = configured_rate() if rate is None else rate
+        self.burst = burst or max(DEFAULT_BURST, self.rate)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def acquire(self, host: str, priority: str = "backfill") -> float:
+        """
+        Block until this process may send one request to host
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        rank = PRIORITIES[priority]
+        start = time.time()
+        pid = os.getpid()
+        ticket = self.db.execute(
+            "INSERT INTO waiters (host, priority, pid, seen) VALUES (?, ?, ?, ?)",
+            (host, rank, pid, start)).lastrowid
+        try:
+            while True:
+                wait = self._try_take(host, ticket, priority, pid, start)
+                if wait is None:
+                    return time.time() - start
+                time.sleep(wait)
+        except BaseException:
+            self.db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+            raise
+
+    def _try_take(self, host: str, ticket: int, priority: str, pid: int, start: float) -> Optional[float]:
+        """One attempt at taking a token; returns None on success, else how long to sleep"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            self.db.execute("DELETE FROM waiters WHERE seen < ?", (now - WAITER_TIMEOUT,))
+            if self.db.execute("UPDATE waiters SET seen = ? WHERE ticket = ?", (now, ticket)).rowcount == 0:
+                # Purged as stale (e.g. the process was suspended): rejoin at the same place in line
+                self.db.execute("INSERT INTO waiters (ticket, host, priority, pid, seen) VALUES (?, ?, ?, ?, ?)",
+                                (ticket, host, PRIORITIES[priority], pid, now))
+            head = self.db.execute(
+                "SELECT ticket FROM waiters WHERE host = ? ORDER BY priority, ticket LIMIT 1", (host,)).fetchone()
+
+            row = self.db.execute("SELECT tokens, updated FROM buckets WHERE host = ?", (host,)).fetchone()
+            tokens, updated = row if row else (self.burst, now)
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+
+            if head and head[0] == ticket and tokens >= 1:
+                tokens -= 1
+                self.db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+                self.db.execute("INSERT INTO requests (at, host, priority, pid, waited) VALUES (?, ?, ?, ?, ?)",
+                                (now, host, priority, pid, now - start))
+                if ticket % 100 == 0:
+                    self.db.execute("DELETE FROM requests WHERE at < ?", (now - METRICS_RETENTION,))
+                wait = None
+            elif head and head[0] == ticket:
+                # Wake up well within WAITER_TIMEOUT so the ticket stays fresh at low rates
+                wait = min((1 - tokens) / self.rate, WAITER_TIMEOUT / 2)
+            else:
+                wait = min(POLL_INTERVAL, 1 / self.rate)
+            self.db.execute("INSERT OR REPLACE INTO buckets (host, tokens, updated) VALUES (?, ?, ?)",
+                            (host, tokens, now))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return wait
+
+    def metrics(self, window: float = 60.0) -> Dict:
+        """
+        Aggregate request rates over the last window seconds, across all processes
+
+        Returns:
+            {"window", "requests", "per_second", "processes",
+             "by_priority": {name: {"requests", "per_second", "avg_wait", "max_wait"}},
+             "by_host": {host: requests}, "waiting": {name: count}}
+        """
+        since = time.time() - window
+        by_priority = {}
+        for priority, count, avg_wait, max_wait in self.db.execute(
+                "SELECT priority, COUNT(*), AVG(waited), MAX(waited) FROM requests WHERE at >= ? "
+                "GROUP BY priority", (since,)):
+            by_priority[priority] = {"requests": count, "per_second": round(count / window, 3),
+                                     "avg_wait": round(avg_wait, 3), "max_wait": round(max_wait, 3)}
+        by_host = dict(self.db.execute(
+            "SELECT host, COUNT(*) FROM requests WHERE at >= ? GROUP BY host", (since,)).fetchall())
+        processes = self.db.execute(
+            "SELECT COUNT(DISTINCT pid) FROM requests WHERE at >= ?", (since,)).fetchone()[0]
+        names = {rank: name for name, rank in PRIORITIES.items()}
+        waiting = {names.get(rank, str(rank)): count for rank, count in self.db.execute(
+            "SELECT priority, COUNT(*) FROM waiters WHERE seen >= ? GROUP BY priority",
+            (time.time() - WAITER_TIMEOUT,))}
+        total = sum(p["requests"] for p in by_priority.values())
+        return {"window": window, "requests": total, "per_second": round(total / window, 3),
+                "processes": processes, "by_priority": by_priority, "by_host": by_host, "waiting": waiting}
+
+
+_local = threading.local()
+_budget_broken = False
+
+
+def wait_for_turn(url: str, priority: str = "backfill") -> float:
+    """
+    Wait for the host-wide budget before fetching url
+
+    Returns seconds waited. If the budget database can't be used, warns once
+    and lets requests through rather than stopping the scrape.
+    """
+    global _budget_broken
+    if _budget_broken or configured_rate() <= 0:
+        return 0.0
+    try:
+        # SQLite connections can't be shared across threads and don't survive
+        # a fork, so each thread of each process opens its own
+        if getattr(_local, 'pid', None) != os.getpid():
+            _local.budget, _local.pid = RateBudget(), os.getpid()
+        return _local.budget.acquire(urlparse(url).netloc or url, priority)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: shared rate budget unavailable, continuing without it: {e}")
+        _budget_broken = True
+        return 0.0
+
+
+def print_metrics(budget: RateBudget):
+    state = f"{budget.rate:g} requests/s, burst {budget.burst:g}" if budget.rate > 0 else "off"
+    print(f"Rate budget {budget.path} ({state})")
+    for window in (60.0, 300.0, 3600.0):
+        m = budget.metrics(window)
+        print(f"\nLast {int(window // 60)} min: {m['requests']} requests, {m['per_second']}/s "
+              f"from {m['processes']} process(es)")
+        for priority in PRIORITIES:
+            p = m["by_priority"].get(priority)
+            if p:
+                print(f"  {priority:<12} {p['requests']:>6} requests  {p['per_second']:>7}/s  "
+                      f"wait avg {p['avg_wait']}s, max {p['max_wait']}s")
+        for host, count in sorted(m["by_host"].items()):
+            print(f"  {host}: {count}")
+    waiting = budget.metrics(60.0)["waiting"]
+    print(f"\nWaiting now: {waiting or 'none'}")
+
+
+def main():
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] != 'status'):
+        print("Host-wide Rate Budget")
+        print("\nUsage:")
+        print("  python rate_budget.py [status]")
+        print("\nEnvironment:")
+        print(f"  J_ARCHIVE_RATE     Requests per second for all scrapers on this machine (default {DEFAULT_RATE:g}, 0 = off)")
+        print("  J_ARCHIVE_RATE_DB  Budget database (default ~/.cache/jarchive/rate_budget.sqlite)")
+        sys.exit(1)
+    print_metrics(RateBudget())
+
+
+if __name__ == "__main__":
+    main()
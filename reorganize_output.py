@@ -1,77 +1,263 @@
 #!/usr/bin/env python3
 """
 Reorganize existing JSON files into year/month subdirectories
+Scans the output directory root with os.scandir, reads only the first few
+kilobytes of each game to find its air date, and plans and moves files on a
+thread pool. Files that already exist at their destination are compared by
+content hash instead of being blindly renamed.
 """
 
+import hashlib
 import os
+import re
+import sys
 import json
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+from archive import INDEX_DIRNAME, is_compressed, is_game_file, load_game_data, read_game_bytes
 
-def reorganize_files(output_dir="output"):
-    """Reorganize flat JSON files into year/month subdirectories"""
-    
-    # Find all JSON files in the root of output directory
-    json_files = [f for f in os.listdir(output_dir) 
-                  if f.endswith('.json') and os.path.isfile(os.path.join(output_dir, f))]
-    
-    if not json_files:
-        print("No JSON files found in output directory root.")
+
+# Scraped games put game_id, episode_number, air_date and air_date_iso first,
+# so the air date is always within the first few hundred bytes
+HEAD_BYTES = 4096
+
+CONFLICTS_DIRNAME = "reorganize_conflicts"
+
+_ISO_DATE_RE = re.compile(rb'"air_date_iso"\s*:\s*"(\d{4})-(\d{2})-\d{2}"')
+_AIR_DATE_RE = re.compile(rb'"air_date"\s*:\s*"([^"\\]*)"')
+
+
+def default_workers() -> int:
+    # File I/O bound, so more threads than cores helps
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+def read_air_month(path: str) -> Optional[Tuple[str, str]]:
+    """
+    (YYYY, MM) of a game's air date, reading as little of the file as possible
+
+    Falls back to parsing the whole file when the date isn't in the leading
+    bytes (e.g. hand-edited files with a different key order).
+    """
+    with open(path, 'rb') as f:
+        head = f.read(HEAD_BYTES)
+        complete = len(head) < HEAD_BYTES
+    if is_compressed(head):
+        # Compressed games are small; decode the whole file and scan that
+        head = read_game_bytes(path)
+        complete = True
+
+    match = _ISO_DATE_RE.search(head)
+    if match:
+        return match.group(1).decode(), match.group(2).decode()
+
+    air_date = None
+    match = _AIR_DATE_RE.search(head)
+    if match:
+        air_date = match.group(1).decode('utf-8')
+    elif not complete:
+        data = load_game_data(path)
+        if data.get('air_date_iso'):
+            return data['air_date_iso'][:4], data['air_date_iso'][5:7]
+        air_date = data.get('air_date')
+
+    if not air_date:
+        return None
+    parsed = datetime.strptime(air_date, "%A, %B %d, %Y")
+    return f"{parsed.year:04d}", f"{parsed.month:02d}"
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def same_content(path_a: str, path_b: str) -> bool:
+    """Compare two files by size, then by content hash"""
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    return file_digest(path_a) == file_digest(path_b)
+
+
+def plan_file(output_dir: str, entry: os.DirEntry) -> Dict:
+    """
+    Decide what to do with one root-level game file
+
+    Actions:
+        move       - move to YYYY/MM/
+        duplicate  - an identical copy is already at the destination; remove this one
+        conflict   - a different file is at the destination; the newer one is
+                     kept there and the other goes to the conflicts folder
+        skip       - no usable air date (or unreadable)
+    """
+    try:
+        month = read_air_month(entry.path)
+    except (OSError, ValueError) as e:
+        return {"file": entry.name, "action": "skip", "reason": f"error: {e}"}
+    if month is None:
+        return {"file": entry.name, "action": "skip", "reason": "no air_date found"}
+
+    year, month = month
+    dest = os.path.join(year, month, entry.name)
+    dest_path = os.path.join(output_dir, dest)
+    if not os.path.exists(dest_path):
+        return {"file": entry.name, "action": "move", "dest": dest}
+
+    if same_content(entry.path, dest_path):
+        return {"file": entry.name, "action": "duplicate", "dest": dest}
+
+    keep = "source" if entry.stat().st_mtime_ns > os.stat(dest_path).st_mtime_ns else "existing"
+    conflict = os.path.join(INDEX_DIRNAME, CONFLICTS_DIRNAME, year, month, entry.name)
+    return {"file": entry.name, "action": "conflict", "dest": dest, "keep": keep, "conflict_path": conflict}
+
+
+def build_plan(output_dir: str = "output", workers: Optional[int] = None) -> List[Dict]:
+    """Plan the reorganization of every game file (any format) in the output directory root"""
+    with os.scandir(output_dir) as it:
+        entries = [e for e in it if is_game_file(e.name) and e.is_file()]
+    entries.sort(key=lambda e: e.name)
+
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as executor:
+        return list(executor.map(lambda e: plan_file(output_dir, e), entries))
+
+
+def apply_step(output_dir: str, step: Dict):
+    src = os.path.join(output_dir, step["file"])
+    action = step["action"]
+    if action == "skip":
         return
-    
-    print(f"Found {len(json_files)} files to reorganize...")
-    moved = 0
-    skipped = 0
-    
-    for filename in json_files:
-        old_path = os.path.join(output_dir, filename)
-        
+    if action == "duplicate":
+        os.remove(src)
+        return
+
+    dest = os.path.join(output_dir, step["dest"])
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if action == "conflict":
+        conflict = os.path.join(output_dir, step["conflict_path"])
+        os.makedirs(os.path.dirname(conflict), exist_ok=True)
+        if step["keep"] == "source":
+            os.replace(dest, conflict)
+            os.replace(src, dest)
+        else:
+            os.replace(src, conflict)
+        return
+    os.replace(src, dest)
+
+
+def apply_plan(output_dir: str, plan: List[Dict], workers: Optional[int] = None) -> List[Tuple[Dict, Exception]]:
+    """Carry out a plan on a thread pool; returns (step, error) for failed steps"""
+    errors = []
+
+    def run(step):
         try:
-            # Read the JSON file to get the air_date
-            with open(old_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            air_date = data.get('air_date')
-            if not air_date:
-                print(f"  ⚠ Skipping {filename} - no air_date found")
-                skipped += 1
-                continue
-            
-            # Parse the date
-            date_obj = datetime.strptime(air_date, "%A, %B %d, %Y")
-            year = str(date_obj.year)
-            month = f"{date_obj.month:02d}"
-            
-            # Create new directory structure
-            new_dir = os.path.join(output_dir, year, month)
-            os.makedirs(new_dir, exist_ok=True)
-            
-            # Move the file
-            new_path = os.path.join(new_dir, filename)
-            
-            if os.path.exists(new_path):
-                # File already exists - compare and keep newer or delete duplicate
-                shutil.move(old_path, new_path.replace('.json', '_dup.json'))
-                print(f"  ⚠ Duplicate {filename} - saved as *_dup.json in {year}/{month}/")
-                moved += 1
-            else:
-                shutil.move(old_path, new_path)
-                print(f"  ✓ Moved {filename} → {year}/{month}/")
-                moved += 1
-                
-        except (ValueError, json.JSONDecodeError, KeyError) as e:
-            print(f"  ✗ Error processing {filename}: {e}")
-            skipped += 1
-    
+            apply_step(output_dir, step)
+        except OSError as e:
+            errors.append((step, e))
+
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as executor:
+        list(executor.map(run, plan))
+    return errors
+
+
+def describe_step(step: Dict) -> str:
+    action = step["action"]
+    if action == "move":
+        return f"move      {step['file']} → {step['dest']}"
+    if action == "duplicate":
+        return f"duplicate {step['file']} (identical to {step['dest']}, remove)"
+    if action == "conflict":
+        if step["keep"] == "source":
+            return f"conflict  {step['file']} → {step['dest']} (newer; existing → {step['conflict_path']})"
+        return f"conflict  {step['file']} → {step['conflict_path']} (older than {step['dest']})"
+    return f"skip      {step['file']} ({step['reason']})"
+
+
+def summarize(plan: List[Dict]) -> Dict[str, int]:
+    counts = {"move": 0, "duplicate": 0, "conflict": 0, "skip": 0}
+    for step in plan:
+        counts[step["action"]] += 1
+    return counts
+
+
+def reorganize_files(output_dir="output", dry_run=False, as_json=False, workers=None):
+    """Reorganize flat JSON files into year/month subdirectories"""
+    plan = build_plan(output_dir, workers)
+
+    if not plan:
+        if as_json:
+            print("[]")
+        else:
+            print("No JSON files found in output directory root.")
+        return plan
+
+    if dry_run:
+        if as_json:
+            print(json.dumps(plan, indent=2))
+            return plan
+        print(f"Plan for {len(plan)} files (dry run, nothing changed):")
+        for step in plan:
+            print(f"  {describe_step(step)}")
+    else:
+        print(f"Found {len(plan)} files to reorganize...")
+        errors = apply_plan(output_dir, plan, workers)
+        for step, e in errors:
+            print(f"  ✗ Error processing {step['file']}: {e}")
+        for step in plan:
+            if step["action"] in ("conflict", "skip"):
+                print(f"  ⚠ {describe_step(step)}")
+
+    counts = summarize(plan)
     print(f"\n{'='*60}")
-    print(f"Reorganization complete!")
-    print(f"✓ Moved: {moved} files")
-    if skipped > 0:
-        print(f"⚠ Skipped: {skipped} files")
+    print(f"Reorganization {'plan' if dry_run else 'complete'}!")
+    print(f"✓ Moved: {counts['move']} files")
+    if counts['duplicate']:
+        print(f"✓ Identical duplicates removed: {counts['duplicate']} files")
+    if counts['conflict']:
+        print(f"⚠ Conflicting copies (older kept in {INDEX_DIRNAME}/{CONFLICTS_DIRNAME}/): {counts['conflict']} files")
+    if counts['skip'] > 0:
+        print(f"⚠ Skipped: {counts['skip']} files")
     print(f"{'='*60}")
+    return plan
 
 
-if __name__ == "__main__":
-    reorganize_files()
+def main():
+    output_dir = "output"
+    dry_run = False
+    as_json = False
+    workers = None
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == '--dry-run':
+            dry_run = True
+            i += 1
+        elif arg == '--json':
+            as_json = True
+            i += 1
+        elif arg == '--workers' and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
+            i += 2
+        elif not arg.startswith('--'):
+            output_dir = arg
+            i += 1
+        else:
+            print("Reorganize Output")
+            print("\nUsage:")
+            print("  python reorganize_output.py [output_dir] [--dry-run [--json]] [--workers <n>]")
+            sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
 
+    reorganize_files(output_dir, dry_run, as_json and dry_run, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Freshness Revalidation
+Re-checks already-scraped games with conditional requests, on a schedule
+set by their age: J-Archive keeps correcting and filling in recent games
+for weeks after they air, so those are re-checked daily, and old games
+rarely. Only pages whose content changed are re-parsed, and a game file is
+only rewritten when the parsed game differs from it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from archive import get_index_dir, iter_game_clues, load_game_data, load_manifest
+
+
+STATE_FILENAME = "revalidate.sqlite"
+GAME_PATH = "/showgame.php?game_id={game_id}"
+
+# (aired less than N days ago, re-check every M days); older games use OLD_GAME_INTERVAL
+SCHEDULE = ((14, 1), (60, 3), (365, 30))
+OLD_GAME_INTERVAL = 180
+UNKNOWN_DATE_INTERVAL = 30
+JITTER = 0.1          # Spread games of the same age over +-10% of the interval
+RETRY_AFTER = 3600.0  # Seconds before re-checking a game whose check failed
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    game_id       INTEGER PRIMARY KEY,
+    path          TEXT    NOT NULL,
+    air_date      TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    body_sha      TEXT,
+    checked_at    REAL    NOT NULL,
+    next_check    REAL    NOT NULL,
+    checks        INTEGER NOT NULL DEFAULT 0,
+    changes       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pages_next_check ON pages(next_check);
+"""
+
+
+def check_interval_days(air_date: Optional[str], today: Optional[date] = None) -> int:
+    """Days between re-checks for a game that aired on air_date (YYYY-MM-DD)"""
+    if not air_date:
+        return UNKNOWN_DATE_INTERVAL
+    try:
+        age = ((today or date.today()) - date.fromisoformat(air_date)).days
+    except ValueError:
+        return UNKNOWN_DATE_INTERVAL
+    for max_age, days in SCHEDULE:
+        if age < max_age:
+            return days
+    return OLD_GAME_INTERVAL
+
+
+def next_check_at(game_id: int, air_date: Optional[str], checked_at: float) -> float:
+    """When to re-check a game, jittered per game so a day's archive doesn't come due at once"""
+    spread = int(hashlib.sha1(str(game_id).encode()).hexdigest()[:8], 16) / 0xffffffff
+    interval = check_interval_days(air_date) * 86400 * (1 + JITTER * (2 * spread - 1))
+    return checked_at + interval
+
+
+def carry_over_local_fields(old: Dict, new: Dict):
+    """Keep what was added to a game after scraping (downloaded media_files) in a re-parsed copy"""
+    files = {}
+    for _, _, clue in iter_game_clues(old):
+        if 'media_files' not in clue:
+            continue
+        # An all-null media_files still records that the game was linked, so keep it too
+        for url, f in zip(clue.get('media', []), clue['media_files']):
+            if f or url not in files:
+                files[url] = f
+    for _, _, clue in iter_game_clues(new):
+        media = clue.get('media', [])
+        if any(url in files for url in media):
+            clue['media_files'] = [files.get(url) for url in media]
+
+
+class RevalidationState:
+    """Validators, content hash and next check time per archived game, in SQLite under .jarchive/"""
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(get_index_dir(output_dir), STATE_FILENAME)
+        self.db = sqlite3.connect(self.path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def sync_with_archive(self) -> int:
+        """
+        Track every game in the manifest
+
+        A game seen for the first time counts as checked when its file was
+        written. Returns the number of games added.
+        """
+        manifest = load_manifest(self.output_dir)
+        known = {game_id: (path, air_date) for game_id, path, air_date
+                 in self.db.execute("SELECT game_id, path, air_date FROM pages")}
+        archived = set()
+        added = 0
+        with self.db:
+            for rel, entry in manifest.entries.items():
+                game_id = entry.get("game_id")
+                if game_id is None:
+                    continue
+                archived.add(game_id)
+                air_date = entry.get("air_date_iso")
+                if game_id not in known:
+                    written = (entry.get("mtime_ns") or time.time_ns()) / 1e9
+                    self.db.execute(
+                        "INSERT INTO pages (game_id, path, air_date, checked_at, next_check) VALUES (?, ?, ?, ?, ?)",
+                        (game_id, rel, air_date, written, next_check_at(game_id, air_date, written)))
+                    added += 1
+                elif known[game_id] != (rel, air_date):
+                    self.db.execute("UPDATE pages SET path = ?, air_date = ? WHERE game_id = ?",
+                                    (rel, air_date, game_id))
+            for game_id in set(known) - archived:
+                self.db.execute("DELETE FROM pages WHERE game_id = ?", (game_id,))
+        return added
+
+    def due(self, include_waiting: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """Games due for a check, most recently aired first"""
+        sql = "SELECT * FROM pages"
+        params = []
+        if not include_waiting:
+            sql += " WHERE next_check <= ?"
+            params.append(time.time())
+        sql += " ORDER BY air_date IS NULL, air_date DESC, game_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.db.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def record(self, game: Dict, changed: bool = False, failed: bool = False, **validators):
+        now = time.time()
+        next_check = now + RETRY_AFTER if failed else next_check_at(game["game_id"], game["air_date"], now)
+        with self.db:
+            self.db.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, body_sha = ?, checked_at = ?, next_check = ?, "
+                "checks = checks + 1, changes = changes + ? WHERE game_id = ?",
+                (validators.get("etag", game["etag"]), validators.get("last_modified", game["last_modified"]),
+                 validators.get("body_sha", game["body_sha"]), now, next_check, int(changed), game["game_id"]))
+
+    def summary(self) -> Dict:
+        now = time.time()
+        total, due_now, due_day, due_week, checks, changes = self.db.execute(
+            "SELECT COUNT(*), SUM(next_check <= ?), SUM(next_check <= ?), SUM(next_check <= ?), "
+            "COALESCE(SUM(checks), 0), COALESCE(SUM(changes), 0) FROM pages",
+            (now, now + 86400, now + 7 * 86400)).fetchone()
+        return {"games": total, "due_now": due_now or 0, "due_within_day": due_day or 0,
+                "due_within_week": due_week or 0, "checks": checks, "changes": changes}
+
+
+def revalidate_game(game: Dict, state: RevalidationState, output_dir: str) -> str:
+    """
+    Re-check one game
+
+    Returns:
+        "not_modified" (304), "unchanged" (same content), "reparsed" (page
+        changed, game didn't), "updated" (game rewritten) or "failed"
+    """
+    import requests
+    from scraper import JeopardyScraper, get_base_url
+    from sync import conditional_get
+
+    game_id = game["game_id"]
+    try:
+        page = conditional_get(get_base_url() + GAME_PATH.format(game_id=game_id),
+                               game["etag"], game["last_modified"])
+    except requests.RequestException as e:
+        print(f"  ✗ Game {game_id}: {e}")
+        state.record(game, failed=True)
+        return "failed"
+
+    validators = {"etag": page["etag"], "last_modified": page["last_modified"]}
+    if page["status"] == 304:
+        state.record(game, **validators)
+        return "not_modified"
+    body_sha = hashlib.sha256(page["content"]).hexdigest()
+    validators["body_sha"] = body_sha
+    if body_sha == game["body_sha"]:
+        state.record(game, **validators)
+        return "unchanged"
+
+    scraper = JeopardyScraper(game_id, priority="scheduled")
+    if not scraper.load_page(page["content"], page["status"]):
+        scraper.release()
+        # Keep the archived copy; J-Archive may just be having a bad moment
+        state.record(game, failed=True)
+        return "failed"
+    data = scraper.extract()
+
+    path = os.path.join(output_dir, game["path"])
+    try:
+        old = load_game_data(path)
+    except (OSError, ValueError):
+        old = {}
+    carry_over_local_fields(old, data)
+    if data == old:
+        state.record(game, **validators)
+        # A first check has nothing to compare the page with; the game matching is what counts
+        return "reparsed" if game["body_sha"] else "unchanged"
+
+    filename = scraper.save_to_json(data, output_dir=output_dir)
+    if os.path.abspath(filename) != os.path.abspath(path) and os.path.exists(path):
+        os.remove(path)  # The air date moved the game to another month folder
+    print(f"  ✓ Game {game_id} changed, saved to {filename}")
+    state.record(game, changed=True, **validators)
+    return "updated"
+
+
+def revalidate(output_dir: str = "output", limit: Optional[int] = None, delay: float = 1.0,
+               include_waiting: bool = False) -> Dict[str, int]:
+    """
+    One revalidation sweep over the games that are due
+
+    Returns:
+        Counts per outcome (see revalidate_game) and "checked"
+    """
+    state = RevalidationState(output_dir)
+    try:
+        state.sync_with_archive()
+        games = state.due(include_waiting, limit)
+        counts = {"checked": 0, "not_modified": 0, "unchanged": 0, "reparsed": 0, "updated": 0, "failed": 0}
+        print(f"{len(games)} games due for a freshness check")
+        for i, game in enumerate(games):
+            outcome = revalidate_game(game, state, output_dir)
+            counts["checked"] += 1
+            counts[outcome] += 1
+            if (i + 1) % 100 == 0:
+                print(f"  [{i + 1}/{len(games)}] {counts['reparsed'] + counts['updated']} pages changed so far")
+            if i < len(games) - 1:
+                time.sleep(delay)
+        return counts
+    finally:
+        state.close()
+
+
+def main():
+    args = sys.argv[1:]
+    command = args.pop(0) if args and not args[0].startswith('--') else "sweep"
+    output_dir = "output"
+    limit = None
+    delay = 1.0
+    include_waiting = False
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--output-dir', '--limit', '--delay') and i + 1 < len(args):
+            if arg == '--output-dir':
+                output_dir = args[i + 1]
+            elif arg == '--limit':
+                limit = int(args[i + 1])
+            else:
+                delay = float(args[i + 1])
+            i += 2
+        elif arg == '--now':
+            include_waiting = True
+            i += 1
+        else:
+            command = None
+            break
+
+    if command not in ("sweep", "status"):
+        print("Freshness Revalidation")
+        print("\nUsage:")
+        print("  python revalidate.py [sweep] [--limit <n>] [--delay <seconds>] [--now] [--output-dir <dir>]")
+        print("  python revalidate.py status [--output-dir <dir>]")
+        print("\nGames are re-checked with conditional requests: daily for their first two weeks,")
+        print(f"every 3 days up to two months, monthly up to a year, then every {OLD_GAME_INTERVAL} days.")
+        print("--now checks every game regardless of the schedule, most recent first.")
+        sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    if command == "status":
+        state = RevalidationState(output_dir)
+        state.sync_with_archive()
+        s = state.summary()
+        state.close()
+        print(f"{s['games']} games tracked: {s['due_now']} due now, {s['due_within_day']} within a day, "
+              f"{s['due_within_week']} within a week")
+        print(f"{s['checks']} checks so far found {s['changes']} changed games")
+        return
+
+    started = datetime.now()
+    counts = revalidate(output_dir, limit, delay, include_waiting)
+    print(f"\n{'='*60}")
+    print(f"Revalidation sweep: {counts['checked']} games checked in {datetime.now() - started}")
+    print(f"  Not modified (304):         {counts['not_modified']}")
+    print(f"  Same content:               {counts['unchanged']}")
+    print(f"  Page changed, game didn't:  {counts['reparsed']}")
+    print(f"  ✓ Game changed, rewritten:  {counts['updated']}")
+    if counts["failed"]:
+        print(f"  ✗ Failed (retried in {int(RETRY_AFTER // 60)} min): {counts['failed']}")
+    print(f"Pages changed: {counts['reparsed'] + counts['updated']}")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Weighted and Stratified Question Sampling
+Precomputes Walker alias tables per stratum (round, value tier, decade) from
+the clue table, so a balanced set of questions - e.g. one easy, one medium and
+one Double Jeopardy! clue - can be drawn in constant time per question
+"""
+
+import os
+import pickle
+import random
+import sys
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from archive import get_index_dir, load_game_data, make_clue_id, split_clue_id
+from clue_table import ROUND_NAMES, ROUNDS, ClueTable, load_clue_table
+
+
+CACHE_FILENAME = "sampling.pickle"
+CACHE_VERSION = 1
+
+# Value tiers by board row, so they mean the same thing before and after the
+# 2001 value doubling (and for Daily Doubles, whose value is the wager)
+TIERS = ("easy", "medium", "hard")
+TIER_BY_ROW = (0, 0, 1, 2, 2)
+
+ROUND_TOKENS = {"jeopardy": 0, "double": 1}
+
+DEFAULT_PLAN = "jeopardy+easy,jeopardy+medium,double"
+
+# (round, tier, decade) - decade is 0 when the air date is unknown
+StratumKey = Tuple[int, int, int]
+
+
+def value_tier(row: int) -> int:
+    """Value tier index for a board row (0 = top row)"""
+    return TIER_BY_ROW[row] if 0 <= row < len(TIER_BY_ROW) else TIERS.index("hard")
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per weighted draw
+
+    Each slot i keeps its own probability prob[i] and an alias; a draw picks
+    a slot uniformly and then keeps it or takes its alias.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("alias table needs at least one positive weight")
+
+        self.prob = array('d', [1.0]) * n
+        self.alias = array('l', range(n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: random.Random) -> int:
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class SamplingWeights:
+    """
+    Per-clue weight = era[decade] * value[tier] * (daily_double if DD else 1)
+
+    Missing entries default to 1.0. Parsed from strings like
+    "daily_double=2,era.1980=0.5,value.hard=1.5".
+    """
+
+    def __init__(self, era: Optional[Dict[int, float]] = None, value: Optional[Dict[str, float]] = None,
+                 daily_double: float = 1.0):
+        self.era = dict(era or {})
+        self.value = dict(value or {})
+        self.daily_double = daily_double
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> 'SamplingWeights':
+        weights = cls()
+        for item in (spec or "").split(','):
+            item = item.strip()
+            if not item:
+                continue
+            name, _, number = item.partition('=')
+            name = name.strip().lower()
+            try:
+                amount = float(number)
+            except ValueError:
+                raise ValueError(f"Invalid sampling weight '{item}'")
+            if name == "daily_double":
+                weights.daily_double = amount
+            elif name.startswith("era."):
+                weights.era[int(name[4:].rstrip('s'))] = amount
+            elif name.startswith("value.") and name[6:] in TIERS:
+                weights.value[name[6:]] = amount
+            else:
+                raise ValueError(f"Unknown sampling weight '{name}'")
+        return weights
+
+    def key(self) -> Tuple:
+        return (tuple(sorted(self.era.items())), tuple(sorted(self.value.items())), self.daily_double)
+
+    def weight(self, decade: int, tier: int, daily_double: bool) -> float:
+        w = self.era.get(decade, 1.0) * self.value.get(TIERS[tier], 1.0)
+        return w * self.daily_double if daily_double else w
+
+
+def parse_plan(spec: str) -> List[Dict[str, int]]:
+    """
+    Parse a question plan into one stratum filter per question
+
+    Slots are comma separated; each slot joins round (jeopardy, double),
+    tier (easy, medium, hard) and decade (e.g. 1990s) tokens with '+'.
+    Example: "jeopardy+easy,jeopardy+medium,double"
+    """
+    plan = []
+    for slot in spec.split(','):
+        slot = slot.strip().lower()
+        if not slot:
+            continue
+        spec_filter = {}
+        if slot != "any":
+            for token in slot.split('+'):
+                token = token.strip()
+                if token in ROUND_TOKENS:
+                    spec_filter["round"] = ROUND_TOKENS[token]
+                elif token in TIERS:
+                    spec_filter["tier"] = TIERS.index(token)
+                elif token.rstrip('s').isdigit():
+                    spec_filter["decade"] = int(token.rstrip('s')) // 10 * 10
+                else:
+                    raise ValueError(f"Unknown plan token '{token}' in '{slot}'")
+        plan.append(spec_filter)
+    return plan
+
+
+class StratifiedSampler:
+    """Alias tables for every (round, tier, decade) stratum of the archive"""
+
+    def __init__(self, table: ClueTable, weights: Optional[SamplingWeights] = None):
+        self.digest = table.digest
+        self.weights = weights or SamplingWeights()
+        self.files = list(table.files)
+        self.file_of_game = dict(zip(table.games["game_id"], table.games["file"]))
+        self.total_games = len(self.file_of_game)
+
+        members: Dict[StratumKey, Tuple[array, array, List[float]]] = {}
+        columns = table.clues
+        rows = zip(columns["game_id"], columns["round"], columns["position"], columns["row"],
+                   columns["daily_double"], columns["valid"], columns["category"], columns["year"])
+        for game_id, round_code, position, row, daily_double, valid, category, year in rows:
+            if not valid:
+                continue
+            tier = value_tier(row)
+            decade = year // 10 * 10
+            w = self.weights.weight(decade, tier, daily_double)
+            if w <= 0:
+                continue
+            key = (round_code, tier, decade)
+            entry = members.get(key)
+            if entry is None:
+                entry = members[key] = (array('q'), array('l'), [])
+            entry[0].append(make_clue_id(game_id, round_code, position))
+            entry[1].append(category)
+            entry[2].append(w)
+
+        # stratum -> (clue ids, category codes, alias table, total weight)
+        self.strata = {
+            key: (clue_ids, categories, AliasTable(ws), sum(ws))
+            for key, (clue_ids, categories, ws) in members.items()
+        }
+        self.total_clues = sum(len(s[0]) for s in self.strata.values())
+        self._slot_tables = {}
+
+    def matching_strata(self, spec_filter: Dict[str, int]) -> List[StratumKey]:
+        return sorted(
+            key for key in self.strata
+            if spec_filter.get("round", key[0]) == key[0]
+            and spec_filter.get("tier", key[1]) == key[1]
+            and spec_filter.get("decade", key[2]) == key[2]
+        )
+
+    def _slot_table(self, spec_filter: Dict[str, int]):
+        """Alias table over the strata a plan slot matches, weighted by their totals"""
+        cache_key = tuple(sorted(spec_filter.items()))
+        slot = self._slot_tables.get(cache_key)
+        if slot is None:
+            keys = self.matching_strata(spec_filter)
+            if not keys:
+                raise ValueError(f"No clues match plan slot {spec_filter}")
+            slot = self._slot_tables[cache_key] = (keys, AliasTable([self.strata[k][3] for k in keys]))
+        return slot
+
+    def draw(self, spec_filter: Dict[str, int], rng: random.Random) -> Tuple[int, int]:
+        """One weighted (clue id, category code) draw for a plan slot"""
+        keys, slot_table = self._slot_table(spec_filter)
+        clue_ids, categories, alias, _ = self.strata[keys[slot_table.draw(rng)]]
+        i = alias.draw(rng)
+        return clue_ids[i], categories[i]
+
+    def sample(self, output_dir: str, plan: Sequence[Dict[str, int]], history=None,
+               exclude_ids=frozenset(), recipient: Optional[str] = None,
+               make_question: Optional[Callable] = None, rng: Optional[random.Random] = None,
+               max_draws: int = 200) -> List[Dict]:
+        """
+        Draw one question per plan slot
+
+        Questions come from different games and different categories. Clues
+        in exclude_ids or already sent (per the SentHistory) are redrawn.
+        """
+        rng = rng or random.Random()
+        if history is not None and history.rotate_if_needed(self.total_clues, self.total_games):
+            print("♻️  Most of the archive has been sent - starting a new rotation")
+
+        questions = []
+        chosen_games = set()
+        chosen_categories = set()
+        for spec_filter in plan:
+            for _ in range(max_draws):
+                clue_id, category = self.draw(spec_filter, rng)
+                game_id, round_code, position = split_clue_id(clue_id)
+                if game_id in chosen_games or clue_id in exclude_ids:
+                    continue
+                if category >= 0 and category in chosen_categories:
+                    continue
+                if history is not None and history.is_sent(clue_id, game_id, recipient):
+                    continue
+
+                path = os.path.join(output_dir, self.files[self.file_of_game[game_id]])
+                try:
+                    game_data = load_game_data(path)
+                    clue = game_data[ROUNDS[round_code]]['clues'][position]
+                except (OSError, ValueError, KeyError, IndexError) as e:
+                    print(f"Error processing {path}: {e}")
+                    continue
+
+                clue = {**clue, 'round': ROUND_NAMES[round_code]}
+                question = make_question(game_data, clue) if make_question else {'game_id': game_id, **clue}
+                question['clue_id'] = clue_id
+                questions.append(question)
+                chosen_games.add(game_id)
+                chosen_categories.add(category)
+                break
+
+        return questions
+
+
+def load_sampler(output_dir: str = "output", weights: Optional[SamplingWeights] = None) -> StratifiedSampler:
+    """
+    Load the alias tables for an output directory
+
+    Cached under the index directory keyed by the clue table digest and the
+    weights, so they are only rebuilt when the archive or weights change.
+    """
+    weights = weights or SamplingWeights()
+    table = load_clue_table(output_dir)
+    cache_path = os.path.join(get_index_dir(output_dir), CACHE_FILENAME)
+    cache_key = (CACHE_VERSION, table.digest, weights.key())
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get("key") == cache_key:
+            return cached["sampler"]
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+
+    sampler = StratifiedSampler(table, weights)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({"key": cache_key, "sampler": sampler}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return sampler
+
+
+def main():
+    output_dir = "output"
+    plan_spec = DEFAULT_PLAN
+    weights_spec = None
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--output-dir' and i + 1 < len(sys.argv):
+            output_dir = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--plan' and i + 1 < len(sys.argv):
+            plan_spec = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--weights' and i + 1 < len(sys.argv):
+            weights_spec = sys.argv[i + 1]
+            i += 2
+        else:
+            print("Stratified Question Sampling")
+            print("\nUsage:")
+            print("  python sampling.py [--output-dir <dir>] [--plan <plan>] [--weights <weights>]")
+            print("\nExample:")
+            print(f"  python sampling.py --plan {DEFAULT_PLAN} --weights daily_double=2,era.1980=0.5")
+            sys.exit(1)
+
+    sampler = load_sampler(output_dir, SamplingWeights.parse(weights_spec))
+    print(f"{sampler.total_clues} clues in {len(sampler.strata)} strata")
+    for round_code, tier, decade in sorted(sampler.strata):
+        clue_ids = sampler.strata[(round_code, tier, decade)][0]
+        era = f"{decade}s" if decade else "unknown"
+        print(f"  {ROUND_NAMES[round_code]:<17} {TIERS[tier]:<7} {era:<8} {len(clue_ids):>8}")
+
+    print(f"\nSample for plan '{plan_spec}':")
+    for q in sampler.sample(output_dir, parse_plan(plan_spec)):
+        print(f"  {q['round']:<17} {q.get('value') or '':>7}  {q.get('category')}: {q.get('clue')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,40 +4,78 @@ Jeopardy J-Archive Scraper
 Scrapes episode data including questions, answers, categories, and contestants
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
 import re
 import sys
 import os
-from datetime import datetime
 from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from archive import (GAME_FORMATS, configured_format, game_file_stem, iso_air_date, record_saved_game,
+                     write_game_file)
+from rate_budget import wait_for_turn
+
+
+DEFAULT_BASE_URL = "https://j-archive.com"
+REQUEST_TIMEOUT = 30.0  # Seconds to connect, and between bytes of the response
+
+# Links in clue text to these are picture, audio and video clues
+MEDIA_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.mp3', '.wav', '.mp4', '.mov', '.wmv', '.m4v')
+
+
+def get_request_timeout() -> float:
+    try:
+        return float(os.getenv('J_ARCHIVE_TIMEOUT', REQUEST_TIMEOUT))
+    except ValueError:
+        return REQUEST_TIMEOUT
+
+
+def get_base_url() -> str:
+    """J-Archive base URL; J_ARCHIVE_URL points the scrapers at a mirror or a local stand-in"""
+    return (os.getenv('J_ARCHIVE_URL') or DEFAULT_BASE_URL).rstrip('/')
 
 
 class JeopardyScraper:
-    def __init__(self, game_id: int):
+    def __init__(self, game_id: int, base_url: Optional[str] = None, priority: str = "interactive"):
         self.game_id = game_id
-        self.url = f"https://j-archive.com/showgame.php?game_id={game_id}"
+        self.priority = priority  # Class in the host-wide rate budget (see rate_budget.py)
+        self.url = f"{(base_url or get_base_url()).rstrip('/')}/showgame.php?game_id={game_id}"
         self.soup = None
+        # Why the last fetch_page failed: {"reason", "status", "detail"} (see failure_queue.py)
+        self.failure = None
         
     def fetch_page(self) -> bool:
         """Fetch the page content"""
+        # Imported here so commands that never fetch don't pay for them
+        import requests
+        
+        wait_for_turn(self.url, self.priority)
         try:
-            response = requests.get(self.url)
+            # Without a timeout a stalled connection would hang the scrape forever
+            response = requests.get(self.url, timeout=get_request_timeout())
             response.raise_for_status()
-            self.soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Check for error messages
-            body_text = self.soup.get_text()
-            if 'ERROR:' in body_text or 'No game' in body_text:
-                error_msg = body_text[body_text.find('ERROR:'):body_text.find('ERROR:') + 100].strip()
-                print(f"Error from J-Archive: {error_msg}")
-                return False
-            
-            return True
+            return self.load_page(response.content, response.status_code)
         except requests.RequestException as e:
             print(f"Error fetching page: {e}")
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            self.failure = {"reason": "http_status" if status else "network", "status": status,
+                            "detail": f"{type(e).__name__}: {e}"}
+            return False
+    
+    def load_page(self, content: bytes, status: int = 200) -> bool:
+        """Parse already-fetched page content; False for J-Archive's error page"""
+        from bs4 import BeautifulSoup
+        
+        self.soup = BeautifulSoup(content, 'html.parser')
+        
+        # Check for error messages
+        body_text = self.soup.get_text()
+        if 'ERROR:' in body_text or 'No game' in body_text:
+            error_msg = body_text[body_text.find('ERROR:'):body_text.find('ERROR:') + 100].strip()
+            print(f"Error from J-Archive: {error_msg}")
+            self.failure = {"reason": "jarchive_error", "status": status, "detail": error_msg}
             return False
+        
+        return True
     
     def extract_episode_info(self) -> Dict:
         """Extract episode number and date"""
@@ -74,6 +112,7 @@ class JeopardyScraper:
         # Try to find from page title as fallback
         title = self.soup.find('title')
         if title:
+            from datetime import datetime
             title_text = title.text.strip()
             
             # Pattern: "Show #9416 - Monday, October 20, 2025"
@@ -85,7 +124,6 @@ class JeopardyScraper:
                 if date_match:
                     # Convert YYYY-MM-DD to readable format
                     try:
-                        from datetime import datetime
                         date_obj = datetime.strptime(date_match.group(1), "%Y-%m-%d")
                         air_date = date_obj.strftime("%A, %B %d, %Y")
                         return {
@@ -139,14 +177,28 @@ class JeopardyScraper:
                 winnings_match = re.search(r'\$[\d,]+', text)
                 previous_winnings = winnings_match.group(0) if winnings_match else None
                 
+                # J-Archive's player id, stable across all of a player's games
+                id_match = re.search(r'player_id=(\d+)', link.get('href', ''))
+                
                 contestants.append({
                     "name": name,
                     "description": description,
-                    "previous_winnings": previous_winnings
+                    "previous_winnings": previous_winnings,
+                    "player_id": int(id_match.group(1)) if id_match else None
                 })
         
         return contestants
     
+    def extract_media(self, clue_text_elem) -> List[str]:
+        """Absolute URLs of the images, audio and video linked from a clue's text"""
+        urls = []
+        for link in clue_text_elem.find_all('a', href=True):
+            url = urljoin(self.url, link['href'])
+            path = urlparse(url).path.lower()
+            if (path.endswith(MEDIA_EXTENSIONS) or '/media/' in path) and url not in urls:
+                urls.append(url)
+        return urls
+    
     def extract_clue(self, clue_elem) -> Optional[Dict]:
         """Extract a single clue (question and answer)"""
         if not clue_elem:
@@ -193,12 +245,17 @@ class JeopardyScraper:
         # Check for Daily Double
         is_daily_double = 'DD:' in str(clue_value) if clue_value else False
         
-        return {
+        clue = {
             "value": value,
             "clue": clue_text,
             "answer": answer,
             "daily_double": is_daily_double
         }
+        # Only media clues get the key, so plain clues stay the same size
+        media = self.extract_media(clue_text_elem)
+        if media:
+            clue["media"] = media
+        return clue
     
     def extract_round(self, round_id: str) -> Dict:
         """Extract all clues from a round (jeopardy or double_jeopardy)"""
@@ -218,6 +275,7 @@ class JeopardyScraper:
         # Extract clues
         clues = []
         clue_rows = round_div.find_all('tr')
+        board_row = 0
         
         for row in clue_rows:
             clue_cells = row.find_all('td', class_='clue')
@@ -228,8 +286,12 @@ class JeopardyScraper:
                     if clue_data and i < len(categories):
                         clue_data['category'] = categories[i]
                         clue_data['category_index'] = i
+                    if clue_data:
+                        # Board row (0 = top), kept even when other clues in it were never revealed
+                        clue_data['row'] = board_row
                     row_clues.append(clue_data)
                 clues.extend([c for c in row_clues if c])
+                board_row += 1
         
         return {
             "categories": categories,
@@ -252,10 +314,12 @@ class JeopardyScraper:
         clue_text_elem = final_div.find('td', id='clue_FJ')
         clue = None
         answer = None
+        media = []
         
         if clue_text_elem:
             # Get clue text from the visible td
             clue = clue_text_elem.get_text(strip=True)
+            media = self.extract_media(clue_text_elem)
             
             # Get answer from the hidden response td (clue_FJ_r)
             response_elem = final_div.find('td', id='clue_FJ_r')
@@ -264,11 +328,14 @@ class JeopardyScraper:
                 if correct_response:
                     answer = correct_response.get_text(strip=True)
         
-        return {
+        final = {
             "category": category,
             "clue": clue,
             "answer": answer
         }
+        if media:
+            final["media"] = media
+        return final
     
     def extract_final_scores(self) -> List[Dict]:
         """Extract final scores for all contestants"""
@@ -314,23 +381,42 @@ class JeopardyScraper:
         
         return scores
     
+    def release(self):
+        """
+        Tear down the parse tree
+
+        BeautifulSoup trees are full of parent/sibling reference cycles, so
+        without this they live until the cyclic garbage collector runs.
+        """
+        if self.soup is not None:
+            self.soup.decompose()
+            self.soup = None
+    
     def scrape(self) -> Dict:
         """Main scraping method"""
         if not self.fetch_page():
+            self.release()
             return None
-        
-        # Extract all data
-        episode_info = self.extract_episode_info()
-        contestants = self.extract_contestants()
-        jeopardy_round = self.extract_round('jeopardy_round')
-        double_jeopardy_round = self.extract_round('double_jeopardy_round')
-        final_jeopardy = self.extract_final_jeopardy()
-        final_scores = self.extract_final_scores()
+        return self.extract()
+    
+    def extract(self) -> Dict:
+        """Extract the game from the loaded page, then tear the page down"""
+        # Extract all data (plain strings, so nothing keeps the tree alive)
+        try:
+            episode_info = self.extract_episode_info()
+            contestants = self.extract_contestants()
+            jeopardy_round = self.extract_round('jeopardy_round')
+            double_jeopardy_round = self.extract_round('double_jeopardy_round')
+            final_jeopardy = self.extract_final_jeopardy()
+            final_scores = self.extract_final_scores()
+        finally:
+            self.release()
         
         return {
             "game_id": self.game_id,
             "episode_number": episode_info["episode_number"],
             "air_date": episode_info["air_date"],
+            "air_date_iso": iso_air_date(episode_info["air_date"]),
             "contestants": contestants,
             "jeopardy_round": jeopardy_round,
             "double_jeopardy_round": double_jeopardy_round,
@@ -339,36 +425,47 @@ class JeopardyScraper:
         }
     
     def save_to_json(self, data: Dict, filename: str = None, output_dir: str = "output") -> str:
-        """Save scraped data to JSON file in the output directory organized by year/month"""
-        # Try to get year and month from air_date
-        air_date = data.get('air_date')
+        """
+        Save scraped data to a game file in the output directory organized by year/month
+
+        New files use the J_ARCHIVE_FORMAT format (plain JSON by default); an
+        explicit filename's extension picks the format instead.
+        """
+        # Try to get year and month from the ISO air date (YYYY-MM-DD)
+        air_date_iso = data.get('air_date_iso') or iso_air_date(data.get('air_date'))
         year_month_path = ""
         
-        if air_date:
-            try:
-                # Parse the date (format: "Monday, October 20, 2025")
-                date_obj = datetime.strptime(air_date, "%A, %B %d, %Y")
-                year = str(date_obj.year)
-                month = f"{date_obj.month:02d}"  # Zero-padded month
-                year_month_path = os.path.join(year, month)
-            except (ValueError, AttributeError):
-                # If date parsing fails, just use the base output directory
-                pass
+        if air_date_iso:
+            year, month = air_date_iso[:4], air_date_iso[5:7]
+            year_month_path = os.path.join(year, month)
+        # If there is no usable date, just use the base output directory
         
         # Create full output path with year/month subdirectories
         full_output_dir = os.path.join(output_dir, year_month_path) if year_month_path else output_dir
         os.makedirs(full_output_dir, exist_ok=True)
         
-        if filename is None:
-            filename = f"jeopardy_game_{self.game_id}.json"
+        default_name = filename is None
+        if default_name:
+            filename = f"jeopardy_game_{self.game_id}{GAME_FORMATS[configured_format()]}"
         
         # Create full file path
         if not os.path.dirname(filename):
             # If filename has no directory component, add the full output path
             filename = os.path.join(full_output_dir, filename)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_game_file(filename, data, output_dir)
+        if default_name:
+            # A copy of this game saved in another format before is now stale
+            stem = os.path.join(os.path.dirname(filename), game_file_stem(os.path.basename(filename)))
+            for extension in GAME_FORMATS.values():
+                if stem + extension != filename and os.path.exists(stem + extension):
+                    os.remove(stem + extension)
+        
+        # Let the manifest (and the indexes built from it) pick up the new game
+        try:
+            record_saved_game(output_dir, filename, data)
+        except OSError as e:
+            print(f"Warning: could not update archive manifest: {e}")
         
         return filename
 
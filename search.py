@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Full-Text Clue Search for J-Archive data
+Searches clue text, answers and categories through a persistent inverted
+index (SQLite FTS5) that is updated incrementally from the archive manifest
+"""
+
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Optional
+
+from archive import game_iso_date, get_index_dir, iter_game_clues, load_game_data, load_manifest
+
+
+INDEX_FILENAME = "search.sqlite"
+
+ROUND_NAMES = ('Jeopardy!', 'Double Jeopardy!', 'Final Jeopardy!')
+ROUND_CODES = {
+    "jeopardy": 0, "j": 0,
+    "double": 1, "double_jeopardy": 1, "dj": 1,
+    "final": 2, "final_jeopardy": 2, "fj": 2,
+}
+FIELDS = ('clue', 'answer', 'category')
+
+# A "quoted phrase" or a bare word (possibly ending in the * prefix operator)
+_QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS clues (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    game_id INTEGER,
+    air_date TEXT,
+    round INTEGER,
+    position INTEGER,
+    value TEXT,
+    daily_double INTEGER
+);
+CREATE INDEX IF NOT EXISTS clues_path ON clues(path);
+CREATE INDEX IF NOT EXISTS clues_air_date ON clues(air_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS clue_text USING fts5(
+    clue, answer, category,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def open_index(output_dir: str = "output") -> sqlite3.Connection:
+    """Open (and create if needed) the search index for an output directory"""
+    path = os.path.join(get_index_dir(output_dir), INDEX_FILENAME)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _remove_file(conn: sqlite3.Connection, rel: str):
+    ids = [row[0] for row in conn.execute("SELECT id FROM clues WHERE path = ?", (rel,))]
+    conn.executemany("DELETE FROM clue_text WHERE rowid = ?", ((i,) for i in ids))
+    conn.execute("DELETE FROM clues WHERE path = ?", (rel,))
+    conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+
+def _index_file(conn: sqlite3.Connection, rel: str, entry: Dict, data: Dict):
+    air_date = game_iso_date(data)
+
+    for round_code, position, clue in iter_game_clues(data):
+        cursor = conn.execute(
+            "INSERT INTO clues (path, game_id, air_date, round, position, value, daily_double) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (rel, data.get('game_id'), air_date, round_code, position,
+             clue.get('value'), 1 if clue.get('daily_double') else 0)
+        )
+        conn.execute(
+            "INSERT INTO clue_text (rowid, clue, answer, category) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, clue.get('clue') or '', clue.get('answer') or '', clue.get('category') or '')
+        )
+
+    conn.execute("INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                 (rel, entry.get('size'), entry.get('mtime_ns')))
+
+
+def update_index(output_dir: str = "output", conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+    """
+    Bring the search index up to date with the archive
+
+    Games written by save_to_json are picked up from the manifest; only new,
+    changed or removed games touch the index.
+
+    Returns:
+        Dict with counts of "added", "updated" and "removed" games
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = open_index(output_dir)
+
+    manifest = load_manifest(output_dir)
+    indexed = {path: (size, mtime_ns) for path, size, mtime_ns in conn.execute("SELECT path, size, mtime_ns FROM files")}
+    counts = {"added": 0, "updated": 0, "removed": 0}
+
+    with conn:
+        for rel in indexed:
+            if rel not in manifest.entries:
+                _remove_file(conn, rel)
+                counts["removed"] += 1
+
+        for rel, entry in manifest.entries.items():
+            stat_key = (entry.get('size'), entry.get('mtime_ns'))
+            if indexed.get(rel) == stat_key:
+                continue
+            try:
+                data = load_game_data(manifest.abspath(rel))
+            except (OSError, ValueError) as e:
+                print(f"  ✗ Error indexing {rel}: {e}")
+                continue
+            if rel in indexed:
+                _remove_file(conn, rel)
+                counts["updated"] += 1
+            else:
+                counts["added"] += 1
+            _index_file(conn, rel, entry, data)
+
+    if own_conn:
+        conn.close()
+    return counts
+
+
+def build_match(query: str, field: Optional[str] = None) -> str:
+    """
+    Build an FTS5 match expression
+
+    Supports "quoted phrases" and prefix* terms; field restricts matching to
+    clue, answer or category. Every other word is quoted, so punctuation
+    (Lincoln's, St. Louis, civil-war) is left to the tokenizer instead of
+    being read as FTS5 syntax.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM_RE.findall(query):
+        prefix = word.endswith('*') and word.strip('*')
+        text = phrase or (word.rstrip('*') if prefix else word)
+        if not text.strip():
+            continue
+        terms.append('"' + text.replace('"', '""') + '"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError("Empty search query")
+    expression = " ".join(terms)
+    if field:
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Choose from: {', '.join(FIELDS)}")
+        return f"{field} : ({expression})"
+    return expression
+
+
+def search(query: str, output_dir: str = "output", field: Optional[str] = None,
+           round_name: Optional[str] = None, date_from: Optional[str] = None,
+           date_to: Optional[str] = None, daily_double: Optional[bool] = None,
+           limit: int = 20, update: bool = True) -> List[Dict]:
+    """
+    Search clues in the archive
+
+    Args:
+        query: Search terms, "phrase queries" and prefix* terms
+        field: Restrict to 'clue', 'answer' or 'category'
+        round_name: 'jeopardy', 'double' or 'final'
+        date_from / date_to: Inclusive YYYY-MM-DD bounds on the air date
+        daily_double: Only Daily Doubles (True) or only regular clues (False)
+        limit: Maximum number of results
+        update: Refresh the index from the archive before searching
+
+    Returns:
+        List of matching clues, best matches first
+    """
+    conn = open_index(output_dir)
+    try:
+        if update:
+            update_index(output_dir, conn)
+
+        sql = ("SELECT c.game_id, c.air_date, c.round, c.value, c.daily_double, c.path, "
+               "t.category, t.clue, t.answer "
+               "FROM clue_text t JOIN clues c ON c.id = t.rowid "
+               "WHERE clue_text MATCH ?")
+        params = [build_match(query, field)]
+
+        if round_name is not None:
+            if round_name.lower() not in ROUND_CODES:
+                raise ValueError(f"Unknown round '{round_name}'. Use jeopardy, double or final")
+            sql += " AND c.round = ?"
+            params.append(ROUND_CODES[round_name.lower()])
+        if date_from:
+            sql += " AND c.air_date >= ?"
+            params.append(date_from)
+        if date_to:
+            sql += " AND c.air_date <= ?"
+            params.append(date_to)
+        if daily_double is not None:
+            sql += " AND c.daily_double = ?"
+            params.append(1 if daily_double else 0)
+
+        sql += " ORDER BY t.rank LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "game_id": game_id,
+                "air_date": air_date,
+                "round": ROUND_NAMES[round_code],
+                "value": value,
+                "daily_double": bool(dd),
+                "category": category,
+                "clue": clue,
+                "answer": answer,
+                "file": path,
+            }
+            for game_id, air_date, round_code, value, dd, path, category, clue, answer
+            in conn.execute(sql, params)
+        ]
+    finally:
+        conn.close()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Full-Text Clue Search")
+        print("\nUsage:")
+        print("  python search.py <query> [options]")
+        print("  python search.py --update [--output-dir <dir>]")
+        print("\nOptions:")
+        print("  --field <clue|answer|category>   Only match in one field")
+        print("  --round <jeopardy|double|final>  Only clues from one round")
+        print("  --from <YYYY-MM-DD>              Aired on or after this date")
+        print("  --to <YYYY-MM-DD>                Aired on or before this date")
+        print("  --daily-double                   Only Daily Doubles")
+        print("  --limit <n>                      Maximum results (default 20)")
+        print("  --output-dir <dir>               Archive to search (default output)")
+        print("\nExamples:")
+        print("  python search.py lincoln --field answer")
+        print('  python search.py \'"gettysburg address"\'')
+        print("  python search.py 'presiden*' --round final --from 1990-01-01 --to 1999-12-31")
+        sys.exit(1)
+
+    query_terms = []
+    options = {"output_dir": "output"}
+    update_only = False
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg in ('--field', '--round', '--from', '--to', '--limit', '--output-dir'):
+            if i + 1 >= len(sys.argv):
+                print(f"Error: {arg} requires a value")
+                sys.exit(1)
+            value = sys.argv[i + 1]
+            key = {"--field": "field", "--round": "round_name", "--from": "date_from",
+                   "--to": "date_to", "--limit": "limit", "--output-dir": "output_dir"}[arg]
+            options[key] = int(value) if key == "limit" else value
+            i += 2
+        elif arg == '--daily-double':
+            options["daily_double"] = True
+            i += 1
+        elif arg == '--update':
+            update_only = True
+            i += 1
+        else:
+            query_terms.append(arg)
+            i += 1
+
+    if not os.path.isdir(options["output_dir"]):
+        print(f"Error: output directory '{options['output_dir']}' not found")
+        sys.exit(1)
+
+    if update_only:
+        counts = update_index(options["output_dir"])
+        print(f"Index updated: {counts['added']} added, {counts['updated']} updated, {counts['removed']} removed")
+        return
+
+    if not query_terms:
+        print("Error: No search query provided")
+        sys.exit(1)
+
+    try:
+        results = search(" ".join(query_terms), **options)
+    except (ValueError, sqlite3.OperationalError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for r in results:
+        dd = " (DD)" if r["daily_double"] else ""
+        print(f"\n[{r['air_date'] or 'unknown date'}] Game #{r['game_id']} • {r['round']} • {r['category']} {r['value'] or ''}{dd}")
+        print(f"  {r['clue']}")
+        print(f"  → {r['answer']}")
+    print(f"\n{len(results)} result(s)")
+
+
+if __name__ == "__main__":
+    main()
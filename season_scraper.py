@@ -1,15 +1,31 @@
 #!/usr/bin/env python3
 """
 Season Scraper for J-Archive
-Scrapes all games from a season page
+Scrapes all games from one season page, or from many seasons at once with
+their fetches interleaved under one request pace
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
 import sys
+import threading
 import time
-from scraper import JeopardyScraper
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import zip_longest
+from typing import Dict, List, Tuple
+
+from bounded_memory import ParseWorkers, RssSampler, scrape_game
+from failure_queue import FailureQueue
+from rate_budget import wait_for_turn
+from scraper import JeopardyScraper, get_base_url, get_request_timeout
+
+
+# Special seasons included by --all, each with its usual output directory
+SPECIAL_SEASONS = {
+    "pcj": "output_celebrity",
+    "toc": "output_toc",
+    "masters": "output_masters",
+}
 
 
 def get_game_ids_from_season(season_url: str):
@@ -24,8 +40,12 @@ def get_game_ids_from_season(season_url: str):
     """
     print(f"Fetching season page: {season_url}")
     
+    import requests
+    from bs4 import BeautifulSoup
+    
+    wait_for_turn(season_url, "scheduled")
     try:
-        response = requests.get(season_url)
+        response = requests.get(season_url, timeout=get_request_timeout())
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
         
@@ -52,7 +72,7 @@ def get_game_ids_from_season(season_url: str):
         return []
 
 
-def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output"):
+def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output", recycle_every: int = 0):
     """
     Scrape all games from a season
     
@@ -60,6 +80,7 @@ def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output
         season_url: URL of the season page
         delay: Delay between requests in seconds
         output_dir: Base output directory for scraped files
+        recycle_every: Parse pages in a worker process replaced every N pages (0 = in-process)
     """
     game_ids = get_game_ids_from_season(season_url)
     
@@ -73,12 +94,15 @@ def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output
     
     success_count = 0
     fail_count = 0
+    failures = FailureQueue(output_dir)
+    workers = ParseWorkers(recycle_every) if recycle_every else None
+    memory = RssSampler()
     
     for i, game_id in enumerate(game_ids, 1):
         print(f"\n[{i}/{len(game_ids)}] Scraping game {game_id}...")
         
-        scraper = JeopardyScraper(game_id)
-        data = scraper.scrape()
+        scraper = JeopardyScraper(game_id, priority="scheduled")
+        data = scrape_game(scraper, workers, memory)
         
         if data:
             # Check if we actually got data
@@ -91,6 +115,7 @@ def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output
             if has_data:
                 filename = scraper.save_to_json(data, output_dir=output_dir)
                 print(f"  ✓ Saved to {filename}")
+                failures.clear(game_id)
                 success_count += 1
                 
                 # Print summary
@@ -99,55 +124,248 @@ def scrape_season(season_url: str, delay: float = 1.5, output_dir: str = "output
                     print(f"  Episode #{episode} - {data['air_date']}")
             else:
                 print(f"  ✗ Failed to scrape game {game_id} - no data found")
+                failures.record_scrape(game_id, scraper, "season")
                 fail_count += 1
         else:
             print(f"  ✗ Failed to scrape game {game_id}")
+            failures.record_scrape(game_id, scraper, "season")
             fail_count += 1
         
         # Be respectful - add delay between requests
         if i < len(game_ids):
             time.sleep(delay)
     
+    if workers:
+        workers.close()
+    
     print("\n" + "="*60)
     print("Season scraping complete!")
     print(f"✓ Successful: {success_count}")
     if fail_count > 0:
-        print(f"✗ Failed: {fail_count}")
+        print(f"✗ Failed: {fail_count} (recorded with reasons; see python failure_queue.py --output-dir {output_dir})")
+    print(memory.report_line())
     print("="*60)
 
 
+def season_url_for(season_arg: str) -> str:
+    """A season page URL from a season code (or a URL, returned as is)"""
+    if season_arg.startswith('http'):
+        return season_arg
+    return f"{get_base_url()}/showseason.php?season={season_arg}"
+
+
+def all_seasons(output_dir: str = "output", today: date = None) -> List[Tuple[str, str]]:
+    """(season, output_dir) for every regular season so far, then the special seasons"""
+    from clue_table import season_for_date
+
+    current = season_for_date(today or date.today())
+    seasons = [(str(n), output_dir) for n in range(1, current + 1)]
+    return seasons + list(SPECIAL_SEASONS.items())
+
+
+def interleave_games(listings: List[Tuple[str, List[int]]]) -> List[Tuple[int, List[str]]]:
+    """
+    One fetch order across seasons: a game from each season in turn
+
+    A game listed by several seasons is fetched once, at its first turn,
+    and returned with every season that lists it.
+    """
+    seasons_of: Dict[int, List[str]] = {}
+    for season, game_ids in listings:
+        for game_id in game_ids:
+            seasons_of.setdefault(game_id, []).append(season)
+
+    order = []
+    seen = set()
+    for turn in zip_longest(*(game_ids for _, game_ids in listings)):
+        for game_id in turn:
+            if game_id is not None and game_id not in seen:
+                seen.add(game_id)
+                order.append((game_id, seasons_of[game_id]))
+    return order
+
+
+class _Pacer:
+    """Spaces requests from all threads at least delay seconds apart"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def scrape_seasons(seasons: List[Tuple[str, str]], delay: float = 1.5, workers: int = 4,
+                   recycle_every: int = 0) -> Dict[str, Dict[str, int]]:
+    """
+    Scrape many seasons in one run
+
+    Game fetches are interleaved across the seasons and run on a few threads,
+    all paced by one delay (and the host-wide rate budget), instead of one
+    serial run per season. A game listed by several seasons is fetched once
+    and saved to each of their output directories.
+
+    Args:
+        seasons: (season code or URL, output directory) pairs
+        delay: Minimum spacing between requests across all threads, in seconds
+        workers: Concurrent fetches (useful when latency, not the budget, is the limit)
+        recycle_every: Parse pages in worker processes replaced every N pages (0 = in-process)
+
+    Returns:
+        season -> {"games", "saved", "failed"}
+    """
+    pacer = _Pacer(delay)
+    output_of = dict(seasons)
+    listings = []
+    for season, _ in seasons:
+        pacer.wait()
+        listings.append((season, get_game_ids_from_season(season_url_for(season))))
+
+    order = interleave_games(listings)
+    shared = sum(1 for _, listed_in in order if len(listed_in) > 1)
+    print(f"\nStarting to scrape {len(order)} games from {len(seasons)} seasons "
+          f"({shared} listed in more than one) with {workers} workers, {delay}s between requests...")
+    print("="*60)
+
+    report = {season: {"games": len(game_ids), "saved": 0, "failed": 0} for season, game_ids in listings}
+    failure_queues: Dict[str, FailureQueue] = {}  # Opened on first use, so empty seasons leave no files
+    parse_workers = ParseWorkers(recycle_every, max(workers, 1)) if recycle_every else None
+    memory = RssSampler()
+
+    def fetch(game_id):
+        pacer.wait()
+        scraper = JeopardyScraper(game_id, priority="scheduled")
+        return scraper, scrape_game(scraper, parse_workers)
+
+    # Threads only fetch and parse; saving and failure bookkeeping stay on this thread
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        results = executor.map(fetch, [game_id for game_id, _ in order])
+        for i, ((game_id, listed_in), (scraper, data)) in enumerate(zip(order, results), 1):
+            memory.page(parse_workers.last_rss if parse_workers else None)
+            output_dirs = list(dict.fromkeys(output_of[season] for season in listed_in))
+            has_data = data and (
+                data.get('episode_number') or
+                len(data.get('contestants', [])) > 0 or
+                len(data.get('jeopardy_round', {}).get('clues', [])) > 0
+            )
+            if has_data:
+                for output_dir in output_dirs:
+                    filename = scraper.save_to_json(data, output_dir=output_dir)
+                    if output_dir not in failure_queues:
+                        failure_queues[output_dir] = FailureQueue(output_dir)
+                    failure_queues[output_dir].clear(game_id)
+                    print(f"[{i}/{len(order)}] ✓ Game {game_id} ({', '.join(listed_in)}) saved to {filename}")
+            else:
+                print(f"[{i}/{len(order)}] ✗ Failed to scrape game {game_id} ({', '.join(listed_in)})")
+                for output_dir in output_dirs:
+                    if output_dir not in failure_queues:
+                        failure_queues[output_dir] = FailureQueue(output_dir)
+                    failure_queues[output_dir].record_scrape(game_id, scraper, "season")
+            for season in listed_in:
+                report[season]["saved" if has_data else "failed"] += 1
+
+    if parse_workers:
+        parse_workers.close()
+    for queue in failure_queues.values():
+        queue.close()
+
+    print("\n" + "="*60)
+    print(f"Multi-season scraping complete! ({len(order)} unique games)")
+    for season, counts in report.items():
+        line = f"  {season:<8} → {output_of[season]}/: {counts['saved']}/{counts['games']} saved"
+        if counts["failed"]:
+            line += f", ✗ {counts['failed']} failed"
+        print(line)
+    print(memory.report_line())
+    print("="*60)
+    return report
+
+
+def parse_season_list(arg: str, output_dir: str) -> List[Tuple[str, str]]:
+    """'40,41,pcj=output_celebrity' -> [(season, output_dir), ...]"""
+    seasons = []
+    for item in filter(None, arg.split(',')):
+        if not item.startswith('http') and '=' in item:
+            season, season_dir = item.split('=', 1)
+            seasons.append((season, season_dir))
+        else:
+            seasons.append((item, output_dir))
+    return seasons
+
+
 def main():
-    if len(sys.argv) < 2:
+    recycle_every = 0
+    workers = 4
+    scrape_all = False
+    positional = []
+    
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--recycle', '--workers'):
+            try:
+                value = int(args[i + 1])
+            except (IndexError, ValueError):
+                print(f"Error: {arg} requires a number")
+                sys.exit(1)
+            if arg == '--recycle':
+                recycle_every = value
+            else:
+                workers = value
+            i += 2
+        elif arg == '--all':
+            scrape_all = True
+            i += 1
+        else:
+            positional.append(arg)
+            i += 1
+    
+    # --all takes the place of the season argument
+    if not scrape_all and not positional:
         print("Season Scraper for J-Archive")
         print("\nUsage:")
         print("  python season_scraper.py <season_url> [delay] [output_dir]")
         print("  python season_scraper.py <season_code> [delay] [output_dir]")
+        print("  python season_scraper.py <season>,<season>[=output_dir],... [delay] [output_dir]")
+        print("  python season_scraper.py --all [delay] [output_dir]")
+        print("\n  --recycle <n>  Parse pages in a worker process replaced every n pages")
+        print("  --workers <n>  Concurrent fetches when scraping several seasons (default 4)")
         print("\nExamples:")
         print("  python season_scraper.py https://j-archive.com/showseason.php?season=42")
         print("  python season_scraper.py pcj 2.0")
         print("  python season_scraper.py pcj 2.0 output_celebrity")
         print("  python season_scraper.py toc 2.0 output_toc")
         print("  python season_scraper.py 42 2.0 output_season42")
+        print("  python season_scraper.py 40,41,42,toc=output_toc 1.0")
+        print("  python season_scraper.py --all 1.0 --workers 8")
         print("\nCommon season codes:")
         print("  42        - Current season (season 42)")
         print("  41        - Last season (season 41)")
         print("  pcj       - Primetime Celebrity Jeopardy!")
         print("  toc       - Tournament of Champions")
         print("  masters   - Jeopardy! Masters")
+        print("\n--all scrapes every regular season into output_dir and pcj, toc and masters")
+        print("into output_celebrity, output_toc and output_masters.")
         sys.exit(1)
     
-    season_arg = sys.argv[1]
-    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "output"
+    season_arg = None if scrape_all else positional.pop(0)
+    delay = float(positional[0]) if len(positional) > 0 else 1.5
+    output_dir = positional[1] if len(positional) > 1 else "output"
     
-    # If it's a full URL, use it directly
-    if season_arg.startswith('http'):
-        season_url = season_arg
-    else:
-        # Otherwise, construct the URL from the season code
-        season_url = f"https://j-archive.com/showseason.php?season={season_arg}"
+    if scrape_all or ',' in season_arg or ('=' in season_arg and not season_arg.startswith('http')):
+        seasons = all_seasons(output_dir) if scrape_all else parse_season_list(season_arg, output_dir)
+        scrape_seasons(seasons, delay, workers, recycle_every)
+        return
     
-    scrape_season(season_url, delay, output_dir)
+    scrape_season(season_url_for(season_arg), delay, output_dir, recycle_every)
 
 
 if __name__ == "__main__":
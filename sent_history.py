@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Sent-Clue History for the Daily Jeopardy Email
+Remembers which clues (and games) have already been emailed in compact
+bitmaps keyed by stable clue id, so daily picks don't repeat
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from archive import get_index_dir, load_game_data, make_clue_id
+from clue_table import ROUND_NAMES, ROUNDS, ClueTable, load_clue_table
+
+
+HISTORY_DIRNAME = "sent_history"
+DEFAULT_RESET_FRACTION = 0.9
+
+# Bloom filter sizing: ~1% false positives at 1M (recipient, clue) entries
+BLOOM_BITS = 9_600_000
+BLOOM_HASHES = 7
+
+
+class Bitmap:
+    """Growable bit set over non-negative integers"""
+
+    def __init__(self, data: Optional[bytes] = None):
+        self.bits = bytearray(data or b"")
+
+    def __contains__(self, i: int) -> bool:
+        byte = i >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (i & 7)))
+
+    def add(self, i: int):
+        byte = i >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(b"\0" * (byte + 1 - len(self.bits)))
+        self.bits[byte] |= 1 << (i & 7)
+
+    def count(self) -> int:
+        return int.from_bytes(self.bits, 'little').bit_count()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter for (recipient, clue id) pairs"""
+
+    def __init__(self, num_bits: int = BLOOM_BITS, num_hashes: int = BLOOM_HASHES, data: Optional[bytes] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(data) if data else bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+
+class SentHistory:
+    """
+    Persistent record of emailed clues and games
+
+    Stored under the archive's index directory as two bitmaps (clue ids and
+    game ids) plus a small JSON file with counts and the rotation log.
+    """
+
+    def __init__(self, output_dir: str = "output", reset_fraction: float = DEFAULT_RESET_FRACTION):
+        self.directory = os.path.join(get_index_dir(output_dir), HISTORY_DIRNAME)
+        self.reset_fraction = reset_fraction
+        self.clues = Bitmap()
+        self.games = Bitmap()
+        self.meta = {"rotations": [], "sent_clues": 0, "sent_games": 0}
+        self.recipients = None
+
+    @classmethod
+    def load(cls, output_dir: str = "output", reset_fraction: float = DEFAULT_RESET_FRACTION,
+             per_recipient: bool = False) -> 'SentHistory':
+        history = cls(output_dir, reset_fraction)
+        os.makedirs(history.directory, exist_ok=True)
+        try:
+            with open(os.path.join(history.directory, "clues.bitmap"), 'rb') as f:
+                history.clues = Bitmap(f.read())
+            with open(os.path.join(history.directory, "games.bitmap"), 'rb') as f:
+                history.games = Bitmap(f.read())
+            with open(os.path.join(history.directory, "history.json"), 'r', encoding='utf-8') as f:
+                history.meta.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+        if per_recipient:
+            try:
+                with open(os.path.join(history.directory, "recipients.bloom"), 'rb') as f:
+                    history.recipients = BloomFilter(data=f.read())
+            except OSError:
+                history.recipients = BloomFilter()
+        return history
+
+    def save(self):
+        files = {"clues.bitmap": bytes(self.clues.bits), "games.bitmap": bytes(self.games.bits)}
+        if self.recipients is not None:
+            files["recipients.bloom"] = bytes(self.recipients.bits)
+        for name, data in files.items():
+            tmp_path = os.path.join(self.directory, name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+
+        tmp_path = os.path.join(self.directory, "history.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, "history.json"))
+
+    def is_sent(self, clue_id: int, game_id: int, recipient: Optional[str] = None) -> bool:
+        if clue_id in self.clues or game_id in self.games:
+            return True
+        return recipient is not None and self.recipients is not None and f"{recipient}\0{clue_id}" in self.recipients
+
+    def mark_sent(self, clue_id: int, game_id: int, recipient: Optional[str] = None):
+        if clue_id not in self.clues:
+            self.clues.add(clue_id)
+            self.meta["sent_clues"] += 1
+        if game_id not in self.games:
+            self.games.add(game_id)
+            self.meta["sent_games"] += 1
+        if recipient is not None and self.recipients is not None:
+            self.recipients.add(f"{recipient}\0{clue_id}")
+
+    def rotate_if_needed(self, total_clues: int, total_games: int) -> bool:
+        """
+        Start over once too much of the archive has been used
+
+        Keeps the expected number of sampling draws bounded by
+        1 / (1 - reset_fraction).
+        """
+        clue_fraction = self.meta["sent_clues"] / total_clues if total_clues else 1.0
+        game_fraction = self.meta["sent_games"] / total_games if total_games else 1.0
+        if max(clue_fraction, game_fraction) < self.reset_fraction:
+            return False
+
+        self.meta["rotations"].append({
+            "reset_at": datetime.now().isoformat(timespec='seconds'),
+            "sent_clues": self.meta["sent_clues"],
+            "sent_games": self.meta["sent_games"],
+        })
+        self.clues = Bitmap()
+        self.games = Bitmap()
+        self.meta["sent_clues"] = 0
+        self.meta["sent_games"] = 0
+        # The per-recipient filter is kept: it only adds extra skips
+        return True
+
+
+def sample_questions(output_dir: str, history: SentHistory, num_questions: int = 3,
+                     exclude_ids=frozenset(), recipient: Optional[str] = None,
+                     make_question: Optional[Callable] = None, rng: Optional[random.Random] = None,
+                     table: Optional[ClueTable] = None) -> List[Dict]:
+    """
+    Pick clues from different games that haven't been sent before
+
+    Candidates are the clue table's valid rows, built once with the table,
+    so only the chosen games are opened. Excluded and used clues are skipped
+    by redrawing, which takes O(1) expected draws while the history stays
+    below its reset fraction. A resident caller can pass a table it keeps
+    loaded instead of reading the cached one from disk.
+    """
+    rng = rng or random.Random()
+    table = table or load_clue_table(output_dir)
+
+    columns = table.clues
+    candidates = table.valid_rows
+
+    if history.rotate_if_needed(len(candidates), len(table.games["game_id"])):
+        print("♻️  Most of the archive has been sent - starting a new rotation")
+
+    questions = []
+    chosen_games = set()
+    max_draws = 50 * max(num_questions, 1) + len(candidates) // 10
+    for _ in range(max_draws):
+        if len(questions) >= num_questions or not candidates:
+            break
+        i = candidates[rng.randrange(len(candidates))]
+        game_id, round_code, position = columns["game_id"][i], columns["round"][i], columns["position"][i]
+        clue_id = make_clue_id(game_id, round_code, position)
+        if clue_id in exclude_ids or game_id in chosen_games or history.is_sent(clue_id, game_id, recipient):
+            continue
+
+        path = os.path.join(output_dir, table.files[columns["file"][i]])
+        try:
+            game_data = load_game_data(path)
+            clue = game_data[ROUNDS[round_code]]['clues'][position]
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"Error processing {path}: {e}")
+            continue
+
+        clue = {**clue, 'round': ROUND_NAMES[round_code]}
+        question = make_question(game_data, clue) if make_question else {'game_id': game_id, **clue}
+        question['clue_id'] = clue_id
+        questions.append(question)
+        chosen_games.add(game_id)
+
+    return questions
+
+
+def main():
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "output"
+    history = SentHistory.load(output_dir)
+    print(f"Sent clues: {history.meta['sent_clues']}, sent games: {history.meta['sent_games']}")
+    print(f"Rotations: {len(history.meta['rotations'])}")
+    for rotation in history.meta['rotations'][-5:]:
+        print(f"  {rotation['reset_at']}: reset after {rotation['sent_clues']} clues / {rotation['sent_games']} games")
+
+
+if __name__ == "__main__":
+    main()
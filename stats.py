@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Archive Statistics for J-Archive data
+Category frequency by era, Daily Double placement, value inflation by season
+and Final Jeopardy categories, computed over the columnar clue table
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+import dedup
+from archive import get_index_dir, load_manifest, make_clue_id
+from clue_table import ROUND_NAMES, load_clue_table
+
+
+STATS_CACHE_DIRNAME = "stats"
+
+# Standard board size; the heatmap grows if the archive has larger boards
+BOARD_ROWS = 5
+BOARD_COLUMNS = 6
+
+
+def top_categories_by_era(table, top: int = 10) -> Dict[str, List]:
+    """Most frequent categories per decade (a category counts once per game round)"""
+    # Category appears once per (game, round); count distinct boards, not clues
+    boards = table.group_count(("year", "file", "round", "category"))
+    per_decade = {}
+    for (year, _, _, category), _ in boards.items():
+        if category < 0 or year == 0:
+            continue
+        decade = f"{year // 10 * 10}s"
+        counts = per_decade.setdefault(decade, {})
+        counts[category] = counts.get(category, 0) + 1
+
+    return {
+        decade: [[table.category_name(c), n] for c, n in
+                 sorted(counts.items(), key=lambda item: (-item[1], table.category_name(item[0])))[:top]]
+        for decade, counts in sorted(per_decade.items())
+    }
+
+
+def daily_double_heatmap(table) -> Dict[str, List[List[int]]]:
+    """Daily Double counts per round as a [row][category_index] grid"""
+    counts = table.group_count(("round", "row", "category_index"), mask=table.mask(daily_double=1))
+    heatmap = {}
+    for round_code, round_name in enumerate(ROUND_NAMES):
+        cells = {(r, c): n for (rc, r, c), n in counts.items() if rc == round_code and c >= 0}
+        rows = max([BOARD_ROWS] + [r + 1 for r, _ in cells])
+        columns = max([BOARD_COLUMNS] + [c + 1 for _, c in cells])
+        heatmap[round_name] = [[cells.get((r, c), 0) for c in range(columns)] for r in range(rows)]
+    return heatmap
+
+
+def value_by_season(table) -> Dict[str, Dict[str, float]]:
+    """Average board value per season and round (Daily Double wagers excluded)"""
+    mask = [v > 0 and s > 0 and not dd for v, s, dd in
+            zip(table.clues["value"], table.clues["season"], table.clues["daily_double"])]
+    means = table.group_mean(("season", "round"), "value", mask=mask)
+
+    result = {}
+    for (season, round_code), mean in sorted(means.items()):
+        result.setdefault(str(season), {})[ROUND_NAMES[round_code]] = round(mean, 2)
+    return result
+
+
+def final_jeopardy_categories(table, top: int = 20) -> List:
+    """Most frequent Final Jeopardy categories"""
+    counts = table.group_count(("final_category",), table="games")
+    ranked = sorted(((table.category_name(c), n) for c, n in counts.items() if c >= 0),
+                    key=lambda item: (-item[1], item[0]))
+    return [list(item) for item in ranked[:top]]
+
+
+def repeats_by_season(table, repeat_ids=frozenset()) -> Dict[str, Dict[str, int]]:
+    """Clues flagged by dedup.py as repeats of an earlier clue, per season"""
+    mask = [make_clue_id(g, r, p) in repeat_ids for g, r, p in
+            zip(table.clues["game_id"], table.clues["round"], table.clues["position"])]
+    repeats = table.group_count(("season",), mask=mask)
+    totals = table.group_count(("season",))
+    return {
+        str(season): {"clues": totals[season], "repeats": repeats.get(season, 0)}
+        for season in sorted(totals) if season > 0
+    }
+
+
+REPORTS = {
+    "categories": top_categories_by_era,
+    "daily-doubles": daily_double_heatmap,
+    "values": value_by_season,
+    "final": final_jeopardy_categories,
+    "repeats": repeats_by_season,
+}
+
+
+def run_report(name: str, output_dir: str = "output", top: Optional[int] = None):
+    """
+    Run a report, reusing the cached result if the archive hasn't changed
+
+    Results are cached under the index directory keyed by the manifest digest.
+    """
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report '{name}'. Choose from: {', '.join(REPORTS)}")
+
+    manifest = load_manifest(output_dir)
+    digest = manifest.digest()
+
+    cache_key = f"{name}-{top}" if top is not None else name
+    if name == "repeats":
+        # Also depends on the dedup index, which is updated separately
+        dedup_path = os.path.join(get_index_dir(output_dir), dedup.INDEX_FILENAME)
+        cache_key += f"-{os.stat(dedup_path).st_mtime_ns}" if os.path.exists(dedup_path) else "-none"
+    cache_dir = os.path.join(get_index_dir(output_dir), STATS_CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f"{digest}.json")
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if cache_key in cached:
+        return cached[cache_key]
+
+    table = load_clue_table(output_dir, manifest)
+    kwargs = {"top": top} if top is not None and name in ("categories", "final") else {}
+    if name == "repeats":
+        kwargs["repeat_ids"] = dedup.load_repeat_ids(output_dir)
+    result = REPORTS[name](table, **kwargs)
+
+    # Drop results for older archive states
+    for stale in os.listdir(cache_dir):
+        if stale != os.path.basename(cache_path):
+            os.remove(os.path.join(cache_dir, stale))
+
+    cached[cache_key] = result
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cached, f, ensure_ascii=False)
+
+    return result
+
+
+def print_report(name: str, result):
+    """Print a report in a readable form"""
+    if name == "categories":
+        for decade, categories in result.items():
+            print(f"\n{decade}:")
+            for category, count in categories:
+                print(f"  {count:5d}  {category}")
+    elif name == "daily-doubles":
+        for round_name, grid in result.items():
+            print(f"\n{round_name} Daily Doubles (rows × category_index):")
+            for r, cells in enumerate(grid):
+                print(f"  row {r + 1}: " + " ".join(f"{n:5d}" for n in cells))
+    elif name == "values":
+        print(f"\n{'Season':>8}  " + "  ".join(f"{r:>18}" for r in ROUND_NAMES))
+        for season, rounds in result.items():
+            print(f"{season:>8}  " + "  ".join(
+                f"{'$' + format(rounds[r], ',.0f') if r in rounds else '-':>18}" for r in ROUND_NAMES))
+    elif name == "final":
+        for category, count in result:
+            print(f"  {count:5d}  {category}")
+    elif name == "repeats":
+        print(f"\n{'Season':>8}  {'Clues':>8}  {'Repeats':>8}")
+        for season, counts in result.items():
+            print(f"{season:>8}  {counts['clues']:8d}  {counts['repeats']:8d}")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in REPORTS:
+        print("Archive Statistics")
+        print("\nUsage:")
+        print("  python stats.py <report> [--output-dir <dir>] [--top <n>] [--json]")
+        print("\nReports:")
+        print("  categories      - Most frequent categories per decade")
+        print("  daily-doubles   - Daily Double placement heatmap by row and category")
+        print("  values          - Average clue value per season (value inflation)")
+        print("  final           - Most frequent Final Jeopardy categories")
+        print("  repeats         - Repeated clues per season (run dedup.py first)")
+        sys.exit(1)
+
+    name = sys.argv[1]
+    output_dir = "output"
+    top = None
+    as_json = False
+
+    i = 2
+    while i < len(sys.argv):
+        if sys.argv[i] == '--output-dir' and i + 1 < len(sys.argv):
+            output_dir = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--top' and i + 1 < len(sys.argv):
+            top = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--json':
+            as_json = True
+            i += 1
+        else:
+            print(f"Error: Unknown argument '{sys.argv[i]}'")
+            sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    result = run_report(name, output_dir, top)
+    if as_json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(name, result)
+
+
+if __name__ == "__main__":
+    main()
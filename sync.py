@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Incremental Season Sync
+Keeps the archive current by fetching only the season page (with a
+conditional GET) and scraping just the games that are new or whose listing
+changed since the last sync
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from archive import get_index_dir, load_manifest
+from clue_table import season_for_date
+from failure_queue import FailureQueue
+from rate_budget import wait_for_turn
+from scraper import JeopardyScraper, get_base_url, get_request_timeout
+
+
+SEASON_PATH = "/showseason.php?season={season}"
+STATE_FILENAME = "sync_state.json"
+
+_GAME_LINK_RE = re.compile(r'showgame\.php\?game_id=(\d+)')
+
+
+def current_season(today: Optional[date] = None) -> str:
+    """Season code of the season airing now (seasons start in September)"""
+    return str(season_for_date(today or date.today()))
+
+
+def load_sync_state(output_dir: str = "output") -> Dict[str, Dict]:
+    """season -> {"etag", "last_modified", "high_water", "retry", "rows": {game_id: fingerprint}, "synced_at"}"""
+    try:
+        with open(os.path.join(get_index_dir(output_dir), STATE_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_sync_state(output_dir: str, state: Dict[str, Dict]):
+    path = os.path.join(get_index_dir(output_dir), STATE_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def conditional_get(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                    priority: str = "scheduled") -> Dict:
+    """
+    Conditional GET of a J-Archive page
+
+    Returns:
+        {"status", "content", "etag", "last_modified"}; content is None on 304
+    """
+    import requests
+
+    wait_for_turn(url, priority)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = requests.get(url, headers=headers, timeout=get_request_timeout())
+    if response.status_code == 304:
+        return {"status": 304, "content": None, "etag": etag, "last_modified": last_modified}
+    response.raise_for_status()
+    return {
+        "status": response.status_code,
+        "content": response.content,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def fetch_season_page(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict:
+    """Conditional GET of a season page"""
+    return conditional_get(url, etag, last_modified)
+
+
+def parse_season_rows(content: bytes) -> Dict[int, str]:
+    """
+    Game ids listed on a season page, each with a fingerprint of its table row
+
+    The row holds the show number, air date, contestants and comments, so a
+    changed fingerprint means the game's listing (and likely its page) changed.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = {}
+    for link in soup.find_all('a', href=_GAME_LINK_RE):
+        game_id = int(_GAME_LINK_RE.search(link.get('href')).group(1))
+        row = link.find_parent('tr') or link
+        text = " ".join(row.get_text(" ", strip=True).split())
+        rows[game_id] = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+    return rows
+
+
+def plan_sync(rows: Dict[int, str], season_state: Dict, archived_ids) -> Dict[str, List[int]]:
+    """
+    Split a season listing into games to scrape
+
+    new:     listed but not in the archive; games above the season's
+             high-water mark (newly aired) come first, then any older game
+             that was listed late or went missing
+    changed: archived, but the listing row changed since the last sync or
+             the last re-scrape failed
+    """
+    known_rows = season_state.get("rows", {})
+    high_water = season_state.get("high_water", 0)
+    retry = set(season_state.get("retry", []))
+    new, changed = [], []
+    for game_id in sorted(rows, key=lambda gid: (gid <= high_water, gid)):
+        if game_id not in archived_ids:
+            new.append(game_id)
+        else:
+            known = known_rows.get(str(game_id))
+            if game_id in retry or (known is not None and known != rows[game_id]):
+                changed.append(game_id)
+    return {"new": new, "changed": changed}
+
+
+def scrape_game(game_id: int, output_dir: str, failures: Optional[FailureQueue] = None) -> bool:
+    scraper = JeopardyScraper(game_id, priority="scheduled")
+    data = scraper.scrape()
+    if not data:
+        if failures:
+            failures.record_scrape(game_id, scraper, "sync")
+        return False
+    # Check if we actually got data (not just an empty structure)
+    has_data = (
+        data.get('episode_number') or
+        len(data.get('contestants', [])) > 0 or
+        len(data.get('jeopardy_round', {}).get('clues', [])) > 0
+    )
+    if not has_data:
+        if failures:
+            failures.record_scrape(game_id, scraper, "sync")
+        return False
+    filename = scraper.save_to_json(data, output_dir=output_dir)
+    print(f"  ✓ Saved to {filename}")
+    if failures:
+        failures.clear(game_id)
+    return True
+
+
+def sync_season(season: str, output_dir: str = "output", delay: float = 1.5,
+                dry_run: bool = False, force: bool = False) -> Dict:
+    """
+    Bring one season up to date
+
+    Returns:
+        Report with the page status, new/changed ids and scrape results
+    """
+    state = load_sync_state(output_dir)
+    season_state = state.get(season, {})
+    url = get_base_url() + SEASON_PATH.format(season=season)
+
+    page = fetch_season_page(url, None if force else season_state.get("etag"),
+                             None if force else season_state.get("last_modified"))
+    report = {"season": season, "page_status": page["status"], "requests": 1,
+              "high_water": season_state.get("high_water", 0),
+              "new": [], "changed": [], "scraped": [], "failed": []}
+    if page["status"] == 304:
+        # Listing unchanged: plan from the rows stored last time, which still
+        # picks up failed games and listed games missing from the archive
+        rows = {int(gid): fp for gid, fp in season_state.get("rows", {}).items()}
+    else:
+        rows = parse_season_rows(page["content"])
+
+    archived_ids = {e.get("game_id") for e in load_manifest(output_dir).entries.values()}
+    plan = plan_sync(rows, season_state, archived_ids)
+    report.update(plan)
+    if dry_run or (page["status"] == 304 and not plan["new"] + plan["changed"]):
+        return report
+
+    todo = plan["new"] + plan["changed"]
+    failures = FailureQueue(output_dir)
+    for i, game_id in enumerate(todo):
+        print(f"\n[{i + 1}/{len(todo)}] Scraping game {game_id}...")
+        report["requests"] += 1
+        if scrape_game(game_id, output_dir, failures):
+            report["scraped"].append(game_id)
+        else:
+            print(f"  ✗ Failed to scrape game {game_id}")
+            report["failed"].append(game_id)
+        if i < len(todo) - 1:
+            time.sleep(delay)
+
+    # Failed games go on the retry list, which is tried even when the page
+    # comes back 304, so the validators can be kept either way
+    failed = set(report["failed"])
+    synced_ids = [gid for gid in rows if gid not in failed and (gid in archived_ids or gid in report["scraped"])]
+    state[season] = {
+        "etag": page["etag"],
+        "last_modified": page["last_modified"],
+        "high_water": max(synced_ids + [season_state.get("high_water", 0)]),
+        "retry": sorted(failed),
+        "rows": {str(gid): fp for gid, fp in rows.items()},
+        "synced_at": datetime.now().isoformat(timespec='seconds'),
+    }
+    save_sync_state(output_dir, state)
+    report["high_water"] = state[season]["high_water"]
+    return report
+
+
+def main():
+    seasons = []
+    output_dir = "output"
+    delay = 1.5
+    dry_run = False
+    force = False
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == '--season' and i + 1 < len(sys.argv):
+            seasons.append(sys.argv[i + 1])
+            i += 2
+        elif arg == '--output-dir' and i + 1 < len(sys.argv):
+            output_dir = sys.argv[i + 1]
+            i += 2
+        elif arg == '--delay' and i + 1 < len(sys.argv):
+            delay = float(sys.argv[i + 1])
+            i += 2
+        elif arg == '--dry-run':
+            dry_run = True
+            i += 1
+        elif arg == '--force':
+            force = True
+            i += 1
+        else:
+            print("Incremental Season Sync")
+            print("\nUsage:")
+            print("  python sync.py [--season <code>]... [--output-dir <dir>] [--delay <seconds>] [--dry-run] [--force]")
+            print("\nExamples:")
+            print("  python sync.py                      # Current season")
+            print("  python sync.py --season 41 --season 42")
+            print("  python sync.py --season pcj --output-dir output_celebrity")
+            sys.exit(1)
+
+    if not seasons:
+        seasons = [current_season()]
+
+    exit_code = 0
+    for season in seasons:
+        print(f"🔄 Syncing season {season}...")
+        try:
+            report = sync_season(season, output_dir, delay, dry_run, force)
+        except Exception as e:
+            print(f"✗ Could not sync season {season}: {e}")
+            exit_code = 1
+            continue
+
+        if report["page_status"] == 304 and not report["new"] + report["changed"]:
+            print("✓ Season page not modified - archive is up to date (1 request)")
+            continue
+        print(f"\n{'='*60}")
+        print(f"Season {season}: {len(report['new'])} new, {len(report['changed'])} changed "
+              f"(high-water mark: game {report['high_water']})")
+        if dry_run:
+            for label in ("new", "changed"):
+                if report[label]:
+                    print(f"  {label}: {' '.join(map(str, report[label]))}")
+        else:
+            print(f"✓ Scraped: {len(report['scraped'])}")
+            if report["failed"]:
+                print(f"✗ Failed: {len(report['failed'])} ({' '.join(map(str, report['failed']))})")
+                exit_code = 1
+        print(f"Requests: {report['requests']}")
+        print(f"{'='*60}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
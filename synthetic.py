@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Synthetic Jeopardy Archive Generator
+Writes fake games in the same JSON format as JeopardyScraper.scrape(), for
+benchmarks and load tests that shouldn't depend on what is in output/.
+Values, Daily Double wagers, scores and unrevealed-clue rates follow each
+game's era, and archives of millions of games can be written on a process
+pool in any layout and game file format.
+"""
+
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from archive import GAME_FORMATS, ArchiveManifest, write_game_file
+from clue_table import VALUE_CHANGE_DATE, value_ladder
+
+FIRST_AIR_DATE = date(1984, 9, 10)
+LAST_AIR_DATE = date(2025, 7, 25)  # Fixed, so a seed gives the same archive on any day
+
+# Share of clues left unrevealed per round, for games aired before each date;
+# early seasons ran out of time far more often than today's
+MISSING_RATES = ((date(1990, 9, 1), 0.08), (VALUE_CHANGE_DATE, 0.05), (date(2014, 9, 1), 0.025))
+MODERN_MISSING_RATE = 0.015
+
+# Picture and audio clues, from the late-90s video clues on
+MEDIA_SINCE = date(1997, 9, 1)
+MEDIA_RATE = 0.02
+MEDIA_URL = "https://www.j-archive.com/media"
+
+LAYOUTS = ("nested", "flat")  # output/YYYY/MM/ as save_to_json writes, or all in output/ (pre-reorganize)
+CHUNK_SIZE = 1000             # Games per worker task
+
+WORDS = (
+    "abbey actor admiral alaska album alloy amazon anthem apollo archer arctic atlas "
+    "ballet baltic banjo baron basin beacon bishop blizzard bourbon bronze buffalo "
+    "cabinet cactus canal canyon capital captain carbon castle cathedral cavalry cello "
+    "census chapel charter chess circus citadel clipper cobalt comet compass condor "
+    "consul copper coral cosmos cotton crater crown crystal cyclone czar delta desert "
+    "diamond diesel dragon drummer dynasty eagle eclipse emerald emperor empire engine "
+    "falcon ferry festival fjord flame forest fortress fossil frontier galaxy garnet "
+    "geyser glacier goblet gospel granite gravity harbor harvest hawk helium hermit "
+    "highland horizon hymn island ivory jaguar jasmine jester jungle kingdom knight "
+    "lagoon lantern laser legend lincoln lion lotus lyric magnet mammoth marble meadow "
+    "mercury meteor monarch monsoon mosaic mountain museum mystic nebula neptune novel "
+    "oasis ocean opera orbit orchard orchid oxygen palace pampas panther parade pepper "
+    "pharaoh piano pilgrim pioneer planet plateau poet prairie prism prophet pyramid "
+    "quartz queen quiver rabbit rapids raven reef republic rhythm river rocket saga "
+    "samurai sapphire satellite senate sheriff sierra silver sonnet sparrow sphinx "
+    "stadium summit sultan symphony tango temple thunder tiger titan tornado tower "
+    "treaty trumpet tundra tycoon union valley velvet venus viking violin volcano "
+    "voyage walrus warrior whale willow wizard yacht zenith zephyr"
+).split()
+
+
+def iter_air_dates(start: date = FIRST_AIR_DATE):
+    """Weekday air dates starting from a given date"""
+    current = start
+    while True:
+        if current.weekday() < 5:
+            yield current
+        current += timedelta(days=1)
+
+
+def make_sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def era_missing_rate(air_date: date) -> float:
+    """Share of clues left unrevealed in a round for games of that era"""
+    for before, rate in MISSING_RATES:
+        if air_date < before:
+            return rate
+    return MODERN_MISSING_RATE
+
+
+def make_round(rng: random.Random, air_date: date, round_code: int, daily_doubles: int,
+               missing_rate: float, media_rate: float = 0.0) -> Dict:
+    """One Jeopardy! or Double Jeopardy! round"""
+    categories = [make_sentence(rng, 1, 3).upper() for _ in range(6)]
+    ladder = value_ladder(air_date, round_code)
+    code = ("J", "DJ")[round_code]
+
+    # Daily Doubles land in the lower rows, never twice in one category
+    dd_cells = set()
+    dd_columns = rng.sample(range(6), daily_doubles)
+    for column in dd_columns:
+        dd_cells.add((rng.choices(range(5), weights=(1, 6, 20, 30, 25))[0], column))
+
+    clues = []
+    for row in range(5):
+        for column in range(6):
+            is_dd = (row, column) in dd_cells
+            if not is_dd and rng.random() < missing_rate:
+                continue  # Unrevealed clue
+            if is_dd:
+                # Wagers scale with the era's board: the row value, the top value, or a bigger bet
+                value = rng.choice([ladder[row], ladder[-1], ladder[-1] * 2, ladder[0] * rng.randint(1, 25)])
+            else:
+                value = ladder[row]
+            clue = {
+                "value": f"${value:,}",
+                "clue": make_sentence(rng, 6, 18),
+                "answer": make_sentence(rng, 1, 3),
+                "daily_double": is_dd,
+                "category": categories[column],
+                "category_index": column,
+                "row": row,
+            }
+            if air_date >= MEDIA_SINCE and rng.random() < media_rate:
+                extension = "mp3" if rng.random() < 0.2 else "jpg"
+                clue["media"] = [f"{MEDIA_URL}/{air_date.isoformat()}_{code}_{row}_{column}.{extension}"]
+            clues.append(clue)
+
+    return {"categories": categories, "clues": clues}
+
+
+def make_game(game_id: int, air_date: date, rng: random.Random, missing_rate: Optional[float] = None,
+              media_rate: float = 0.0) -> Dict:
+    """
+    One synthetic game in the JeopardyScraper.scrape() format
+
+    Board values, Daily Double wagers and final scores follow the air date's
+    era; missing_rate defaults to the era's share of unrevealed clues.
+    """
+    if missing_rate is None:
+        missing_rate = era_missing_rate(air_date)
+    names = [make_sentence(rng, 2, 2).title() for _ in range(3)]
+    score_step = value_ladder(air_date, 0)[0] * 5
+    return {
+        "game_id": game_id,
+        "episode_number": str(game_id),
+        "air_date": air_date.strftime("%A, %B %-d, %Y"),
+        "air_date_iso": air_date.isoformat(),
+        "contestants": [
+            {"name": name, "description": f"a {rng.choice(WORDS)} from {rng.choice(WORDS).title()}",
+             "previous_winnings": None, "player_id": game_id * 10 + slot}
+            for slot, name in enumerate(names)
+        ],
+        "jeopardy_round": make_round(rng, air_date, 0, 1, missing_rate, media_rate),
+        "double_jeopardy_round": make_round(rng, air_date, 1, 2, missing_rate, media_rate),
+        "final_jeopardy": {
+            "category": make_sentence(rng, 1, 3).upper(),
+            "clue": make_sentence(rng, 8, 20),
+            "answer": make_sentence(rng, 1, 3),
+        },
+        "final_scores": [
+            {"contestant": name.split()[0], "final_score": f"${rng.randint(0, 40) * score_step:,}"}
+            for name in names
+        ],
+    }
+
+
+def air_calendar(start: date = FIRST_AIR_DATE, end: date = LAST_AIR_DATE) -> List[date]:
+    """Every weekday from start to end"""
+    dates = iter_air_dates(start)
+    calendar = []
+    while True:
+        current = next(dates)
+        if current > end:
+            return calendar
+        calendar.append(current)
+
+
+def air_date_for(index: int, num_games: int, calendar: List[date], spread: bool = False) -> date:
+    """
+    Air date of the index-th of num_games synthetic games
+
+    Games take consecutive weekdays from the first show, unless spread is set
+    or there are more games than weekdays. Then they are spread evenly over
+    the whole calendar, several per day if need be, so every era is covered.
+    """
+    if not spread and num_games <= len(calendar):
+        return calendar[index]
+    return calendar[index * len(calendar) // num_games]
+
+
+def game_relpath(game_id: int, air_date: date, layout: str = "nested", fmt: str = "json") -> str:
+    """Where a game goes: YYYY/MM/ like save_to_json, or the output root like before reorganize_output.py"""
+    filename = f"jeopardy_game_{game_id}{GAME_FORMATS[fmt]}"
+    if layout == "flat":
+        return filename
+    return os.path.join(str(air_date.year), f"{air_date.month:02d}", filename)
+
+
+def _write_games(args) -> List[Tuple[str, Dict]]:
+    """Write one chunk of games (runs in a worker process); returns (relpath, manifest entry) pairs"""
+    output_dir, first_id, count, options = args
+    calendar = air_calendar()
+    manifest = ArchiveManifest(output_dir)
+    made_dirs = set()
+    written = []
+    for game_id in range(first_id, first_id + count):
+        air_date = air_date_for(game_id - options["start_game_id"], options["num_games"], calendar, options["spread"])
+        # Seeded per game, so the archive is the same whatever the chunking or worker count
+        rng = random.Random(options["seed"] * 1_000_003 + game_id)
+        data = make_game(game_id, air_date, rng, options["missing_rate"], options["media_rate"])
+        rel = game_relpath(game_id, air_date, options["layout"], options["fmt"])
+        path = os.path.join(output_dir, rel)
+        directory = os.path.dirname(path)
+        if directory not in made_dirs:
+            os.makedirs(directory, exist_ok=True)
+            made_dirs.add(directory)
+        write_game_file(path, data, output_dir)
+        written.append((rel, manifest.describe(path, data)))
+    return written
+
+
+def generate_archive(output_dir: str, num_games: int, seed: int = 0, start_game_id: int = 1,
+                     layout: str = "nested", fmt: str = "json", spread: bool = False,
+                     missing_rate: Optional[float] = None, media_rate: float = MEDIA_RATE,
+                     workers: int = 1, write_manifest: bool = True, progress: bool = False) -> List[str]:
+    """
+    Write synthetic games into output_dir in one of LAYOUTS and one of the game formats
+
+    Chunks of CHUNK_SIZE games are written on a process pool when workers > 1.
+    The manifest is written from the generated games, as a scrape would have
+    left it; pass write_manifest=False to leave building it to the reader.
+
+    Returns:
+        List of written file paths
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+    if fmt not in GAME_FORMATS:
+        raise ValueError(f"Unknown game format '{fmt}'. Choose from: {', '.join(GAME_FORMATS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    options = {"start_game_id": start_game_id, "num_games": num_games, "seed": seed, "layout": layout,
+               "fmt": fmt, "spread": spread, "missing_rate": missing_rate, "media_rate": media_rate}
+    chunks = [(output_dir, first_id, min(CHUNK_SIZE, start_game_id + num_games - first_id), options)
+              for first_id in range(start_game_id, start_game_id + num_games, CHUNK_SIZE)]
+
+    manifest = ArchiveManifest.load(output_dir) if write_manifest else None
+    paths = []
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        results = executor.map(_write_games, chunks) if executor else map(_write_games, chunks)
+        for written in results:
+            for rel, entry in written:
+                paths.append(os.path.join(output_dir, rel))
+                if manifest is not None:
+                    manifest.set_entry(rel, entry)
+            if progress and len(paths) % (CHUNK_SIZE * 100) == 0:
+                print(f"  [{len(paths):,}/{num_games:,}] games written")
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if manifest is not None:
+        manifest.save()
+    return paths
+
+
+def main():
+    args = sys.argv[1:]
+    positional = []
+    options = {"layout": "nested", "fmt": "json", "spread": False, "missing_rate": None,
+               "media_rate": MEDIA_RATE, "workers": 1, "write_manifest": True}
+    train_dict = False
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--layout', '--format', '--missing-rate', '--media-rate', '--workers') and i + 1 < len(args):
+            if arg == '--layout':
+                options["layout"] = args[i + 1]
+            elif arg == '--format':
+                options["fmt"] = args[i + 1]
+            elif arg == '--missing-rate':
+                options["missing_rate"] = float(args[i + 1])
+            elif arg == '--media-rate':
+                options["media_rate"] = float(args[i + 1])
+            else:
+                options["workers"] = int(args[i + 1])
+            i += 2
+        elif arg == '--spread':
+            options["spread"] = True
+            i += 1
+        elif arg == '--no-manifest':
+            options["write_manifest"] = False
+            i += 1
+        elif arg == '--train-dict':
+            train_dict = True
+            i += 1
+        elif not arg.startswith('--'):
+            positional.append(arg)
+            i += 1
+        else:
+            positional = []
+            break
+
+    if len(positional) not in (2, 3) or options["layout"] not in LAYOUTS or options["fmt"] not in GAME_FORMATS:
+        print("Synthetic Jeopardy Archive Generator")
+        print("\nUsage:")
+        print("  python synthetic.py <output_dir> <num_games> [seed] [options]")
+        print("\nOptions:")
+        print(f"  --layout <{'|'.join(LAYOUTS)}>      YYYY/MM/ folders (default) or all games in the output root")
+        print(f"  --format <{'|'.join(GAME_FORMATS)}>  Game file format (default json)")
+        print("  --train-dict                 With --format zstd: train a dictionary on sample games first")
+        print("  --spread                     Spread games over 1984-2025 instead of consecutive weekdays")
+        print("  --missing-rate <0-1>         Unrevealed clue rate (default: by era)")
+        print(f"  --media-rate <0-1>           Media clue rate from {MEDIA_SINCE.year} on (default {MEDIA_RATE})")
+        print("  --workers <n>                Write on n processes (default 1)")
+        print("  --no-manifest                Leave the archive manifest to be built on first use")
+        print("\nExample:")
+        print("  python synthetic.py output_synthetic 5000")
+        print("  python synthetic.py output_big 1000000 --spread --workers 8 --format zstd --train-dict")
+        sys.exit(1)
+
+    output_dir = positional[0]
+    num_games = int(positional[1])
+    seed = int(positional[2]) if len(positional) > 2 else 0
+
+    try:
+        if train_dict and options["fmt"] == "zstd":
+            from archive import compact_game_json
+            from game_format import DICT_SAMPLES, install_dictionary
+
+            rng = random.Random(seed)
+            calendar = air_calendar()
+            corpus = [compact_game_json(make_game(game_id, rng.choice(calendar), rng, options["missing_rate"],
+                                                  options["media_rate"]))
+                      for game_id in range(1, min(num_games, DICT_SAMPLES) + 1)]
+            print(f"✓ Trained zstd dictionary: {install_dictionary(output_dir, corpus)}")
+
+        started = datetime.now()
+        paths = generate_archive(output_dir, num_games, seed, progress=True, **options)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"✓ Wrote {len(paths):,} synthetic games to {output_dir}/ in {datetime.now() - started}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for batch email delivery
+Sends to thousands of fake recipients through the local Mailgun stand-in
+(with injected 429s and 5xx errors), then re-runs to check that nobody gets
+the issue twice.
+"""
+
+import sys
+import tempfile
+
+from batch_email import MailgunClient, SendJournal, deliver, print_report
+from mail_standin import start_standin
+
+QUESTIONS_HTML = "<html><body><p>Hello %recipient.name%</p></body></html>"
+
+
+def run(mode, num_recipients, workers):
+    print(f"\n🧪 {mode} mode, {num_recipients} recipients")
+    server = start_standin(throttle_rate=0.05, fail_rate=0.05, seed=1)
+    recipients = [{"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(num_recipients)]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        reports = []
+        for attempt in range(3):
+            client = MailgunClient("test.example.com", server.api_key, "jeopardy@example.com",
+                                   api_base=server.base_url, max_retries=2)
+            journal = SendJournal(output_dir, "test-issue")
+            report = deliver(client, journal, recipients, "Test issue", QUESTIONS_HTML, mode, workers,
+                             batch_size=100)
+            print_report(report)
+            reports.append(report)
+            if not report["failed"]:
+                break
+
+    server.shutdown()
+    delivered = server.delivered_to()
+    ok = True
+    if len(delivered) != len(set(delivered)):
+        print(f"❌ {len(delivered) - len(set(delivered))} recipients received the issue twice")
+        ok = False
+    if set(delivered) != {r["email"] for r in recipients}:
+        print(f"❌ Only {len(set(delivered))} of {num_recipients} recipients received the issue")
+        ok = False
+    if reports[-1]["failed"]:
+        print(f"❌ {reports[-1]['failed']} recipients still failing after {len(reports)} runs")
+        ok = False
+    if ok:
+        print(f"✅ Every recipient received the issue exactly once ({len(reports)} runs)")
+    return ok
+
+
+def main():
+    print("🎯 Testing Batch Email Delivery")
+    print("=" * 50)
+    ok = run("batch", 5000, 4)
+    ok = run("individual", 1000, 16) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,18 @@
 """
 Test script for the Daily Jeopardy Email
 Tests question selection and HTML generation without sending email.
+Runs against output/, or with --synthetic <num_games> against a generated
+archive of that size.
 """
 
+import atexit
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 # Import functions from the main script
+import daily_jeopardy_email
 from daily_jeopardy_email import (
     get_all_game_files,
     pick_random_questions,
@@ -18,6 +24,16 @@ def main():
     print("🎯 Testing Daily Jeopardy Email Generation")
     print("=" * 50)
     
+    if len(sys.argv) > 2 and sys.argv[1] == '--synthetic':
+        from synthetic import generate_archive
+        
+        num_games = int(sys.argv[2])
+        synthetic_dir = tempfile.mkdtemp(prefix="jeopardy_synthetic_")
+        atexit.register(shutil.rmtree, synthetic_dir, True)
+        print(f"\n🧪 Generating {num_games:,} synthetic games in {synthetic_dir}...")
+        generate_archive(synthetic_dir, num_games, spread=True)
+        daily_jeopardy_email.OUTPUT_DIR = Path(synthetic_dir)
+    
     # Check if game files exist
     print("\n📁 Checking for game files...")
     game_files = get_all_game_files()
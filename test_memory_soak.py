@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Soak test for bounded-memory batch runs
+Scrapes thousands of pages from the local J-Archive stand-in with
+scrape_range, in-process and with recycled parse workers, and checks that
+RSS stays flat after warm-up.
+
+Usage: python test_memory_soak.py [pages]   (default 2000)
+"""
+
+import contextlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from batch_scraper import scrape_range
+from bounded_memory import RssSampler
+
+PORT = 8791
+MAX_GROWTH_PER_1000 = 1.0  # MB per 1000 pages after warm-up
+MAX_DRIFT = 5.0            # MB between the end of warm-up and the end of the run
+RECYCLE_EVERY = 100
+
+
+def soak(label: str, pages: int, recycle_every: int = 0) -> bool:
+    memory = RssSampler(every=25)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # scrape_range saves into ./output
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                success, failed = scrape_range(1, pages, 0, recycle_every, memory)
+        finally:
+            os.chdir(cwd)
+    elapsed = time.perf_counter() - start
+
+    summary = memory.summary()
+    warm = [rss for p, rss in memory.samples if p >= pages * 0.1]
+    drift = warm[-1] - warm[0] if warm else 0.0
+    growth = summary["growth_mb_per_1000_pages"] or 0.0
+    print(f"\n🧪 {label}: {success} pages in {elapsed:.0f}s ({failed} failed)")
+    print(f"  {memory.report_line()}")
+    print(f"  Drift after warm-up: {drift:+.1f} MB")
+
+    ok = True
+    if success != pages:
+        print(f"❌ Only {success} of {pages} pages scraped")
+        ok = False
+    if growth > MAX_GROWTH_PER_1000 or drift > MAX_DRIFT:
+        print(f"❌ RSS keeps growing (limits: {MAX_GROWTH_PER_1000} MB/1000 pages, {MAX_DRIFT} MB drift)")
+        ok = False
+    return ok
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("🎯 Memory Soak Test")
+    print("=" * 50)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    # The server runs in its own process so its memory isn't counted
+    server = subprocess.Popen([sys.executable, os.path.join(here, "jarchive_standin.py"),
+                               "--port", str(PORT), "--max-game-id", str(pages)], stdout=subprocess.DEVNULL)
+    os.environ["J_ARCHIVE_URL"] = f"http://127.0.0.1:{PORT}"
+    os.environ["J_ARCHIVE_RATE"] = "0"
+    time.sleep(1)
+    try:
+        ok = soak("In-process parsing", pages)
+        ok = soak(f"Parse workers recycled every {RECYCLE_EVERY} pages", max(pages // 4, RECYCLE_EVERY * 3),
+                  RECYCLE_EVERY) and ok
+    finally:
+        server.terminate()
+        server.wait()
+
+    if ok:
+        print("\n✅ Memory stayed flat")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
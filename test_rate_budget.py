@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the host-wide rate budget
+Runs a budget so slow that the head of the line sleeps longer than the
+stale-waiter timeout, and checks that every request still gets its turn
+(a purged ticket used to leave acquire() polling forever).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import rate_budget
+from rate_budget import RateBudget
+
+WAITER_TIMEOUT = 0.5  # Shortened so a 1 request/s budget waits past it
+RATE = 1.0
+REQUESTS = 3
+
+
+def main():
+    print("🎯 Testing Rate Budget")
+    print("=" * 50)
+    rate_budget.WAITER_TIMEOUT = WAITER_TIMEOUT
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rate_budget.sqlite")
+        waits = []
+
+        def run():
+            budget = RateBudget(path, rate=RATE, burst=1)
+            for _ in range(REQUESTS):
+                waits.append(budget.acquire("j-archive.test", "backfill"))
+            budget.close()
+
+        start = time.time()
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        # Each request after the first waits 1 / RATE seconds
+        limit = (REQUESTS - 1) / RATE + 10
+        worker.join(limit)
+        elapsed = time.time() - start
+
+        if worker.is_alive():
+            print(f"❌ {len(waits)} of {REQUESTS} requests got through in {limit:.0f}s - acquire() is stuck")
+            ok = False
+        else:
+            print(f"✅ {REQUESTS} requests at {RATE:g}/s in {elapsed:.1f}s "
+                  f"(waits: {', '.join(f'{w:.2f}s' for w in waits)})")
+            if elapsed < (REQUESTS - 1) / RATE * 0.9:
+                print(f"❌ Finished too fast for a {RATE:g}/s budget")
+                ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
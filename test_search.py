@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for clue search
+Indexes a few synthetic games whose clues carry apostrophes, periods and
+hyphens, and checks that everyday queries with that punctuation find them
+(through search.py and the query service) instead of failing as FTS5 syntax.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from datetime import date
+
+import search
+from archive import write_game_file
+from query_server import serve
+from synthetic import make_game
+
+# clue text -> (query, expected to match) cases
+CLUES = {
+    "Lincoln's Gettysburg Address runs just 272 words": ["Lincoln's", '"gettysburg address"', "Gettys*"],
+    "The Gateway Arch towers over St. Louis": ["St. Louis", "st.", "Louis."],
+    "This civil-war general later became president": ["civil-war", "civil-war general", "presiden*"],
+    'He said "ask not" in 1961': ['"ask not"', 'ask "not'],
+}
+NO_MATCH = ["civil-peace", "O'Brien's", 'a"b', '"', "*", "AND", "(x"]
+
+
+def make_archive(output_dir: str):
+    rng = random.Random(0)
+    for game_id, text in enumerate(CLUES, 1):
+        air_date = date(1990, 1, game_id)
+        data = make_game(game_id, air_date, rng)
+        data["jeopardy_round"]["clues"][0]["clue"] = text
+        game_dir = os.path.join(output_dir, "1990", "01")
+        os.makedirs(game_dir, exist_ok=True)
+        write_game_file(os.path.join(game_dir, f"jeopardy_game_{game_id}.json"), data)
+
+
+def main():
+    print("🎯 Testing Clue Search")
+    print("=" * 50)
+    ok = True
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        make_archive(output_dir)
+        search.update_index(output_dir)
+
+        for text, queries in CLUES.items():
+            for query in queries:
+                try:
+                    found = [r["clue"] for r in search.search(query, output_dir, update=False)]
+                except Exception as e:
+                    print(f"❌ {query!r}: {e}")
+                    ok = False
+                    continue
+                if text not in found:
+                    print(f"❌ {query!r} did not find {text!r} (got {found})")
+                    ok = False
+                else:
+                    print(f"✅ {query!r}: {len(found)} result(s)")
+
+        for query in NO_MATCH:
+            try:
+                found = [r["clue"] for r in search.search(query, output_dir, update=False)]
+            except Exception as e:
+                print(f"❌ {query!r}: {e}")
+                ok = False
+                continue
+            if any(text in found for text in CLUES):
+                print(f"❌ {query!r} should not match any test clue (got {found})")
+                ok = False
+            else:
+                print(f"✅ {query!r}: no test clue matched")
+
+        # The query service goes through the same path and must answer 200, not 500
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        ready = threading.Event()
+        threading.Thread(target=lambda: asyncio.run(serve(output_dir, "127.0.0.1", port, ready=ready)),
+                         daemon=True).start()
+        ready.wait(30)
+        for query in ("Lincoln%27s", "St.%20Louis", "civil-war"):
+            url = f"http://127.0.0.1:{port}/search?q={query}"
+            try:
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    results = json.load(response)
+                print(f"✅ GET /search?q={query}: {len(results)} result(s)")
+            except urllib.error.HTTPError as e:
+                print(f"❌ GET /search?q={query}: HTTP {e.code}")
+                ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
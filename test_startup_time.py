@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup regression test for the jarchive command line
+Imports each subcommand in a fresh interpreter with -X importtime and checks
+that no subcommand pulls in heavy dependencies at import time, and that the
+lightweight ones stay within the startup budget.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from jarchive import COMMANDS
+
+# Commands that cron jobs and quick queries run without touching the network
+LIGHTWEIGHT_COMMANDS = ("manifest", "verify", "stats", "search", "history", "reorganize", "sample", "synthetic")
+
+# Only imported by the code paths that fetch pages, send mail or load .env
+HEAVY_MODULES = ("requests", "bs4", "dotenv")
+
+# Import time allowed on top of a bare interpreter start, in milliseconds
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '75'))
+RUNS = 5
+
+
+def measure(code):
+    """Best-of-RUNS total import time (ms) and the set of imported top-level modules"""
+    best = None
+    modules = set()
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                cwd=Path(__file__).parent, capture_output=True, text=True, check=True)
+        total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                total_us += int(cumulative)
+            modules.add(name.strip().split(".")[0])
+        best = total_us if best is None else min(best, total_us)
+    return best / 1000, modules
+
+
+def main():
+    print("🎯 Testing jarchive Startup Time")
+    print("=" * 50)
+
+    baseline_ms, _ = measure("pass")
+    print(f"\nBare interpreter imports: {baseline_ms:.1f}ms")
+    print(f"Budget for lightweight commands: +{STARTUP_BUDGET_MS:.0f}ms\n")
+
+    failures = []
+    for name in COMMANDS:
+        total_ms, modules = measure(f"import jarchive; jarchive.load_command({name!r})")
+        extra_ms = total_ms - baseline_ms
+        heavy = sorted(m for m in HEAVY_MODULES if m in modules)
+        over_budget = name in LIGHTWEIGHT_COMMANDS and extra_ms > STARTUP_BUDGET_MS
+
+        status = "❌" if heavy or over_budget else "✅"
+        label = "lightweight" if name in LIGHTWEIGHT_COMMANDS else ""
+        print(f"  {status} {name:<14} +{extra_ms:6.1f}ms  {label}")
+        if heavy:
+            failures.append(f"{name} imports {', '.join(heavy)} at startup")
+        if over_budget:
+            failures.append(f"{name} takes +{extra_ms:.1f}ms (budget {STARTUP_BUDGET_MS:.0f}ms)")
+
+    if failures:
+        print("\n❌ Startup regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ All commands within budget, no heavy imports at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the distributed scraping work queue
+Runs several worker processes against the local J-Archive stand-in, with one
+"crashed" worker that leases a batch and never finishes it, then checks that
+every game was saved exactly once and nothing was fetched twice.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from jarchive_standin import standin_game, start_standin
+from work_queue import WorkQueue
+
+NUM_GAMES = 60
+MISSING_IDS = [990001, 990002]  # Not served by the stand-in
+WORKERS = 3
+LEASE_SECONDS = 2.0
+MAX_ATTEMPTS = 2
+
+
+def main():
+    print("🎯 Testing the Distributed Scraping Work Queue")
+    print("=" * 50)
+    server = start_standin(max_game_id=NUM_GAMES, latency=0.01)
+    here = os.path.dirname(os.path.abspath(__file__))
+    # The stand-in doesn't need the host-wide politeness budget
+    env = dict(os.environ, J_ARCHIVE_URL=server.base_url, J_ARCHIVE_RATE="0",
+               PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+    ok = True
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        queue_path = os.path.join(output_dir, "queue.sqlite")
+        queue = WorkQueue(queue_path, MAX_ATTEMPTS)
+        game_ids = list(range(1, NUM_GAMES + 1))
+        queue.enqueue(game_ids + MISSING_IDS)
+        queue.enqueue(game_ids[:10])  # Re-enqueueing is a no-op
+
+        # A worker that leases the first batch and dies without heartbeating
+        crashed = queue.claim("crashed-worker", 5, LEASE_SECONDS)
+        print(f"💥 crashed-worker leased {crashed} and went away")
+
+        start = time.perf_counter()
+        processes = [
+            subprocess.Popen(
+                [sys.executable, os.path.join(here, "work_queue.py"), "work",
+                 "--queue", queue_path, "--output-dir", output_dir, "--worker-id", f"worker-{n}",
+                 "--batch", "4", "--lease", str(LEASE_SECONDS), "--delay", "0",
+                 "--max-attempts", str(MAX_ATTEMPTS)],
+                env=env, stdout=subprocess.DEVNULL)
+            for n in range(WORKERS)
+        ]
+        for process in processes:
+            process.wait(timeout=120)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+
+        counts = queue.counts()
+        print(f"\n{WORKERS} workers finished in {elapsed:.1f}s: {counts}")
+        if counts["done"] != NUM_GAMES or counts["failed"] != len(MISSING_IDS) or counts["pending"] or counts["leased"]:
+            print(f"❌ Expected {NUM_GAMES} done and {len(MISSING_IDS)} failed")
+            ok = False
+
+        owners = {row[0] for row in queue.db.execute("SELECT result FROM jobs WHERE state = 'done'")}
+        saved = 0
+        for game_id in game_ids:
+            data = standin_game(game_id, server.base_url)
+            path = os.path.join(output_dir, data["air_date_iso"][:4], data["air_date_iso"][5:7],
+                                f"jeopardy_game_{game_id}.json")
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    saved += json.load(f) == data
+            except (OSError, ValueError) as e:
+                print(f"❌ Game {game_id}: {e}")
+        if saved != NUM_GAMES or len(owners) != NUM_GAMES:
+            print(f"❌ Only {saved} of {NUM_GAMES} games saved intact")
+            ok = False
+
+        doubles = {gid: n for gid, n in server.fetches.items() if gid in game_ids and n != 1}
+        if doubles:
+            print(f"❌ Games fetched more than once: {doubles}")
+            ok = False
+        if any(server.fetches.get(gid) != MAX_ATTEMPTS for gid in MISSING_IDS):
+            print(f"❌ Missing games should be tried {MAX_ATTEMPTS} times, got "
+                  f"{[server.fetches.get(gid) for gid in MISSING_IDS]}")
+            ok = False
+        leftovers = [name for _, _, files in os.walk(output_dir) for name in files if name.endswith('.tmp')]
+        if leftovers:
+            print(f"❌ Temp files left behind: {leftovers}")
+            ok = False
+        queue.close()
+
+    if ok:
+        print(f"✅ {NUM_GAMES} games saved exactly once, including the crashed worker's batch; "
+              f"{len(MISSING_IDS)} missing games failed after {MAX_ATTEMPTS} attempts")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Archive Verification
+Validates every game file against a JSON Schema for JeopardyScraper.scrape()
+output plus board invariants, on a process pool, and records the game_ids
+of bad files in the failure queue for re-scraping
+"""
+
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from archive import decode_game_bytes, iter_game_files
+from failure_queue import FailureQueue
+
+
+BOARD_ROWS = 5
+BOARD_COLUMNS = 6
+
+VALUE_PATTERN = r"^\$[0-9]{1,3}(,[0-9]{3})*$"
+ISO_DATE_PATTERN = r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$"
+
+_CLUE_SCHEMA = {
+    "type": "object",
+    "required": ["value", "clue", "answer", "daily_double"],
+    "properties": {
+        "value": {"type": ["string", "null"], "pattern": VALUE_PATTERN},
+        "clue": {"type": "string"},
+        "answer": {"type": ["string", "null"]},
+        "daily_double": {"type": "boolean"},
+        "category": {"type": "string"},
+        "category_index": {"type": "integer", "minimum": 0, "maximum": BOARD_COLUMNS - 1},
+        "row": {"type": "integer", "minimum": 0, "maximum": BOARD_ROWS - 1},
+        "media": {"type": "array", "items": {"type": "string"}},
+        "media_files": {"type": "array", "items": {"type": ["string", "null"]}},
+    },
+}
+
+_ROUND_SCHEMA = {
+    "type": "object",
+    "required": ["categories", "clues"],
+    "properties": {
+        "categories": {"type": "array", "maxItems": BOARD_COLUMNS, "items": {"type": "string"}},
+        "clues": {"type": "array", "maxItems": BOARD_ROWS * BOARD_COLUMNS, "items": _CLUE_SCHEMA},
+    },
+}
+
+# JSON Schema (draft 7 subset) for the output of JeopardyScraper.scrape()
+GAME_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "J-Archive game",
+    "type": "object",
+    "required": ["game_id", "episode_number", "air_date", "contestants", "jeopardy_round",
+                 "double_jeopardy_round", "final_jeopardy", "final_scores"],
+    "properties": {
+        "game_id": {"type": "integer", "minimum": 1},
+        "episode_number": {"type": ["string", "null"]},
+        "air_date": {"type": ["string", "null"]},
+        "air_date_iso": {"type": ["string", "null"], "pattern": ISO_DATE_PATTERN},
+        "contestants": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "description"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    "previous_winnings": {"type": ["string", "null"]},
+                    "player_id": {"type": ["integer", "null"]},
+                },
+            },
+        },
+        "jeopardy_round": _ROUND_SCHEMA,
+        "double_jeopardy_round": _ROUND_SCHEMA,
+        "final_jeopardy": {
+            "type": "object",
+            "required": ["category", "clue", "answer"],
+            "properties": {
+                "category": {"type": ["string", "null"]},
+                "clue": {"type": ["string", "null"]},
+                "answer": {"type": ["string", "null"]},
+                "media": {"type": "array", "items": {"type": "string"}},
+                "media_files": {"type": "array", "items": {"type": ["string", "null"]}},
+            },
+        },
+        "final_scores": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["contestant"],
+                "properties": {
+                    "contestant": {"type": "string"},
+                    "final_score": {"type": "string"},
+                    "remarks": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+_FILENAME_ID_RE = re.compile(r"(\d+)\.json(?:\.gz|\.zst)?$")
+
+
+def validate_schema(instance, schema: Dict, path: str = "$") -> Iterator[str]:
+    """Yield an error message for every place the instance breaks the schema"""
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        if not any(_TYPE_CHECKS[t](instance) for t in types):
+            yield f"{path}: expected {' or '.join(types)}, got {type(instance).__name__}"
+            return
+
+    if isinstance(instance, dict):
+        for key in schema.get("required", ()):
+            if key not in instance:
+                yield f"{path}: missing '{key}'"
+        for key, subschema in schema.get("properties", {}).items():
+            if key in instance:
+                yield from validate_schema(instance[key], subschema, f"{path}.{key}")
+    elif isinstance(instance, list):
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            yield f"{path}: {len(instance)} items, at most {schema['maxItems']} allowed"
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                yield from validate_schema(item, schema["items"], f"{path}[{i}]")
+    elif isinstance(instance, str):
+        if "pattern" in schema and not re.search(schema["pattern"], instance):
+            yield f"{path}: '{instance[:40]}' doesn't match {schema['pattern']}"
+    elif isinstance(instance, int) and not isinstance(instance, bool):
+        if "minimum" in schema and instance < schema["minimum"]:
+            yield f"{path}: {instance} is below {schema['minimum']}"
+        if "maximum" in schema and instance > schema["maximum"]:
+            yield f"{path}: {instance} is above {schema['maximum']}"
+
+
+def compile_schema(schema: Dict):
+    """
+    Build a fast boolean checker for a schema
+
+    Used as a first pass: only files that fail it go through
+    validate_schema() to collect error messages.
+    """
+    checks = []
+    types = schema.get("type")
+    if types is not None:
+        type_checks = [_TYPE_CHECKS[t] for t in ([types] if isinstance(types, str) else types)]
+        if len(type_checks) == 1:
+            type_check = type_checks[0]
+        else:
+            def type_check(v, type_checks=type_checks):
+                return any(check(v) for check in type_checks)
+        checks.append(type_check)
+
+    required = tuple(schema.get("required", ()))
+    properties = [(key, compile_schema(sub)) for key, sub in schema.get("properties", {}).items()]
+    if required or properties:
+        def check_object(v):
+            if not isinstance(v, dict):
+                return True
+            if any(key not in v for key in required):
+                return False
+            return all(check(v[key]) for key, check in properties if key in v)
+        checks.append(check_object)
+
+    if "maxItems" in schema or "items" in schema:
+        max_items = schema.get("maxItems")
+        item_check = compile_schema(schema["items"]) if "items" in schema else None
+
+        def check_array(v):
+            if not isinstance(v, list):
+                return True
+            if max_items is not None and len(v) > max_items:
+                return False
+            return item_check is None or all(map(item_check, v))
+        checks.append(check_array)
+
+    if "pattern" in schema:
+        match = re.compile(schema["pattern"]).search
+        checks.append(lambda v: not isinstance(v, str) or match(v) is not None)
+
+    if "minimum" in schema or "maximum" in schema:
+        low = schema.get("minimum", float("-inf"))
+        high = schema.get("maximum", float("inf"))
+        checks.append(lambda v: not _TYPE_CHECKS["integer"](v) or low <= v <= high)
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda v: all(check(v) for check in checks)
+
+
+_is_valid_game = compile_schema(GAME_SCHEMA)
+
+
+def check_invariants(data: Dict, relpath: str) -> Iterator[str]:
+    """Board invariants the schema can't express"""
+    for round_key in ("jeopardy_round", "double_jeopardy_round"):
+        round_data = data.get(round_key)
+        if not isinstance(round_data, dict):
+            continue
+        categories = round_data.get("categories") or []
+        clues = round_data.get("clues") or []
+        if categories and not clues:
+            yield f"$.{round_key}: {len(categories)} categories but no clues"
+        if len(clues) > len(categories) * BOARD_ROWS:
+            yield f"$.{round_key}: {len(clues)} clues for {len(categories)} categories"
+        daily_doubles = 0
+        for i, clue in enumerate(clues):
+            if not isinstance(clue, dict):
+                continue
+            daily_doubles += bool(clue.get("daily_double"))
+            index = clue.get("category_index")
+            if isinstance(index, int) and not isinstance(index, bool):
+                if index >= len(categories):
+                    yield f"$.{round_key}.clues[{i}]: category_index {index} but only {len(categories)} categories"
+                elif clue.get("category") != categories[index]:
+                    yield f"$.{round_key}.clues[{i}]: category doesn't match categories[{index}]"
+        max_daily_doubles = 1 if round_key == "jeopardy_round" else 2
+        if daily_doubles > max_daily_doubles:
+            yield f"$.{round_key}: {daily_doubles} Daily Doubles"
+
+    # Saved files live under YYYY/MM/ matching their air date
+    iso = data.get("air_date_iso")
+    parts = relpath.replace(os.sep, "/").split("/")
+    if isinstance(iso, str) and len(parts) == 3 and parts[:2] != [iso[:4], iso[5:7]]:
+        yield f"$.air_date_iso: {iso} but file is in {parts[0]}/{parts[1]}/"
+
+
+def verify_file(args) -> Optional[Dict]:
+    """
+    Validate one game file (runs in a worker process)
+
+    Returns:
+        None if the file is fine, else {"file", "game_id", "errors"}
+    """
+    output_dir, relpath = args
+    match = _FILENAME_ID_RE.search(relpath)
+    game_id = int(match.group(1)) if match else None
+
+    try:
+        with open(os.path.join(output_dir, relpath), 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        return {"file": relpath, "game_id": game_id, "errors": [f"unreadable: {e}"]}
+
+    if not raw.strip():
+        return {"file": relpath, "game_id": game_id, "errors": ["empty file"]}
+    try:
+        raw = decode_game_bytes(raw, os.path.join(output_dir, relpath))
+    except ValueError as e:
+        return {"file": relpath, "game_id": game_id, "errors": [f"undecodable: {e}"]}
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        # An error at the very end of the file means the write was cut short
+        kind = "truncated" if not raw.rstrip().endswith(b"}") else "malformed JSON"
+        return {"file": relpath, "game_id": game_id, "errors": [f"{kind}: {e}"]}
+
+    errors = [] if _is_valid_game(data) else list(validate_schema(data, GAME_SCHEMA))
+    errors.extend(check_invariants(data, relpath))
+    if isinstance(data, dict) and game_id is not None and data.get("game_id") not in (None, game_id):
+        errors.append(f"$.game_id: {data.get('game_id')} but file is named for game {game_id}")
+    if not errors:
+        return None
+    if game_id is None and isinstance(data, dict) and isinstance(data.get("game_id"), int):
+        game_id = data["game_id"]
+    return {"file": relpath, "game_id": game_id, "errors": errors}
+
+
+def verify_archive(output_dir: str = "output", workers: Optional[int] = None) -> Dict:
+    """
+    Verify every game file and update the failure queue
+
+    Files that now pass are dropped from the queue; failing ones are added as
+    invalid_file failures, due for retry right away.
+
+    Returns:
+        {"files": n, "bad": [problem dicts], "queued": [game ids]}
+    """
+    relpaths = [os.path.relpath(path, output_dir) for path in iter_game_files(output_dir)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = [(output_dir, rel) for rel in relpaths]
+
+    if workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            bad = [r for r in pool.map(verify_file, tasks, chunksize=chunksize) if r]
+    else:
+        bad = [r for r in map(verify_file, tasks) if r]
+
+    queue = FailureQueue(output_dir)
+    bad_files = {problem["file"] for problem in bad}
+    queue.clear_invalid_files(rel for rel in relpaths if rel not in bad_files)
+    # Re-verifying a known bad file isn't another failed attempt
+    known = {(e["game_id"], e["file"]) for e in queue.entries("invalid_file")}
+    for problem in bad:
+        if problem["game_id"] is not None and (problem["game_id"], problem["file"]) not in known:
+            queue.record(problem["game_id"], "invalid_file", detail=problem["errors"][0], file=problem["file"],
+                         source="verify", retry_now=True)
+    queued = sorted(e["game_id"] for e in queue.entries("invalid_file"))
+    queue.close()
+
+    return {"files": len(relpaths), "bad": bad, "queued": queued}
+
+
+def main():
+    output_dir = "output"
+    workers = None
+    as_json = False
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == '--workers' and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
+            i += 2
+        elif arg == '--json':
+            as_json = True
+            i += 1
+        elif not arg.startswith('--'):
+            output_dir = arg
+            i += 1
+        else:
+            print("Archive Verification")
+            print("\nUsage:")
+            print("  python verify.py [output_dir] [--workers <n>] [--json]")
+            sys.exit(1)
+
+    if not os.path.isdir(output_dir):
+        print(f"Error: output directory '{output_dir}' not found")
+        sys.exit(1)
+
+    start = datetime.now()
+    result = verify_archive(output_dir, workers)
+    elapsed = (datetime.now() - start).total_seconds()
+
+    if as_json:
+        print(json.dumps(result, indent=2))
+    else:
+        for problem in result["bad"]:
+            print(f"✗ {problem['file']} (game {problem['game_id']})")
+            for error in problem["errors"][:5]:
+                print(f"    {error}")
+            if len(problem["errors"]) > 5:
+                print(f"    ... and {len(problem['errors']) - 5} more")
+        print(f"\n{'='*60}")
+        print(f"Verified {result['files']} files in {elapsed:.2f}s")
+        print(f"✓ Valid: {result['files'] - len(result['bad'])}")
+        if result["bad"]:
+            print(f"✗ Invalid: {len(result['bad'])}")
+        if result["queued"]:
+            ids = " ".join(str(gid) for gid in result["queued"])
+            print(f"Queued for re-scraping: {len(result['queued'])} games ({ids})")
+            print(f"  python failure_queue.py retry-failed --output-dir {output_dir}")
+        print(f"{'='*60}")
+
+    sys.exit(1 if result["bad"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Distributed Scraping Work Queue
+A coordinator enqueues game ids into a SQLite queue; any number of worker
+processes claim leased batches, keep their leases alive with heartbeats and
+mark games done as they save them. A worker that dies stops heartbeating,
+its lease expires and the games go back to the queue for someone else.
+"""
+
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from archive import get_index_dir
+from scraper import JeopardyScraper
+
+
+QUEUE_FILENAME = "work_queue.sqlite"
+
+BATCH_SIZE = 10
+LEASE_SECONDS = 120.0
+MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    game_id       INTEGER PRIMARY KEY,
+    state         TEXT    NOT NULL DEFAULT 'pending',  -- pending, leased, done, failed
+    owner         TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    result        TEXT,
+    error         TEXT,
+    updated_at    REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, game_id);
+"""
+
+
+def default_queue_path(output_dir: str = "output") -> str:
+    return os.path.join(get_index_dir(output_dir), QUEUE_FILENAME)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Lease-based job queue in a SQLite database
+
+    Every state change is one short transaction; claims take the write lock
+    up front (BEGIN IMMEDIATE) so two workers can never lease the same game.
+    Workers on other machines can share the queue only if it lives on a
+    filesystem with working POSIX locks.
+    """
+
+    def __init__(self, path: str, max_attempts: int = MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _transaction(self):
+        return _Transaction(self.db)
+
+    def enqueue(self, game_ids) -> int:
+        """Add games to the queue; ids already queued (in any state) are left alone"""
+        now = time.time()
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO jobs (game_id, updated_at) VALUES (?, ?)",
+                ((int(game_id), now) for game_id in game_ids),
+            )
+            return self.db.total_changes - before
+
+    def _expire_leases(self, now: float) -> int:
+        # Runs inside a write transaction
+        cursor = self.db.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "owner = NULL, lease_expires = NULL, error = 'lease expired', updated_at = ? "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now, now),
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        """Return games whose lease ran out to the queue; returns how many"""
+        with self._transaction():
+            return self._expire_leases(time.time())
+
+    def claim(self, worker: str, batch_size: int = BATCH_SIZE, lease_seconds: float = LEASE_SECONDS) -> List[int]:
+        """Lease up to batch_size pending games (lowest ids first) to a worker"""
+        now = time.time()
+        with self._transaction():
+            self._expire_leases(now)
+            ids = [row[0] for row in self.db.execute(
+                "SELECT game_id FROM jobs WHERE state = 'pending' ORDER BY game_id LIMIT ?", (batch_size,))]
+            self.db.executemany(
+                "UPDATE jobs SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE game_id = ?",
+                ((worker, now + lease_seconds, now, game_id) for game_id in ids),
+            )
+        return ids
+
+    def heartbeat(self, worker: str, game_ids, lease_seconds: float = LEASE_SECONDS) -> List[int]:
+        """Extend a worker's leases; returns the ids it still holds"""
+        now = time.time()
+        held = []
+        with self._transaction():
+            for game_id in game_ids:
+                cursor = self.db.execute(
+                    "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                    "WHERE game_id = ? AND state = 'leased' AND owner = ? AND lease_expires >= ?",
+                    (now + lease_seconds, now, game_id, worker, now),
+                )
+                if cursor.rowcount:
+                    held.append(game_id)
+        return held
+
+    def holds(self, worker: str, game_id: int) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM jobs WHERE game_id = ? AND state = 'leased' AND owner = ? AND lease_expires >= ?",
+            (game_id, worker, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def complete(self, worker: str, game_id: int, result: str) -> bool:
+        """
+        Mark a leased game done
+
+        Only the current lease holder can complete a game, so a worker whose
+        lease was taken over can't overwrite the new owner's outcome. Returns
+        False if the lease was lost.
+        """
+        with self._transaction():
+            cursor = self.db.execute(
+                "UPDATE jobs SET state = 'done', owner = NULL, lease_expires = NULL, result = ?, error = NULL, "
+                "updated_at = ? WHERE game_id = ? AND state = 'leased' AND owner = ?",
+                (result, time.time(), game_id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, worker: str, game_id: int, error: str) -> bool:
+        """Give a leased game back: requeued, or failed for good after max_attempts"""
+        with self._transaction():
+            cursor = self.db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE game_id = ? AND state = 'leased' AND owner = ?",
+                (self.max_attempts, error, time.time(), game_id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def retry_failed(self) -> int:
+        """Put permanently failed games back in the queue with a fresh attempt count"""
+        with self._transaction():
+            cursor = self.db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? WHERE state = 'failed'",
+                (time.time(),))
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        for state, count in self.db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = count
+        return counts
+
+    def failures(self) -> List[Tuple[int, int, Optional[str]]]:
+        return list(self.db.execute(
+            "SELECT game_id, attempts, error FROM jobs WHERE state = 'failed' ORDER BY game_id"))
+
+    def unfinished(self) -> bool:
+        row = self.db.execute("SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') LIMIT 1").fetchone()
+        return row is not None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (or ROLLBACK on error)"""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class _Heartbeat(threading.Thread):
+    """Keeps a worker's current batch leased while it scrapes"""
+
+    def __init__(self, queue_path: str, worker: str, lease_seconds: float):
+        super().__init__(daemon=True)
+        self.queue_path = queue_path
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.lock = threading.Lock()
+        self.game_ids: List[int] = []
+        self.stopped = threading.Event()
+
+    def hold(self, game_ids: List[int]):
+        with self.lock:
+            self.game_ids = list(game_ids)
+
+    def release(self, game_id: int):
+        with self.lock:
+            if game_id in self.game_ids:
+                self.game_ids.remove(game_id)
+
+    def run(self):
+        # SQLite connections can't be shared across threads
+        queue = WorkQueue(self.queue_path)
+        try:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                with self.lock:
+                    game_ids = list(self.game_ids)
+                if game_ids:
+                    queue.heartbeat(self.worker, game_ids, self.lease_seconds)
+        finally:
+            queue.close()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def scrape_job(game_id: int, output_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Scrape and save one game
+
+    Returns:
+        (saved path, None) on success, (None, error) on failure
+    """
+    scraper = JeopardyScraper(game_id, priority="backfill")
+    data = scraper.scrape()
+    if not data:
+        return None, "fetch failed"
+    # Check if we actually got data (not just an empty structure)
+    has_data = (
+        data.get('episode_number') or
+        len(data.get('contestants', [])) > 0 or
+        len(data.get('jeopardy_round', {}).get('clues', [])) > 0
+    )
+    if not has_data:
+        return None, "no data found"
+    # save_to_json renames a finished temp file into place, so if a game ever
+    # is scraped twice (a lease lost mid-scrape) the last identical copy wins
+    return scraper.save_to_json(data, output_dir=output_dir), None
+
+
+def run_worker(queue_path: str, output_dir: str = "output", worker: Optional[str] = None,
+               batch_size: int = BATCH_SIZE, lease_seconds: float = LEASE_SECONDS,
+               delay: float = 1.0, max_attempts: int = MAX_ATTEMPTS) -> Dict[str, int]:
+    """
+    Claim and scrape batches until the queue has nothing left to lease
+
+    While other workers still hold leases the worker keeps polling, so it
+    picks up their games if they die. Returns counts of this worker's results.
+    """
+    worker = worker or default_worker_id()
+    queue = WorkQueue(queue_path, max_attempts)
+    heartbeat = _Heartbeat(queue_path, worker, lease_seconds)
+    heartbeat.start()
+    stats = {"scraped": 0, "failed": 0, "lost": 0}
+    fetched = False
+    try:
+        while True:
+            batch = queue.claim(worker, batch_size, lease_seconds)
+            if not batch:
+                if not queue.unfinished():
+                    break
+                time.sleep(min(lease_seconds / 4, 5.0))
+                continue
+            heartbeat.hold(batch)
+
+            for game_id in batch:
+                if fetched:
+                    time.sleep(delay)
+                if not queue.holds(worker, game_id):
+                    stats["lost"] += 1
+                    heartbeat.release(game_id)
+                    continue
+                print(f"[{worker}] Scraping game {game_id}...")
+                fetched = True
+                try:
+                    path, error = scrape_job(game_id, output_dir)
+                except Exception as e:
+                    path, error = None, f"{type(e).__name__}: {e}"
+                if path:
+                    if queue.complete(worker, game_id, os.path.relpath(path, output_dir)):
+                        print(f"[{worker}] ✓ Saved to {path}")
+                        stats["scraped"] += 1
+                    else:
+                        print(f"[{worker}] ⚠ Lease on game {game_id} was lost; another worker owns it now")
+                        stats["lost"] += 1
+                else:
+                    print(f"[{worker}] ✗ Failed to scrape game {game_id} ({error})")
+                    queue.fail(worker, game_id, error)
+                    stats["failed"] += 1
+                heartbeat.release(game_id)
+    finally:
+        heartbeat.stop()
+        queue.close()
+    return stats
+
+
+def _worker_process(queue_path, output_dir, worker, batch_size, lease_seconds, delay, max_attempts):
+    run_worker(queue_path, output_dir, worker, batch_size, lease_seconds, delay, max_attempts)
+
+
+def run_workers(queue_path: str, output_dir: str, processes: int, worker: Optional[str] = None, **options):
+    """Run several local worker processes against one queue and wait for them (named <worker>/<n>)"""
+    import multiprocessing
+
+    base = worker or default_worker_id()
+    workers = [
+        multiprocessing.Process(target=_worker_process, args=(
+            queue_path, output_dir, f"{base}/{n}",
+            options.get("batch_size", BATCH_SIZE), options.get("lease_seconds", LEASE_SECONDS),
+            options.get("delay", 1.0), options.get("max_attempts", MAX_ATTEMPTS)))
+        for n in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+
+def print_status(queue: WorkQueue):
+    counts = queue.counts()
+    total = sum(counts.values())
+    print(f"Queue {queue.path}: {total} games")
+    for state in ("pending", "leased", "done", "failed"):
+        print(f"  {state:<8} {counts[state]}")
+    for game_id, attempts, error in queue.failures()[:20]:
+        print(f"  ✗ game {game_id}: {error} ({attempts} attempts)")
+
+
+def usage():
+    print("Distributed Scraping Work Queue")
+    print("\nUsage:")
+    print("  python work_queue.py enqueue <start_id> <end_id> [options]")
+    print("  python work_queue.py enqueue --list <id1> <id2> ... [options]")
+    print("  python work_queue.py work [--processes <n>] [--batch <n>] [--lease <seconds>] [--delay <seconds>] [options]")
+    print("  python work_queue.py status [options]")
+    print("  python work_queue.py retry-failed [options]")
+    print("\nOptions:")
+    print("  --output-dir <dir>   Archive to write into (default: output)")
+    print("  --queue <path>       Queue database (default: <output-dir>/.jarchive/work_queue.sqlite)")
+    print("  --worker-id <name>   Name for this worker, or the prefix of <name>/<n> with --processes (default: host:pid)")
+    print("  --max-attempts <n>   Give up on a game after n leases (default: 3)")
+    print("\nExamples:")
+    print("  python work_queue.py enqueue 1 9000")
+    print("  python work_queue.py work --processes 4 --delay 2.0")
+    sys.exit(1)
+
+
+def main():
+    if len(sys.argv) < 2:
+        usage()
+    command = sys.argv[1]
+    output_dir = "output"
+    queue_path = None
+    worker = None
+    processes = 1
+    batch_size = BATCH_SIZE
+    lease_seconds = LEASE_SECONDS
+    delay = 1.0
+    max_attempts = MAX_ATTEMPTS
+    list_mode = False
+    ids = []
+
+    i = 2
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        value = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+        if arg == '--output-dir' and value:
+            output_dir = value
+        elif arg == '--queue' and value:
+            queue_path = value
+        elif arg == '--worker-id' and value:
+            worker = value
+        elif arg == '--processes' and value:
+            processes = int(value)
+        elif arg == '--batch' and value:
+            batch_size = int(value)
+        elif arg == '--lease' and value:
+            lease_seconds = float(value)
+        elif arg == '--delay' and value:
+            delay = float(value)
+        elif arg == '--max-attempts' and value:
+            max_attempts = int(value)
+        elif arg == '--list':
+            list_mode = True
+            i += 1
+            continue
+        elif not arg.startswith('--'):
+            try:
+                ids.append(int(arg))
+            except ValueError:
+                usage()
+            i += 1
+            continue
+        else:
+            usage()
+        i += 2
+
+    queue_path = queue_path or default_queue_path(output_dir)
+
+    if command == 'enqueue':
+        if list_mode:
+            game_ids = ids
+        elif len(ids) == 2:
+            game_ids = range(ids[0], ids[1] + 1)
+        else:
+            usage()
+        queue = WorkQueue(queue_path, max_attempts)
+        added = queue.enqueue(game_ids)
+        print(f"✓ Enqueued {added} games ({len(game_ids) - added} already queued)")
+        print_status(queue)
+    elif command == 'work':
+        print(f"🔨 Working queue {queue_path} with {processes} process(es), {delay}s delay between requests...")
+        if processes > 1:
+            run_workers(queue_path, output_dir, processes, worker, batch_size=batch_size,
+                        lease_seconds=lease_seconds, delay=delay, max_attempts=max_attempts)
+        else:
+            stats = run_worker(queue_path, output_dir, worker, batch_size, lease_seconds, delay, max_attempts)
+            print(f"\nThis worker: {stats['scraped']} scraped, {stats['failed']} failed, {stats['lost']} leases lost")
+        print_status(WorkQueue(queue_path, max_attempts))
+    elif command == 'status':
+        print_status(WorkQueue(queue_path, max_attempts))
+    elif command == 'retry-failed':
+        queue = WorkQueue(queue_path, max_attempts)
+        print(f"✓ Requeued {queue.retry_failed()} failed games")
+        print_status(queue)
+    else:
+        usage()
+
+
+if __name__ == "__main__":
+    main()